@@ -1,17 +1,33 @@
-from .base_agent import BaseAgent
-from .scraper_agent import ScraperAgent
-from .consolidation_agent import ConsolidationAgent
-from .formatter_agent import FormatterAgent
-from .audio_agent import AudioAgent
-from .twitter_agent import TwitterAgent
-from .website_agent import WebsiteAgent
+"""
+Agent package.
 
-__all__ = [
-    'BaseAgent',
-    'ScraperAgent',
-    'ConsolidationAgent',
-    'FormatterAgent',
-    'AudioAgent',
-    'TwitterAgent',
-    'WebsiteAgent'
-]
+Agents are resolved lazily (PEP 562) so that `import agents` does not pull in
+newspaper3k, feedparser, PIL, anthropic, tweepy or elevenlabs until an agent
+that needs them is actually used.
+"""
+import importlib
+
+_EXPORTS = {
+    'BaseAgent': '.base_agent',
+    'ScraperAgent': '.scraper_agent',
+    'ConsolidationAgent': '.consolidation_agent',
+    'FormatterAgent': '.formatter_agent',
+    'AudioAgent': '.audio_agent',
+    'TwitterAgent': '.twitter_agent',
+    'WebsiteAgent': '.website_agent',
+    'NewsletterAgent': '.newsletter_agent',
+    'start_agents': '.lifecycle',
+    'stop_agents': '.lifecycle',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,31 +1,51 @@
 from agents.base_agent import BaseAgent
 from events.event_types import EventType, Event
-from pathlib import Path
+from utils.audio_stream import stream_to_file
+from utils.ffmpeg import ffmpeg_available
+from utils.tts import SegmentedSynthesizer, create_backend
+from utils.tts_budget import ScriptPlan, plan_script, remaining_characters, trim_script
+from typing import Any, Dict, List
+import asyncio
 import os
 
 class AudioAgent(BaseAgent):
     """Podcast generation using ElevenLabs"""
     
-    def __init__(self, event_bus):
-        super().__init__("audio_agent", event_bus)
-        self._init_elevenlabs()
+    def __init__(self, event_bus, context=None):
+        super().__init__("audio_agent", event_bus, context)
+        self._synthesizer = None
     
-    def _init_elevenlabs(self):
-        """Initialize ElevenLabs client"""
-        try:
-            from elevenlabs import set_api_key
-            api_key = os.getenv("ELEVENLABS_API_KEY")
-            if api_key:
-                set_api_key(api_key)
-        except ImportError:
-            self.logger.warning("ElevenLabs not installed. Audio generation will fail.")
-        except Exception as e:
-            self.logger.warning(f"Error initializing ElevenLabs: {e}")
+    @property
+    def synthesizer(self) -> SegmentedSynthesizer:
+        """Segment-parallel TTS pipeline, built on first use"""
+        if self._synthesizer is None:
+            audio_config = self.context.agent_config('audio')
+            backend = create_backend(
+                audio_config.get('tts_backend', 'elevenlabs'),
+                api_key=os.getenv("ELEVENLABS_API_KEY")
+            )
+            voice_id = os.getenv("ELEVENLABS_VOICE_ID")
+            if not voice_id and backend.name != "fake":
+                raise ValueError("ELEVENLABS_VOICE_ID not set")
+            self._synthesizer = SegmentedSynthesizer(
+                backend,
+                voice_id=voice_id or "fake-voice",
+                settings={
+                    "stability": audio_config.get('voice_stability', 0.6),
+                    "similarity_boost": audio_config.get('voice_clarity', 0.8),
+                    "style": audio_config.get('voice_style', 0.7),
+                    "use_speaker_boost": True
+                },
+                cache_dir=audio_config.get('tts_cache_dir', 'data/cache/tts'),
+                max_concurrency=audio_config.get('tts_max_concurrency', 3),
+                max_segment_chars=audio_config.get('tts_max_segment_chars', 1500),
+                logger=self.logger
+            )
+        return self._synthesizer
     
-    def _setup_event_listeners(self):
+    async def _setup_event_listeners(self):
         # Subscribe to content formatted events
-        import asyncio
-        asyncio.create_task(self.event_bus.subscribe(EventType.CONTENT_FORMATTED, self.process))
+        await self.subscribe(EventType.CONTENT_FORMATTED, self.process)
     
     async def process(self, event: Event):
         """Generate podcast"""
@@ -50,51 +70,88 @@ class AudioAgent(BaseAgent):
                     art = story.get('article', {})
                     story_dicts.append({
                         'title': art.get('title', ''),
-                        'summary': art.get('summary', '')
+                        'summary': art.get('summary', ''),
+                        'rank': story.get('rank')
                     })
             
-            # Generate script
-            script = await self.claude.generate_script(story_dicts, duration_mins=5)
-            
-            # Text to speech
-            audio = await self._text_to_speech(script)
+            # Size the script to the duration and TTS budget before generating it
+            plan = await self._plan_script(story_dicts)
+            if plan.exhausted:
+                self.logger.error(f"TTS budget exhausted; skipping audio for week {week_id}")
+                await self.emit_event(EventType.ERROR_OCCURRED, {"error": "TTS budget exhausted", "agent": "audio"})
+                return
+            script = await self.claude.generate_script(
+                plan.story_dicts(),
+                duration_mins=plan.duration_mins,
+                target_words=plan.target_words
+            )
+            budget = plan.record_actual(script)
+            if budget['over_budget']:
+                script = trim_script(script, plan.char_budget)
+                self.logger.warning(
+                    f"Script overshot budget ({budget['actual_characters']} > {plan.char_budget} chars); "
+                    f"trimmed to {len(script)}"
+                )
+            self.logger.info(
+                f"Script: {budget['actual_characters']} chars vs {budget['planned_characters']} planned "
+                f"({budget['stories']} stories, {budget['dropped']} dropped)"
+            )
             
-            # Save
+            # Text to speech, streamed straight to disk
             audio_path = f"data/approved/week-{week_id}/podcast.mp3"
-            Path(audio_path).parent.mkdir(parents=True, exist_ok=True)
-            with open(audio_path, 'wb') as f:
-                f.write(audio)
+            await self._text_to_speech(script, audio_path)
             
-            await self.emit_event(EventType.AUDIO_GENERATED, {"week_id": week_id})
+            await self.emit_event(EventType.AUDIO_GENERATED, {"week_id": week_id, "budget": budget})
             self.logger.info(f"Audio generated for week {week_id}")
         except Exception as e:
             self.logger.error(f"Error generating audio: {e}")
             await self.emit_event(EventType.ERROR_OCCURRED, {"error": str(e), "agent": "audio"})
     
-    async def _text_to_speech(self, script: str) -> bytes:
-        """Convert script to audio using ElevenLabs"""
+    async def _plan_script(self, story_dicts: List[Dict[str, Any]]) -> ScriptPlan:
+        """Budget the episode from config and, for ElevenLabs, the account's remaining characters"""
+        audio_config = self.context.agent_config('audio')
+        char_budget = audio_config.get('char_budget')
+        if audio_config.get('use_account_quota', True):
+            client = getattr(self.synthesizer.backend, 'client', None)
+            remaining = await asyncio.to_thread(remaining_characters, client) if client else None
+            if remaining is not None:
+                char_budget = remaining if char_budget is None else min(char_budget, remaining)
+        
+        plan = plan_script(
+            story_dicts,
+            max_duration_seconds=audio_config.get('max_duration_seconds', 300),
+            char_budget=char_budget,
+            credits_per_char=audio_config.get('credits_per_char', 1.0)
+        )
+        for note in plan.notes:
+            self.logger.info(note)
+        return plan
+    
+    async def _text_to_speech(self, script: str, audio_path: str) -> Dict[str, Any]:
+        """Stream the script's audio to `audio_path`, one cached segment per story"""
+        normalize = self.context.agent_config('audio').get('loudnorm', False)
+        if normalize and not ffmpeg_available():
+            self.logger.warning("ffmpeg not found; skipping loudness normalization")
+            normalize = False
+        
+        tts_stats: Dict[str, Any] = {}
         try:
-            from elevenlabs import generate, Voice, VoiceSettings
-            
-            voice_id = os.getenv("ELEVENLABS_VOICE_ID")
-            if not voice_id:
-                raise ValueError("ELEVENLABS_VOICE_ID not set")
-            
-            audio = generate(
-                text=script,
-                voice=Voice(
-                    voice_id=voice_id,
-                    settings=VoiceSettings(
-                        stability=0.6,
-                        similarity_boost=0.8,
-                        style=0.7
-                    )
-                )
+            written = await stream_to_file(
+                self.synthesizer.stream(script, tts_stats),
+                audio_path,
+                normalize=normalize
             )
-            
-            return audio
         except ImportError:
             raise ImportError("ElevenLabs library not installed")
         except Exception as e:
             self.logger.error(f"Error in text-to-speech: {e}")
             raise
+        
+        ttfb = written['time_to_first_byte']
+        self.logger.info(
+            f"TTS: {tts_stats['segments']} segment(s), {tts_stats['synthesized']} synthesized, "
+            f"{tts_stats['cached']} from cache ({tts_stats['characters']} chars sent); "
+            f"{written['bytes']} bytes in {written['seconds']:.2f}s, "
+            f"first byte after {ttfb if ttfb is not None else float('nan'):.2f}s"
+        )
+        return {**tts_stats, **written}
@@ -1,41 +1,82 @@
-import os
-import yaml
 from abc import ABC, abstractmethod
-from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from events.event_bus import EventBus
 from events.event_types import Event, EventType
-from utils.logger import Logger
-from utils.llm_client import ClaudeClient
-from utils.storage import Storage
+from utils.runtime import RuntimeContext
+from utils import tracing
+import inspect
 import uuid
 
 class BaseAgent(ABC):
     """Base class for all agents with Ralf's Loop support"""
     
-    def __init__(self, agent_id: str, event_bus: EventBus):
+    def __init__(self, agent_id: str, event_bus: EventBus, context: Optional[RuntimeContext] = None):
         self.agent_id = agent_id
         self.event_bus = event_bus
-        self.logger = Logger(agent_id)
-        self.claude = ClaudeClient()
-        self.storage = Storage()
-        self.config = self._load_config()
-        self._setup_event_listeners()
+        self.context = context or RuntimeContext.default()
+        self.logger = self.context.get_logger(agent_id)
+        self.storage = self.context.storage
+        self.config = self.context.config
+        self.tracer = self.context.tracer
+        self._subscriptions = []
+        self._started = False
     
-    def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from YAML"""
-        config_path = Path("config/config.yaml")
-        if config_path.exists():
-            with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
-        return {}
+    @property
+    def claude(self):
+        """Shared Claude client, created on first use"""
+        return self.context.claude
+    
+    @property
+    def configured(self) -> bool:
+        """Whether the agent has the credentials or clients it needs to act"""
+        return True
     
     @abstractmethod
-    def _setup_event_listeners(self):
+    async def _setup_event_listeners(self):
         """Subscribe to relevant events - implement in subclass"""
         pass
     
+    async def start(self):
+        """Register event subscriptions; returns once the agent can receive events"""
+        if self._started:
+            return
+        await self._setup_event_listeners()
+        self._started = True
+        self.logger.debug(f"Agent started with {len(self._subscriptions)} subscription(s)")
+    
+    async def stop(self):
+        """Remove all event subscriptions registered by this agent"""
+        for event_type, callback in self._subscriptions:
+            await self.event_bus.unsubscribe(event_type, callback)
+        self._subscriptions = []
+        self._started = False
+    
+    async def subscribe(self, event_type: EventType, callback: callable):
+        """
+        Subscribe to an event type and remember it for stop().
+
+        The callback may be sync or async, as with EventBus.subscribe. It
+        runs in a span continuing the event's trace, with the event's
+        correlation id on every log line it writes.
+        """
+        span_name = f"{self.agent_id}.{event_type.value}"
+
+        async def handler(event: Event):
+            with self.logger.correlation(event.correlation_id), self.tracer.trace(
+                span_name,
+                trace_id=event.metadata.get("trace_id", event.correlation_id),
+                parent_id=event.metadata.get("parent_span_id"),
+                source=event.agent_id
+            ):
+                result = callback(event)
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+
+        await self.event_bus.subscribe(event_type, handler)
+        self._subscriptions.append((event_type, handler))
+    
     @abstractmethod
     async def process(self, event: Event):
         """Main processing logic - implement in subclass"""
@@ -48,7 +89,8 @@ class BaseAgent(ABC):
             timestamp=datetime.now(),
             data=data,
             agent_id=self.agent_id,
-            correlation_id=str(uuid.uuid4())
+            correlation_id=tracing.current_trace_id() or str(uuid.uuid4()),
+            metadata=tracing.event_metadata()
         )
         await self.event_bus.publish(event)
         self.logger.info(f"Emitted event: {event_type.value}")
@@ -61,7 +103,8 @@ class BaseAgent(ABC):
         reflect_func: callable,
         act_func: callable,
         max_iterations: int = 3,
-        confidence_threshold: float = 0.8
+        confidence_threshold: float = 0.8,
+        min_improvement: Optional[float] = None
     ) -> Any:
         """
         Ralf's Loop: Observe -> Reflect -> Act -> Iterate
@@ -73,8 +116,11 @@ class BaseAgent(ABC):
             act_func: Function to act on reflection
             max_iterations: Maximum refinement iterations
             confidence_threshold: Stop if reflection confidence above this
+            min_improvement: Stop if confidence gained less than this since
+                the previous iteration (None disables the check)
         """
         observation = await observe_func(task)
+        previous_confidence = None
         
         for iteration in range(max_iterations):
             self.logger.debug(f"Ralf's Loop iteration {iteration + 1}")
@@ -83,10 +129,24 @@ class BaseAgent(ABC):
             reflection = await reflect_func(observation)
             
             # Check if confident enough to stop
-            if reflection.get('confidence', 0) >= confidence_threshold:
+            confidence = reflection.get('confidence', 0)
+            if confidence >= confidence_threshold:
                 self.logger.info(f"Ralf's Loop converged at iteration {iteration + 1}")
                 break
             
+            # Stop when another round is unlikely to pay for itself
+            if (
+                min_improvement is not None
+                and previous_confidence is not None
+                and confidence - previous_confidence < min_improvement
+            ):
+                self.logger.info(
+                    f"Ralf's Loop stopped at iteration {iteration + 1}: "
+                    f"gain {confidence - previous_confidence:.3f} < {min_improvement}"
+                )
+                break
+            previous_confidence = confidence
+            
             # Act on reflection
             action_result = await act_func(reflection)
             
@@ -1,31 +1,29 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict
 from agents.base_agent import BaseAgent
 from events.event_types import EventType, Article, RankedArticle
-from utils.email_client import EmailClient
-import yaml
+from utils.templates import render_template
+from utils import tracing
+import asyncio
 import json
 import os
 
 class ConsolidationAgent(BaseAgent):
     """Weekly consolidation with Ralf's Loop for story selection"""
     
-    def __init__(self, event_bus):
-        super().__init__("consolidation_agent", event_bus)
-        self.email_client = EmailClient()
-        self.categories = self._load_categories()
+    def __init__(self, event_bus, context=None):
+        super().__init__("consolidation_agent", event_bus, context)
+        self.email_client = self.context.email_client
+        self.categories = self.context.categories
     
-    def _load_categories(self) -> List:
-        with open("config/categories.yaml", 'r') as f:
-            return yaml.safe_load(f)['categories']
-    
-    def _setup_event_listeners(self):
+    async def _setup_event_listeners(self):
         # Runs on schedule, doesn't listen to events
         pass
     
     async def process(self, event):
         pass
     
+    @tracing.traced("consolidate")
     async def run_weekly_consolidation(self):
         """Main consolidation workflow"""
         self.logger.info("Starting weekly consolidation")
@@ -48,13 +46,15 @@ class ConsolidationAgent(BaseAgent):
         week_id = start_of_week.strftime("%Y-W%W")
         self.storage.save_processed({
             "week_id": week_id,
+            # Publishing after approval continues this trace
+            "trace_id": tracing.current_trace_id(),
             "stories": [self._serialize_ranked(r) for r in ranked_stories]
         }, week_id)
         
         # Send approval email
         recipient = self.config.get('email', {}).get('approval_recipient') or os.getenv("EMAIL_RECIPIENT")
         if recipient:
-            self.email_client.send_approval_request(report_html, recipient)
+            await asyncio.to_thread(self.email_client.send_approval_request, report_html, recipient)
         
         # Emit event
         await self.emit_event(EventType.APPROVAL_REQUESTED, {
@@ -68,6 +68,7 @@ class ConsolidationAgent(BaseAgent):
         """Load all scraped data from the week"""
         return self.storage.load_weekly_raw(start, end)
     
+    @tracing.traced("score.rank")
     async def _rank_with_ralfs_loop(self, weekly_data: Dict) -> List[RankedArticle]:
         """Use enhanced Ralf's Loop for intelligent story selection and ranking"""
 
@@ -93,6 +94,10 @@ class ConsolidationAgent(BaseAgent):
 
         async def observe(articles):
             """Observe: Remove duplicates and group by category"""
+            if articles and isinstance(articles[0], RankedArticle):
+                # The ranking produced by act(); there is nothing left to refine
+                return {"ranked": articles}
+
             # Detect and remove duplicates
             unique_articles = await self._remove_duplicates(articles)
             removed = len(articles) - len(unique_articles)
@@ -112,6 +117,8 @@ class ConsolidationAgent(BaseAgent):
 
         async def reflect(observation):
             """Reflect: Assess diversity, balance, and quality of selection"""
+            if "ranked" in observation:
+                return {"confidence": 1.0}
             articles_list = observation["articles"]
             by_category = observation["by_category"]
 
@@ -236,7 +243,10 @@ class ConsolidationAgent(BaseAgent):
             confidence_threshold=0.85
         )
 
-        return result if isinstance(result, list) else []
+        if "ranked" in result:
+            return result["ranked"]
+        # Converged before ranking anything: rank the observed selection once
+        return await act(await reflect(result))
 
     async def _remove_duplicates(self, articles: List[Article]) -> List[Article]:
         """Remove duplicate articles using URL and title similarity"""
@@ -298,15 +308,20 @@ class ConsolidationAgent(BaseAgent):
 
         return len(clusters)
 
+    @staticmethod
+    def _age(publish_date: datetime) -> timedelta:
+        """Time since publication; feed dates may be naive or timezone-aware"""
+        now = datetime.now(timezone.utc) if publish_date.tzinfo else datetime.now()
+        return now - publish_date
+
     def _count_recent_articles(self, articles: List[Article], days: int = 3) -> int:
         """Count articles published within last N days"""
         from datetime import datetime, timedelta
-        cutoff = datetime.now() - timedelta(days=days)
         count = 0
 
         for article in articles:
             if isinstance(article.publish_date, datetime):
-                if article.publish_date >= cutoff:
+                if self._age(article.publish_date) <= timedelta(days=days):
                     count += 1
 
         return count
@@ -321,7 +336,7 @@ class ConsolidationAgent(BaseAgent):
         # Recency bonus (30% weight) - newer = better
         recency_score = 0.0
         if isinstance(article.publish_date, datetime):
-            age_days = (datetime.now() - article.publish_date).days
+            age_days = self._age(article.publish_date).days
             if age_days <= 1:
                 recency_score = 0.3  # Published today or yesterday
             elif age_days <= 3:
@@ -363,7 +378,7 @@ class ConsolidationAgent(BaseAgent):
 
         # Recency
         if isinstance(article.publish_date, datetime):
-            age = (datetime.now() - article.publish_date).days
+            age = self._age(article.publish_date).days
             if age == 0:
                 reasons.append("breaking news")
             elif age <= 2:
@@ -376,178 +391,31 @@ class ConsolidationAgent(BaseAgent):
 
         return ", ".join(reasons)
     
+    @tracing.traced("render.report")
     async def _generate_report(self, ranked_stories: List[RankedArticle]) -> str:
         """Generate comprehensive HTML approval email"""
         week_id = datetime.now().strftime('%Y-W%W')
         
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Weekly News Digest Approval - Week {week_id}</title>
-            <style>
-                body {{
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 800px;
-                    margin: 0 auto;
-                    padding: 20px;
-                    background-color: #f5f5f5;
-                }}
-                .container {{
-                    background: white;
-                    border-radius: 8px;
-                    padding: 30px;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                }}
-                h1 {{
-                    color: #6366F1;
-                    border-bottom: 3px solid #6366F1;
-                    padding-bottom: 10px;
-                }}
-                .summary {{
-                    background: #f8f9fa;
-                    padding: 15px;
-                    border-radius: 5px;
-                    margin: 20px 0;
-                }}
-                .story {{
-                    margin: 25px 0;
-                    padding: 20px;
-                    border-left: 4px solid #6366F1;
-                    background: #fafafa;
-                    border-radius: 4px;
-                }}
-                .story-header {{
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                    margin-bottom: 10px;
-                }}
-                .category {{
-                    display: inline-block;
-                    background: #6366F1;
-                    color: white;
-                    padding: 4px 12px;
-                    border-radius: 12px;
-                    font-size: 0.85em;
-                    font-weight: bold;
-                    text-transform: uppercase;
-                }}
-                .rank {{
-                    color: #666;
-                    font-size: 0.9em;
-                    font-weight: bold;
-                }}
-                .story h3 {{
-                    margin: 10px 0;
-                    color: #1a1a1a;
-                    font-size: 1.3em;
-                }}
-                .story p {{
-                    color: #555;
-                    margin: 10px 0;
-                }}
-                .story-meta {{
-                    display: flex;
-                    gap: 15px;
-                    margin-top: 15px;
-                    font-size: 0.9em;
-                    color: #777;
-                }}
-                .relevance-score {{
-                    display: inline-block;
-                    background: #10b981;
-                    color: white;
-                    padding: 4px 10px;
-                    border-radius: 12px;
-                    font-weight: bold;
-                }}
-                .source {{
-                    color: #6366F1;
-                }}
-                a {{
-                    color: #6366F1;
-                    text-decoration: none;
-                    font-weight: 500;
-                }}
-                a:hover {{
-                    text-decoration: underline;
-                }}
-                .actions {{
-                    margin-top: 30px;
-                    padding: 20px;
-                    background: #fff3cd;
-                    border-left: 4px solid #ffc107;
-                    border-radius: 4px;
-                }}
-                .actions h3 {{
-                    margin-top: 0;
-                    color: #856404;
-                }}
-                .actions code {{
-                    background: #f8f9fa;
-                    padding: 2px 6px;
-                    border-radius: 3px;
-                    font-family: 'Courier New', monospace;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>📰 Weekly News Digest - Approval Request</h1>
-                
-                <div class="summary">
-                    <strong>Week:</strong> {week_id}<br>
-                    <strong>Total Stories:</strong> {len(ranked_stories)}<br>
-                    <strong>Categories:</strong> {', '.join(set(s.article.category for s in ranked_stories))}
-                </div>
-                
-                <h2>Top Stories for This Week</h2>
-        """
-        
+        stories = []
         for ranked in ranked_stories:
             art = ranked.article
-            summary = art.summary[:300] + "..." if len(art.summary) > 300 else art.summary
-            
-            html += f"""
-                <div class="story">
-                    <div class="story-header">
-                        <span class="category">{art.category}</span>
-                        <span class="rank">Rank #{ranked.rank}</span>
-                    </div>
-                    <h3>{art.title}</h3>
-                    <p>{summary}</p>
-                    <div class="story-meta">
-                        <span class="source">Source: {art.source}</span>
-                        <span class="relevance-score">⭐ {ranked.importance_score:.2f}</span>
-                        <span>Published: {art.publish_date.strftime('%Y-%m-%d') if hasattr(art.publish_date, 'strftime') else str(art.publish_date)[:10]}</span>
-                    </div>
-                    <p><a href="{art.url}" target="_blank">🔗 Read Full Article →</a></p>
-                </div>
-            """
-        
-        html += f"""
-                <div class="actions">
-                    <h3>📋 Approval Actions</h3>
-                    <p><strong>To approve this week's digest:</strong></p>
-                    <p><code>mkdir -p data/approved/week-{week_id} && touch data/approved/week-{week_id}/APPROVED.txt</code></p>
-                    
-                    <p><strong>To reject:</strong></p>
-                    <p><code>mkdir -p data/approved/week-{week_id} && touch data/approved/week-{week_id}/REJECTED.txt</code></p>
-                    
-                    <p><strong>After approval, run:</strong></p>
-                    <p><code>python scripts/run_publishing_pipeline.py {week_id}</code></p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+            stories.append({
+                "category": art.category,
+                "rank": ranked.rank,
+                "title": art.title,
+                "summary": art.summary[:300] + "..." if len(art.summary) > 300 else art.summary,
+                "source": art.source,
+                "importance_score": ranked.importance_score,
+                "published": art.publish_date.strftime('%Y-%m-%d') if hasattr(art.publish_date, 'strftime') else str(art.publish_date)[:10],
+                "url": art.url
+            })
         
-        return html
+        return render_template(
+            "approval_email.html",
+            week_id=week_id,
+            stories=stories,
+            categories=sorted(set(s.article.category for s in ranked_stories))
+        )
     
     def _serialize_ranked(self, ranked: RankedArticle) -> Dict:
         """Convert RankedArticle to dict"""
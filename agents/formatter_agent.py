@@ -1,19 +1,35 @@
 from agents.base_agent import BaseAgent
 from events.event_types import EventType, Event
-from PIL import Image, ImageDraw, ImageFont
-from pathlib import Path
+from utils.site_data import slugify
+from utils.templates import render_template
+from utils import tracing
+from utils.thumbnails import ThumbnailRenderer
 import json
+import time
 import asyncio
+import hashlib
+from typing import Dict
 
 class FormatterAgent(BaseAgent):
     """Multi-format content formatter"""
     
-    def __init__(self, event_bus):
-        super().__init__("formatter_agent", event_bus)
+    def __init__(self, event_bus, context=None):
+        super().__init__("formatter_agent", event_bus, context)
+        formatter_config = self.context.agent_config('formatter')
+        self.thumbnails = ThumbnailRenderer(
+            size=formatter_config.get('thumbnail_size', [1200, 630]),
+            image_format=formatter_config.get('thumbnail_format', 'png')
+        )
+        # Segment assessments keyed by content hash, kept warm across runs
+        self._assessment_cache: Dict[str, Dict] = {}
+    
+    async def stop(self):
+        await super().stop()
+        self.thumbnails.close()
     
-    def _setup_event_listeners(self):
+    async def _setup_event_listeners(self):
         # Subscribe to approval received events
-        asyncio.create_task(self.event_bus.subscribe(EventType.APPROVAL_RECEIVED, self.process))
+        await self.subscribe(EventType.APPROVAL_RECEIVED, self.process)
     
     async def process(self, event: Event):
         """Format approved content"""
@@ -31,21 +47,53 @@ class FormatterAgent(BaseAgent):
                 self.logger.error(f"No processed data found for week {week_id}")
                 return
             
-            # Generate formats
-            newsletter = await self._format_newsletter(processed['stories'])
-            twitter_thread = await self._format_twitter(processed['stories'])
-            thumbnails = await self._generate_thumbnails(processed['stories'], week_id)
+            # Generate all formats concurrently; each one is saved as soon as
+            # it is ready, so the stage takes as long as the slowest generator
+            stories = processed['stories']
+            timings = {}
+            stage_started = time.perf_counter()
             
-            # Save
-            self.storage.save_approved(newsletter, week_id, "newsletter", "html")
-            self.storage.save_approved(twitter_thread, week_id, "twitter", "json")
+            newsletter, twitter_thread, thumbnails = await asyncio.gather(
+                self._timed_format(
+                    "newsletter", timings,
+                    self._format_newsletter(stories),
+                    lambda html: self.storage.save_approved(html, week_id, "newsletter", "html")
+                ),
+                self._timed_format(
+                    "twitter", timings,
+                    self._format_twitter(stories),
+                    lambda thread: self.storage.save_approved(thread, week_id, "twitter", "json")
+                ),
+                self._timed_format(
+                    "thumbnails", timings,
+                    self._generate_thumbnails(stories, week_id)
+                )
+            )
+            timings['total'] = round(time.perf_counter() - stage_started, 3)
+            self.logger.info(f"Format timings (s): {timings}")
             
-            await self.emit_event(EventType.CONTENT_FORMATTED, {"week_id": week_id})
+            await self.emit_event(EventType.CONTENT_FORMATTED, {
+                "week_id": week_id,
+                "thumbnails_rendered": thumbnails["rendered"],
+                "thumbnails_reused": thumbnails["reused"],
+                "timings": timings
+            })
             self.logger.info(f"Content formatted for week {week_id}")
         except Exception as e:
             self.logger.error(f"Error formatting content: {e}")
             await self.emit_event(EventType.ERROR_OCCURRED, {"error": str(e), "agent": "formatter"})
     
+    async def _timed_format(self, name, timings, generator, save=None):
+        """Await one format generator, save its output off the loop and record its duration"""
+        started = time.perf_counter()
+        with tracing.span(f"format.{name}"):
+            result = await generator
+            if save:
+                await asyncio.to_thread(save, result)
+        timings[name] = round(time.perf_counter() - started, 3)
+        self.logger.debug(f"{name} ready in {timings[name]:.2f}s")
+        return result
+    
     async def _format_newsletter(self, stories):
         """Generate newsletter HTML using Claude with Ralph's Loop quality refinement"""
         # Convert to format Claude expects
@@ -60,60 +108,84 @@ class FormatterAgent(BaseAgent):
                     'url': art.get('url', '')
                 })
 
-        # Use Ralph's Loop for iterative quality improvement
+        # Use Ralph's Loop for iterative quality improvement, one segment per story
         self.logger.info("Starting Ralph's Loop for newsletter content refinement")
+        refinement = self.context.agent_config('formatter').get('refinement', {}) or {}
 
         refined_content = await self.run_ralfs_loop(
             task=story_dicts,
             observe_func=self._observe_newsletter_state,
             reflect_func=self._reflect_on_newsletter_quality,
             act_func=self._improve_newsletter_content,
-            max_iterations=3,
-            confidence_threshold=0.85
+            max_iterations=refinement.get('max_iterations', 3),
+            confidence_threshold=refinement.get('confidence_threshold', 0.85),
+            min_improvement=refinement.get('min_improvement', 0.02)
         )
 
-        content = refined_content.get('content', '')
+        # Category markers let the newsletter fan-out honor subscriber preferences
+        content = "\n".join(
+            f"<!--story:{slugify(seg['story'].get('category') or 'news')}-->\n{seg['content']}\n<!--/story-->"
+            for seg in refined_content.get('segments', [])
+        )
 
         # Wrap in HTML template
-        return f"""<html>
-<head>
-    <style>
-        body {{ font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; }}
-        h1 {{ color: #6366F1; }}
-        .story {{ margin: 20px 0; padding: 15px; background: #f5f5f5; }}
-    </style>
-</head>
-<body>
-    <h1>Gen Z News Digest</h1>
-    {content}
-</body>
-</html>"""
+        with tracing.span("render.newsletter", segments=len(refined_content.get('segments', []))):
+            return render_template("newsletter.html", content=content)
 
     async def _observe_newsletter_state(self, task_or_result):
-        """Observe: Generate or examine newsletter content"""
+        """Observe: Generate one newsletter segment per story, or pass refined segments through"""
         if isinstance(task_or_result, list):
-            # Initial generation
-            self.logger.debug("Generating initial newsletter content")
-            content = await self.claude.format_newsletter(task_or_result)
+            # Initial generation, all segments in parallel
+            self.logger.debug(f"Generating {len(task_or_result)} newsletter segments")
+            contents = await asyncio.gather(*(
+                self.claude.format_newsletter_segment(story) for story in task_or_result
+            ))
             return {
-                'content': content,
-                'stories': task_or_result,
+                'segments': [
+                    {'story': story, 'content': content}
+                    for story, content in zip(task_or_result, contents)
+                ],
                 'iteration': 0
             }
         else:
-            # Return the improved content from previous iteration
+            # Return the improved segments from previous iteration
             return task_or_result
 
     async def _reflect_on_newsletter_quality(self, observation):
-        """Reflect: Assess newsletter quality and provide improvement suggestions"""
-        content = observation.get('content', '')
-        stories = observation.get('stories', [])
+        """Reflect: Score each segment; unchanged segments reuse their cached assessment"""
+        segments = observation.get('segments', [])
         iteration = observation.get('iteration', 0)
+        threshold = (self.context.agent_config('formatter').get('refinement', {}) or {}).get('segment_threshold', 0.8)
+
+        assessments = await asyncio.gather(*(self._assess_segment(seg['content']) for seg in segments))
+        for seg, assessment in zip(segments, assessments):
+            seg['assessment'] = assessment
+
+        scores = [a['confidence'] for a in assessments]
+        confidence = sum(scores) / len(scores) if scores else 1.0
+        weak = [i for i, score in enumerate(scores) if score < threshold]
+
+        self.logger.info(
+            f"Newsletter quality (iteration {iteration}): confidence {confidence:.2f}, "
+            f"{len(weak)}/{len(segments)} segment(s) below {threshold}"
+        )
+
+        return {
+            'confidence': confidence,
+            'segments': segments,
+            'weak_segments': weak,
+            'iteration': iteration
+        }
 
-        self.logger.debug(f"Reflecting on newsletter quality (iteration {iteration})")
+    async def _assess_segment(self, content: str) -> Dict:
+        """Assess one story segment; results are cached by content hash"""
+        key = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        cached = self._assessment_cache.get(key)
+        if cached is not None:
+            return cached
 
         # Quality assessment prompt
-        assessment_prompt = f"""Assess the quality of this Gen Z newsletter content and provide actionable feedback.
+        assessment_prompt = f"""Assess the quality of this Gen Z newsletter story and provide actionable feedback.
 
 CONTENT TO REVIEW:
 {content}
@@ -122,7 +194,7 @@ EVALUATION CRITERIA:
 1. **Engagement** (0-10): Is it exciting and attention-grabbing?
 2. **Clarity** (0-10): Are explanations clear and easy to understand?
 3. **Tone** (0-10): Does it match "excited teenager with composure"?
-4. **Relevance** (0-10): Does it explain why stories matter to Gen Z?
+4. **Relevance** (0-10): Does it explain why the story matters to Gen Z?
 5. **Writing Quality** (0-10): Short sentences, active voice, good flow?
 
 Provide your assessment in this exact JSON format:
@@ -133,7 +205,6 @@ Provide your assessment in this exact JSON format:
     "relevance_score": <0-10>,
     "writing_score": <0-10>,
     "overall_confidence": <0.0-1.0>,
-    "strengths": ["strength 1", "strength 2"],
     "weaknesses": ["weakness 1", "weakness 2"],
     "improvements": ["specific improvement 1", "specific improvement 2"]
 }}
@@ -141,9 +212,7 @@ Provide your assessment in this exact JSON format:
 Return ONLY valid JSON, nothing else."""
 
         try:
-            response = await self.claude.generate(assessment_prompt, max_tokens=1000, temperature=0.3)
-            # Parse JSON response
-            import json
+            response = await self.claude.generate(assessment_prompt, max_tokens=500, temperature=0.3)
             assessment = json.loads(response.strip())
 
             # Calculate average score and confidence
@@ -157,82 +226,66 @@ Return ONLY valid JSON, nothing else."""
 
             assessment['confidence'] = assessment.get('overall_confidence', avg_score)
             assessment['average_score'] = avg_score
-
-            self.logger.info(
-                f"Quality scores - Engagement: {assessment.get('engagement_score')}/10, "
-                f"Clarity: {assessment.get('clarity_score')}/10, "
-                f"Tone: {assessment.get('tone_score')}/10, "
-                f"Overall confidence: {assessment['confidence']:.2f}"
-            )
-
-            return {
-                **assessment,
-                'content': content,
-                'stories': stories,
-                'iteration': iteration
-            }
         except Exception as e:
-            self.logger.warning(f"Failed to parse quality assessment: {e}, using default confidence")
-            # Return high confidence to stop iteration on error
-            return {
-                'confidence': 0.9,
-                'content': content,
-                'stories': stories,
-                'iteration': iteration,
-                'improvements': []
-            }
+            self.logger.warning(f"Failed to parse segment assessment: {e}, using default confidence")
+            # High confidence so a parse failure never triggers a rewrite
+            assessment = {'confidence': 0.9, 'improvements': []}
+
+        self._assessment_cache[key] = assessment
+        return assessment
 
     async def _improve_newsletter_content(self, reflection):
-        """Act: Generate improved newsletter based on reflection feedback"""
-        content = reflection.get('content', '')
-        stories = reflection.get('stories', [])
-        improvements = reflection.get('improvements', [])
-        weaknesses = reflection.get('weaknesses', [])
+        """Act: Rewrite only the segments that scored below threshold"""
+        segments = reflection.get('segments', [])
         iteration = reflection.get('iteration', 0)
+        weak = [
+            i for i in reflection.get('weak_segments', [])
+            if segments[i]['assessment'].get('improvements')
+        ]
 
-        if not improvements:
-            # No improvements needed, return as is
-            return {
-                'content': content,
-                'stories': stories,
-                'iteration': iteration + 1
-            }
+        if weak:
+            self.logger.debug(f"Rewriting {len(weak)} segment(s) (iteration {iteration + 1})")
+            rewritten = await asyncio.gather(*(self._rewrite_segment(segments[i]) for i in weak))
+            segments = list(segments)
+            for i, content in zip(weak, rewritten):
+                segments[i] = {'story': segments[i]['story'], 'content': content}
 
-        self.logger.debug(f"Generating improved version (iteration {iteration + 1})")
+        return {
+            'segments': segments,
+            'iteration': iteration + 1
+        }
+
+    async def _rewrite_segment(self, segment: Dict) -> str:
+        """Regenerate one story segment from its own feedback"""
+        assessment = segment.get('assessment', {})
 
         # Improvement prompt
-        improvement_prompt = f"""Improve this Gen Z newsletter content based on specific feedback.
+        improvement_prompt = f"""Improve this Gen Z newsletter story based on specific feedback.
 
 CURRENT CONTENT:
-{content}
+{segment['content']}
 
 IDENTIFIED WEAKNESSES:
-{chr(10).join(f"- {w}" for w in weaknesses)}
+{chr(10).join(f"- {w}" for w in assessment.get('weaknesses', []))}
 
 SPECIFIC IMPROVEMENTS TO MAKE:
-{chr(10).join(f"- {imp}" for imp in improvements)}
+{chr(10).join(f"- {imp}" for imp in assessment.get('improvements', []))}
 
 REQUIREMENTS:
-- Keep the same stories but improve the writing
+- Keep the same story but improve the writing
 - Make it MORE engaging and exciting for Gen Z
 - Ensure tone is "excited teenager with composure"
 - Use short sentences, active voice, occasional exclamation points
-- Explain WHY each story matters to young people
-- Maintain HTML-friendly formatting (use <div class="story"> for each story)
+- Explain WHY the story matters to young people
+- Return a single <div class="story"> block and nothing else
 
-Generate the IMPROVED newsletter content following the feedback above."""
+Generate the IMPROVED story following the feedback above."""
 
-        improved_content = await self.claude.generate(
+        return await self.claude.generate(
             improvement_prompt,
-            max_tokens=3000,
+            max_tokens=800,
             temperature=0.7
         )
-
-        return {
-            'content': improved_content,
-            'stories': stories,
-            'iteration': iteration + 1
-        }
     
     async def _format_twitter(self, stories):
         """Generate tweet thread"""
@@ -258,62 +311,13 @@ Generate the IMPROVED newsletter content following the feedback above."""
         return tweets
     
     async def _generate_thumbnails(self, stories, week_id):
-        """Create thumbnail images"""
-        thumbnails = []
+        """Create thumbnail images, reusing cached renders of unchanged titles"""
+        jobs = []
         for i, story in enumerate(stories[:5]):
             if isinstance(story, dict):
                 art = story.get('article', {})
                 title = art.get('title', 'Untitled')[:60]
-                
-                # Create simple thumbnail
-                img = Image.new('RGB', (1200, 630), color='#6366F1')
-                draw = ImageDraw.Draw(img)
-                
-                # Try to use a font, fallback to default
-                try:
-                    font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 40)
-                except:
-                    try:
-                        font = ImageFont.load_default()
-                    except:
-                        font = None
-                
-                # Draw title (wrapped)
-                words = title.split()
-                lines = []
-                current_line = []
-                for word in words:
-                    if font:
-                        test_line = ' '.join(current_line + [word])
-                        bbox = draw.textbbox((0, 0), test_line, font=font)
-                        if bbox[2] - bbox[0] < 1100:
-                            current_line.append(word)
-                        else:
-                            if current_line:
-                                lines.append(' '.join(current_line))
-                            current_line = [word]
-                    else:
-                        if len(' '.join(current_line + [word])) < 50:
-                            current_line.append(word)
-                        else:
-                            if current_line:
-                                lines.append(' '.join(current_line))
-                            current_line = [word]
-                if current_line:
-                    lines.append(' '.join(current_line))
-                
-                y = 200
-                for line in lines[:3]:  # Max 3 lines
-                    if font:
-                        draw.text((50, y), line, fill='white', font=font)
-                    else:
-                        draw.text((50, y), line, fill='white')
-                    y += 60
-                
-                # Save thumbnail
-                thumbnail_path = f"data/approved/week-{week_id}/thumbnail_{i}.png"
-                Path(thumbnail_path).parent.mkdir(parents=True, exist_ok=True)
-                img.save(thumbnail_path)
-                thumbnails.append(thumbnail_path)
+                thumbnail_path = f"data/approved/week-{week_id}/thumbnail_{i}.{self.thumbnails.extension}"
+                jobs.append(self.thumbnails.make_job(title, thumbnail_path))
         
-        return thumbnails
+        return await self.thumbnails.render_all(jobs)
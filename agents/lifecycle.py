@@ -0,0 +1,54 @@
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple, Type
+from agents.base_agent import BaseAgent
+from events.event_bus import EventBus
+from utils.runtime import RuntimeContext
+
+async def start_agents(
+    agent_classes: List[Type[BaseAgent]],
+    event_bus: EventBus,
+    context: Optional[RuntimeContext] = None
+) -> Tuple[List[BaseAgent], Dict[str, float]]:
+    """
+    Construct agents in parallel and wait until all of them are subscribed.
+
+    Construction runs in worker threads because agent __init__ does blocking
+    work (config parsing, client setup). Once this returns, every agent has
+    registered its listeners, so the first publish cannot be missed.
+    All agents share one RuntimeContext (the process default if none given).
+
+    Returns:
+        (agents, timings) where timings holds seconds per agent_id plus
+        'construct', 'subscribe' and 'total' phases
+    """
+    context = context or RuntimeContext.default()
+    logger = context.get_logger("lifecycle")
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    async def construct(agent_class):
+        t0 = time.perf_counter()
+        agent = await asyncio.to_thread(agent_class, event_bus, context)
+        timings[agent.agent_id] = time.perf_counter() - t0
+        return agent
+
+    agents = list(await asyncio.gather(*(construct(cls) for cls in agent_classes)))
+    constructed = time.perf_counter()
+
+    await asyncio.gather(*(agent.start() for agent in agents))
+    finished = time.perf_counter()
+
+    timings['construct'] = constructed - started
+    timings['subscribe'] = finished - constructed
+    timings['total'] = finished - started
+
+    logger.info(
+        f"Started {len(agents)} agents in {timings['total']:.3f}s "
+        f"(construct: {timings['construct']:.3f}s, subscribe: {timings['subscribe']:.3f}s)"
+    )
+    return agents, timings
+
+async def stop_agents(agents: List[BaseAgent]):
+    """Unsubscribe all agents from the event bus"""
+    await asyncio.gather(*(agent.stop() for agent in agents))
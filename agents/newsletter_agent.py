@@ -0,0 +1,73 @@
+from agents.base_agent import BaseAgent
+from events.event_types import EventType, Event
+from utils.newsletter import NewsletterFanout, load_subscribers
+from pathlib import Path
+import os
+
+class NewsletterAgent(BaseAgent):
+    """Subscriber newsletter fan-out"""
+    
+    def __init__(self, event_bus, context=None):
+        super().__init__("newsletter_agent", event_bus, context)
+    
+    async def _setup_event_listeners(self):
+        # Subscribe to ready to publish events
+        await self.subscribe(EventType.READY_TO_PUBLISH, self.process)
+    
+    async def process(self, event: Event):
+        """Send the approved newsletter to every subscriber"""
+        week_id = event.data.get('week_id')
+        if not week_id:
+            self.logger.error("No week_id in ready to publish event")
+            return
+        
+        newsletter_config = self.context.agent_config('newsletter')
+        newsletter_path = Path(f"data/approved/week-{week_id}/newsletter.html")
+        subscribers_path = Path(newsletter_config.get('subscribers_file', 'data/subscribers.csv'))
+        if not newsletter_path.exists():
+            self.logger.error(f"Newsletter not found at {newsletter_path}")
+            return
+        if not subscribers_path.exists():
+            self.logger.warning(f"No subscriber list at {subscribers_path}; skipping newsletter")
+            return
+        
+        email_client = self.context.email_client
+        if not email_client.configured:
+            self.logger.warning("Email credentials not configured; skipping newsletter")
+            return
+        
+        # Unsubscribe and preference tokens are HMACs; an empty key makes them forgeable
+        secret = os.getenv("NEWSLETTER_SECRET", "")
+        if not secret:
+            self.logger.error("NEWSLETTER_SECRET not set; refusing to send a newsletter with forgeable unsubscribe links")
+            return
+        
+        self.logger.info(f"Sending newsletter for week {week_id}")
+        try:
+            fanout = NewsletterFanout(
+                email_client,
+                # Per-recipient log; a rerun only sends to addresses not yet reached
+                progress_path=f"data/approved/week-{week_id}/newsletter_progress.log",
+                workers=newsletter_config.get('workers') or email_client.pool_size,
+                max_attempts=newsletter_config.get('max_attempts', 3),
+                retry_delay=newsletter_config.get('retry_delay_seconds', 30),
+                unsubscribe_url=newsletter_config.get('unsubscribe_url', "https://example.com/unsubscribe?token={token}"),
+                preferences_url=newsletter_config.get('preferences_url', "https://example.com/preferences?token={token}"),
+                secret=secret,
+                logger=self.logger
+            )
+            subject = newsletter_config.get('subject', "Gen Z News Digest - Week {week_id}").format(week_id=week_id)
+            result = await fanout.send(
+                newsletter_path.read_text(encoding='utf-8'),
+                subject,
+                load_subscribers(subscribers_path)
+            )
+            
+            self.logger.info(
+                f"Newsletter week {week_id}: {result['sent']} sent, {result['skipped']} already sent, "
+                f"{result['failed']} failed, {result['messages_per_second']} msg/s"
+            )
+            await self.emit_event(EventType.NEWSLETTER_SENT, {"week_id": week_id, **result})
+        except Exception as e:
+            self.logger.error(f"Error sending newsletter: {e}")
+            await self.emit_event(EventType.ERROR_OCCURRED, {"error": str(e), "agent": "newsletter"})
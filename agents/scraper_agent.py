@@ -1,32 +1,23 @@
 import asyncio
-import feedparser
-import requests
-from bs4 import BeautifulSoup
-from newspaper import Article as NewsArticle
 from datetime import datetime
 from typing import List, Dict
 from agents.base_agent import BaseAgent
 from events.event_types import EventType, Article
-import yaml
-from dateutil import parser as date_parser
+from utils import tracing
+
+# feedparser, requests, bs4, newspaper3k and dateutil are imported inside the
+# methods that use them so that `import agents` stays cheap for scripts that
+# never scrape.
 
 class ScraperAgent(BaseAgent):
     """Daily news scraper with Ralf's Loop quality filtering"""
     
-    def __init__(self, event_bus):
-        super().__init__("scraper_agent", event_bus)
-        self.sources = self._load_sources()
-        self.categories = self._load_categories()
-    
-    def _load_sources(self) -> Dict:
-        with open("config/sources.yaml", 'r') as f:
-            return yaml.safe_load(f)['sources']
-    
-    def _load_categories(self) -> List:
-        with open("config/categories.yaml", 'r') as f:
-            return yaml.safe_load(f)['categories']
+    def __init__(self, event_bus, context=None):
+        super().__init__("scraper_agent", event_bus, context)
+        self.sources = self.context.sources
+        self.categories = self.context.categories
     
-    def _setup_event_listeners(self):
+    async def _setup_event_listeners(self):
         # Scraper runs on schedule, doesn't listen to events
         pass
     
@@ -34,6 +25,7 @@ class ScraperAgent(BaseAgent):
         # Not used - scraper runs independently
         pass
     
+    @tracing.traced("scrape")
     async def run_daily_scrape(self):
         """Main scraping workflow"""
         self.logger.info("Starting daily news scrape")
@@ -113,6 +105,7 @@ class ScraperAgent(BaseAgent):
         """Scrape all sources for a category"""
         articles = []
         sources = self.sources.get(category.replace(" ", "_"), [])
+        delay = self.context.agent_config('scraper').get('source_delay_seconds', 2)
         
         for source in sources:
             try:
@@ -124,7 +117,8 @@ class ScraperAgent(BaseAgent):
                 articles.extend(source_articles)
                 
                 # Rate limiting
-                await asyncio.sleep(2)
+                if delay:
+                    await asyncio.sleep(delay)
                 
             except Exception as e:
                 self.logger.error(f"Error scraping {source['name']}: {e}")
@@ -133,13 +127,17 @@ class ScraperAgent(BaseAgent):
     
     async def _scrape_rss(self, feed_url: str, source: str, category: str) -> List[Article]:
         """Parse RSS feed with enhanced content extraction"""
+        import feedparser
+
         articles = []
 
         max_retries = 3
         for attempt in range(max_retries):
             try:
                 self.logger.debug(f"Fetching RSS feed from {source} (attempt {attempt + 1})")
-                feed = feedparser.parse(feed_url)
+                with tracing.span("fetch.feed", source=source, attempt=attempt + 1) as span:
+                    feed = feedparser.parse(feed_url)
+                    span.set(entries=len(feed.entries))
 
                 if not feed.entries:
                     self.logger.warning(f"No entries found in RSS feed for {source}")
@@ -148,52 +146,54 @@ class ScraperAgent(BaseAgent):
                         continue
                     return articles
 
-                for entry in feed.entries[:15]:  # Increased to 15 per source
-                    try:
-                        # Extract full content if available
-                        full_content = self._extract_full_content(entry)
-                        summary = entry.get('summary', entry.get('description', ''))
-
-                        # Try to fetch full article content using newspaper3k
-                        article_url = entry.get('link', '')
-                        if article_url and not full_content:
-                            full_content = await self._extract_article_content(article_url)
-
-                        # Use full content for summary if available
-                        if full_content and len(full_content) > len(summary):
-                            summary = full_content[:800]  # Increased from 500
-                        else:
-                            summary = summary[:800]
-
-                        # Validate essential fields
-                        title = entry.get('title', '').strip()
-                        if not title or not article_url:
-                            self.logger.debug(f"Skipping entry with missing title or URL from {source}")
+                with tracing.span("parse.feed", source=source, entries=len(feed.entries)) as span:
+                    for entry in feed.entries[:15]:  # Increased to 15 per source
+                        try:
+                            # Extract full content if available
+                            full_content = self._extract_full_content(entry)
+                            summary = entry.get('summary', entry.get('description', ''))
+
+                            # Try to fetch full article content using newspaper3k
+                            article_url = entry.get('link', '')
+                            if article_url and not full_content:
+                                full_content = await self._extract_article_content(article_url)
+
+                            # Use full content for summary if available
+                            if full_content and len(full_content) > len(summary):
+                                summary = full_content[:800]  # Increased from 500
+                            else:
+                                summary = summary[:800]
+
+                            # Validate essential fields
+                            title = entry.get('title', '').strip()
+                            if not title or not article_url:
+                                self.logger.debug(f"Skipping entry with missing title or URL from {source}")
+                                continue
+
+                            # Enhanced image extraction
+                            image_url = self._extract_image(entry) or await self._find_article_image(article_url)
+
+                            article = Article(
+                                title=title,
+                                summary=summary,
+                                url=article_url,
+                                publish_date=self._parse_date(entry.get('published')),
+                                source=source,
+                                category=category,
+                                image_url=image_url,
+                                raw_content=full_content or summary
+                            )
+
+                            # Validate article before adding
+                            if self._validate_article(article):
+                                articles.append(article)
+                            else:
+                                self.logger.debug(f"Article validation failed: {title[:50]}")
+
+                        except Exception as e:
+                            self.logger.warning(f"Error processing RSS entry from {source}: {e}")
                             continue
-
-                        # Enhanced image extraction
-                        image_url = self._extract_image(entry) or await self._find_article_image(article_url)
-
-                        article = Article(
-                            title=title,
-                            summary=summary,
-                            url=article_url,
-                            publish_date=self._parse_date(entry.get('published')),
-                            source=source,
-                            category=category,
-                            image_url=image_url,
-                            raw_content=full_content or summary
-                        )
-
-                        # Validate article before adding
-                        if self._validate_article(article):
-                            articles.append(article)
-                        else:
-                            self.logger.debug(f"Article validation failed: {title[:50]}")
-
-                    except Exception as e:
-                        self.logger.warning(f"Error processing RSS entry from {source}: {e}")
-                        continue
+                    span.set(articles=len(articles))
 
                 self.logger.info(f"Successfully scraped {len(articles)} articles from {source}")
                 break  # Success, exit retry loop
@@ -222,6 +222,7 @@ class ScraperAgent(BaseAgent):
 
     async def _extract_article_content(self, url: str) -> str:
         """Extract full article content using newspaper3k"""
+        from newspaper import Article as NewsArticle
         try:
             article = NewsArticle(url)
             article.download()
@@ -233,6 +234,7 @@ class ScraperAgent(BaseAgent):
 
     async def _find_article_image(self, url: str) -> str:
         """Try to find article image from webpage"""
+        from newspaper import Article as NewsArticle
         try:
             article = NewsArticle(url)
             article.download()
@@ -270,6 +272,10 @@ class ScraperAgent(BaseAgent):
     
     async def _scrape_web(self, url: str, source: str, category: str) -> List[Article]:
         """Fallback web scraping using newspaper3k"""
+        import requests
+        from bs4 import BeautifulSoup
+        from newspaper import Article as NewsArticle
+
         articles = []
         
         try:
@@ -310,6 +316,7 @@ class ScraperAgent(BaseAgent):
     
     def _parse_date(self, date_str):
         """Parse various date formats"""
+        from dateutil import parser as date_parser
         if not date_str:
             return datetime.now()
         try:
@@ -380,10 +387,12 @@ class ScraperAgent(BaseAgent):
                 "quality_issues": quality_issues
             }
 
+        @tracing.traced("score.relevance")
         async def reflect(observation):
             """Reflect: Score articles for Gen Z relevance with better batching"""
             articles_list = observation["articles"]
             scores = []
+            batch_delay = self.context.agent_config('scraper').get('scoring_batch_delay_seconds', 1)
 
             # Score in batches to manage API calls
             batch_size = 30  # Increased from 20
@@ -409,8 +418,8 @@ class ScraperAgent(BaseAgent):
                         scores.append(0.5)
 
                 # Rate limit between batches
-                if batch_idx < len(batches) - 1:
-                    await asyncio.sleep(1)
+                if batch_delay and batch_idx < len(batches) - 1:
+                    await asyncio.sleep(batch_delay)
 
             # Calculate statistics
             avg_score = sum(scores) / len(scores) if scores else 0
@@ -1,18 +1,21 @@
 from agents.base_agent import BaseAgent
 from events.event_types import EventType, Event
+from utils.tweet_publisher import ThreadPublisher, ThreadState, TweepyTweetAPI
 from pathlib import Path
 import os
-import time
-import asyncio
 import json
 
 class TwitterAgent(BaseAgent):
     """Twitter/X publishing"""
     
-    def __init__(self, event_bus):
-        super().__init__("twitter_agent", event_bus)
+    def __init__(self, event_bus, context=None):
+        super().__init__("twitter_agent", event_bus, context)
         self.client = self._init_twitter()
     
+    @property
+    def configured(self) -> bool:
+        return self.client is not None
+    
     def _init_twitter(self):
         """Initialize Twitter client"""
         try:
@@ -28,12 +31,16 @@ class TwitterAgent(BaseAgent):
                 self.logger.warning("Twitter credentials not fully configured")
                 return None
             
+            import requests
+            
+            # Raw responses keep the x-rate-limit-* headers used for pacing
             return tweepy.Client(
                 bearer_token=bearer_token,
                 consumer_key=consumer_key,
                 consumer_secret=consumer_secret,
                 access_token=access_token,
-                access_token_secret=access_token_secret
+                access_token_secret=access_token_secret,
+                return_type=requests.Response
             )
         except ImportError:
             self.logger.warning("Tweepy not installed. Twitter publishing will fail.")
@@ -42,9 +49,9 @@ class TwitterAgent(BaseAgent):
             self.logger.warning(f"Error initializing Twitter client: {e}")
             return None
     
-    def _setup_event_listeners(self):
+    async def _setup_event_listeners(self):
         # Subscribe to ready to publish events
-        asyncio.create_task(self.event_bus.subscribe(EventType.READY_TO_PUBLISH, self.process))
+        await self.subscribe(EventType.READY_TO_PUBLISH, self.process)
     
     async def process(self, event: Event):
         """Publish Twitter thread"""
@@ -69,26 +76,26 @@ class TwitterAgent(BaseAgent):
             with open(tweets_path, 'r') as f:
                 tweets = json.load(f)
             
-            # Post thread
-            prev_id = None
-            for tweet in sorted(tweets, key=lambda x: x.get('position', 0)):
-                text = tweet.get('text', '')
-                if not text:
-                    continue
-                
-                try:
-                    response = self.client.create_tweet(
-                        text=text,
-                        in_reply_to_tweet_id=prev_id
-                    )
-                    prev_id = response.data['id']
-                    self.logger.info(f"Posted tweet {tweet.get('position', 0)}")
-                    await asyncio.sleep(10)  # Rate limiting
-                except Exception as e:
-                    self.logger.error(f"Error posting tweet: {e}")
-                    break
+            # Post thread; ids are persisted per tweet so a rerun resumes mid-thread
+            twitter_config = self.context.agent_config('twitter')
+            publisher = ThreadPublisher(
+                TweepyTweetAPI(self.client),
+                ThreadState(f"data/approved/week-{week_id}/twitter_state.json"),
+                min_interval=twitter_config.get('min_post_interval_seconds', 2),
+                max_wait=twitter_config.get('max_rate_limit_wait_seconds', 900),
+                logger=self.logger
+            )
+            result = await publisher.publish(tweets)
+            
+            if not result['complete']:
+                self.logger.warning(f"Twitter thread for week {week_id} incomplete; rerun to resume")
+                return
             
-            await self.emit_event(EventType.TWITTER_PUBLISHED, {"week_id": week_id})
+            await self.emit_event(EventType.TWITTER_PUBLISHED, {
+                "week_id": week_id,
+                "tweet_ids": result['ids'],
+                "resumed": result['skipped'] > 0
+            })
             self.logger.info(f"Twitter thread published for week {week_id}")
         except Exception as e:
             self.logger.error(f"Error publishing to Twitter: {e}")
@@ -1,31 +1,50 @@
 from agents.base_agent import BaseAgent
 from events.event_types import EventType, Event
+from utils.ffmpeg import FFmpegError, FFmpegRunner, ffmpeg_available, still_image_profile
+from utils.remote_render import RemoteRenderClient
+from utils.video_frames import background_frame
 from pathlib import Path
 import os
 import asyncio
-import requests
 import json
 
 class VideoAgent(BaseAgent):
     """Video generation using HeyGen or similar services"""
     
-    def __init__(self, event_bus):
-        super().__init__("video_agent", event_bus)
+    def __init__(self, event_bus, context=None):
+        super().__init__("video_agent", event_bus, context)
+        self.video_config = self.context.agent_config('video')
+        self.ffmpeg = FFmpegRunner(
+            max_concurrent=self.video_config.get('max_concurrent_encodes', 1),
+            logger=self.logger
+        )
         self._init_heygen()
     
     def _init_heygen(self):
         """Initialize HeyGen client"""
         self.heygen_api_key = os.getenv("HEYGEN_API_KEY")
-        self.heygen_api_url = "https://api.heygen.com/v1"
+        heygen_config = self.video_config.get('heygen', {}) or {}
+        self.heygen = RemoteRenderClient(
+            self.heygen_api_key or "",
+            base_url=heygen_config.get('api_url', "https://api.heygen.com"),
+            poll_interval=heygen_config.get('poll_interval_seconds', 5),
+            max_poll_interval=heygen_config.get('max_poll_interval_seconds', 60),
+            timeout=heygen_config.get('timeout_seconds', 1800),
+            logger=self.logger
+        )
         
         if not self.heygen_api_key:
             self.logger.warning("HEYGEN_API_KEY not set. Video generation will fail.")
         else:
             self.logger.info("HeyGen API key configured")
     
-    def _setup_event_listeners(self):
+    async def stop(self):
+        await super().stop()
+        self.heygen.close()
+    
+    async def _setup_event_listeners(self):
         # Subscribe to audio generated events
-        asyncio.create_task(self.event_bus.subscribe(EventType.AUDIO_GENERATED, self.process))
+        await self.subscribe(EventType.AUDIO_GENERATED, self.process)
     
     async def process(self, event: Event):
         """Generate video for podcast"""
@@ -77,21 +96,12 @@ class VideoAgent(BaseAgent):
     
     async def _generate_with_heygen(self, week_id: str, audio_path: Path, processed_data: dict) -> Path:
         """Generate video using HeyGen API"""
-        # HeyGen API integration
-        # This is a placeholder - actual implementation depends on HeyGen API docs
-        
-        headers = {
-            "X-API-KEY": self.heygen_api_key,
-            "Content-Type": "application/json"
-        }
-        
-        # Create video task
-        # Note: Actual HeyGen API endpoints may vary
+        # Note: the audio must be reachable by HeyGen (upload it first in production)
         payload = {
-            "video_input": {
-                "audio_url": str(audio_path.absolute()),  # Or upload first
-                "avatar_id": "default",  # Or use a specific avatar
-            },
+            "video_inputs": [{
+                "character": {"type": "avatar", "avatar_id": "default"},
+                "voice": {"type": "audio", "audio_url": str(audio_path.absolute())}
+            }],
             "caption": True,
             "dimension": {
                 "width": 1920,
@@ -99,93 +109,51 @@ class VideoAgent(BaseAgent):
             }
         }
         
-        # Make API call (this is a template - adjust based on actual HeyGen API)
-        response = requests.post(
-            f"{self.heygen_api_url}/video/generate",
-            headers=headers,
-            json=payload,
-            timeout=300
+        video_path = Path(f"data/approved/week-{week_id}/podcast.mp4")
+        result = await self.heygen.render(payload, video_path)
+        self.logger.info(
+            f"HeyGen job {result['job_id']} done in {result['seconds']:.0f}s "
+            f"({result['bytes'] / 1024 / 1024:.1f} MB{', resumed' if result['resumed'] else ''})"
         )
-        
-        if response.status_code == 200:
-            result = response.json()
-            video_url = result.get('video_url')
-            
-            # Download video
-            video_response = requests.get(video_url, timeout=300)
-            video_path = Path(f"data/approved/week-{week_id}/podcast.mp4")
-            video_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(video_path, 'wb') as f:
-                f.write(video_response.content)
-            
-            return video_path
-        else:
-            raise Exception(f"HeyGen API error: {response.status_code} - {response.text}")
+        return video_path
     
     async def _generate_simple_video(self, week_id: str, audio_path: Path) -> Path:
         """Generate simple video with static image + audio (fallback)"""
-        import subprocess
-        
         output_path = Path(f"data/approved/week-{week_id}/podcast.mp4")
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Create a simple image for the video
-        from PIL import Image, ImageDraw, ImageFont
-        
-        img = Image.new('RGB', (1920, 1080), color='#1a1a2e')
-        draw = ImageDraw.Draw(img)
-        
-        # Add title
-        try:
-            font_large = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 80)
-            font_medium = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 40)
-        except:
-            font_large = ImageFont.load_default()
-            font_medium = ImageFont.load_default()
-        
-        title = "Gen Z News Weekly"
-        subtitle = f"Week {week_id}"
+        if not ffmpeg_available():
+            self.logger.error("FFmpeg not available. Install with: brew install ffmpeg")
+            return None
         
-        # Draw title
-        bbox = draw.textbbox((0, 0), title, font=font_large)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        x = (1920 - text_width) // 2
-        y = 400
-        draw.text((x, y), title, fill='#6366F1', font=font_large)
+        # Title card is cached by its text, so re-runs skip the PIL render
+        image_path = output_path.parent / "thumbnail.png"
+        reused = await asyncio.to_thread(
+            background_frame, "Gen Z News Weekly", f"Week {week_id}", image_path,
+            tuple(self.video_config.get('resolution', [1920, 1080]))
+        )
+        self.logger.debug(f"Background frame {'reused from cache' if reused else 'rendered'}")
         
-        # Draw subtitle
-        bbox = draw.textbbox((0, 0), subtitle, font=font_medium)
-        text_width = bbox[2] - bbox[0]
-        x = (1920 - text_width) // 2
-        y = 500
-        draw.text((x, y), subtitle, fill='#EC4899', font=font_medium)
+        last_logged = {'fraction': 0.0}
         
-        # Save image
-        image_path = output_path.parent / "thumbnail.png"
-        img.save(image_path)
+        def on_progress(seconds, fraction):
+            if fraction is not None and fraction - last_logged['fraction'] >= 0.25:
+                last_logged['fraction'] = fraction
+                self.logger.info(f"Encoding {week_id}: {fraction:.0%} ({seconds:.0f}s of audio)")
         
-        # Use ffmpeg to create video
         try:
-            subprocess.run([
-                'ffmpeg',
-                '-loop', '1',
-                '-i', str(image_path),
-                '-i', str(audio_path),
-                '-c:v', 'libx264',
-                '-tune', 'stillimage',
-                '-c:a', 'aac',
-                '-b:a', '192k',
-                '-pix_fmt', 'yuv420p',
-                '-shortest',
-                '-y',
-                str(output_path)
-            ], check=True, capture_output=True)
-            
-            self.logger.info(f"Simple video created: {output_path}")
-            return output_path
-        except (subprocess.CalledProcessError, FileNotFoundError) as e:
+            result = await self.ffmpeg.encode_still(
+                image_path, audio_path, output_path,
+                profile=still_image_profile(
+                    fps=self.video_config.get('fps', 1),
+                    crf=self.video_config.get('crf', 28),
+                    preset=self.video_config.get('preset', 'veryfast')
+                ),
+                on_progress=on_progress
+            )
+        except FFmpegError as e:
             self.logger.error(f"FFmpeg error: {e}")
-            self.logger.info("FFmpeg not available. Install with: brew install ffmpeg")
             return None
+        
+        self.logger.info(f"Simple video created: {output_path} in {result['seconds']:.1f}s")
+        return output_path
@@ -1,21 +1,40 @@
 from agents.base_agent import BaseAgent
 from events.event_types import EventType, Event
+from utils.fs import publish_file
+from utils.image_derivatives import ImagePipeline
+from utils.search_index import SearchIndexBuilder
+from utils.site_build import SiteBuilder
+from utils.site_data import SiteDataWriter, load_weeks
+from utils.templates import render_to_file
+from utils import tracing
 from pathlib import Path
-import subprocess
-import shutil
+from typing import Any, Dict
 import json
 import asyncio
 
 class WebsiteAgent(BaseAgent):
     """Astro website publisher"""
     
-    def __init__(self, event_bus):
-        super().__init__("website_agent", event_bus)
+    def __init__(self, event_bus, context=None):
+        super().__init__("website_agent", event_bus, context)
         self.website_path = Path("website")
+        self.site_builder = SiteBuilder(self.website_path, logger=self.logger)
+        images_config = self.context.agent_config('website').get('images', {})
+        self.images = ImagePipeline(
+            widths=images_config.get('widths', [320, 640, 960, 1200]),
+            formats=images_config.get('formats', ["avif", "webp"]),
+            quality=images_config.get('quality', 70),
+            max_workers=images_config.get('max_workers'),
+            logger=self.logger
+        )
     
-    def _setup_event_listeners(self):
+    async def stop(self):
+        await super().stop()
+        self.images.close()
+    
+    async def _setup_event_listeners(self):
         # Subscribe to ready to publish events
-        asyncio.create_task(self.event_bus.subscribe(EventType.READY_TO_PUBLISH, self.process))
+        await self.subscribe(EventType.READY_TO_PUBLISH, self.process)
     
     async def process(self, event: Event):
         """Update and deploy website"""
@@ -28,94 +47,149 @@ class WebsiteAgent(BaseAgent):
         
         try:
             # Copy assets
-            self._copy_assets(week_id)
+            assets = await asyncio.to_thread(self._copy_assets, week_id)
             
-            # Create page
-            self._create_week_page(week_id)
+            # Responsive derivatives of article images and thumbnails
+            images = await self._publish_images(week_id)
             
-            # Update index page
-            self._update_index_page(week_id)
+            with tracing.span("render.pages", week_id=week_id):
+                # Create page
+                self._create_week_page(week_id, images['images'])
+                
+                # Update index page
+                self._update_index_page(week_id)
             
-            # Build
-            self.logger.info("Building Astro site...")
-            result = subprocess.run(
-                ["npm", "run", "build"],
-                cwd=self.website_path,
-                capture_output=True,
-                text=True
+            # Static JSON data (week shards, archive pages, category feeds)
+            data_stats = await asyncio.to_thread(self._update_site_data)
+            self.logger.info(
+                f"Site data: {data_stats['written']} written, {data_stats['unchanged']} unchanged, "
+                f"{data_stats['removed']} removed"
             )
-            if result.returncode != 0:
-                self.logger.error(f"Build failed: {result.stderr}")
+            
+            # Client-side search over approved weeks
+            search_stats = await asyncio.to_thread(self._update_search_index)
+            self.logger.info(f"Search index: {search_stats['written']} shard file(s) written")
+            
+            # Build only if the sources or assets changed since the last build
+            self.logger.info("Building Astro site...")
+            with tracing.span("build.site") as span:
+                build = await self.site_builder.build()
+                span.set(action=build['action'])
+            if not build['ok']:
+                self.logger.error(f"Build failed: {build['error']}")
                 return
+            self.logger.info(
+                f"Site {build['action']}: {build['changed']} changed file(s), "
+                f"routes {build['routes'] or '-'} in {build['seconds']:.2f}s"
+            )
             
-            # Deploy (if configured)
+            # Deploy (if configured and something changed)
             deploy_cmd = self.config.get('website', {}).get('deploy_command')
-            if deploy_cmd:
+            if deploy_cmd and build['action'] != "skip":
                 self.logger.info("Deploying website...")
-                subprocess.run(deploy_cmd.split(), cwd=self.website_path)
+                deploy = await self.site_builder.run_command(deploy_cmd.split())
+                if deploy['returncode'] != 0:
+                    self.logger.error(f"Deploy failed: {deploy['stderr']}")
             
-            await self.emit_event(EventType.WEBSITE_PUBLISHED, {"week_id": week_id})
+            await self.emit_event(EventType.WEBSITE_PUBLISHED, {
+                "week_id": week_id,
+                "build_action": build['action'],
+                "asset_bytes_written": assets['bytes_written'],
+                "image_bytes_written": images['bytes_written'],
+                "build_seconds": build['seconds']
+            })
             self.logger.info(f"Website published for week {week_id}")
         except Exception as e:
             self.logger.error(f"Error publishing website: {e}")
             await self.emit_event(EventType.ERROR_OCCURRED, {"error": str(e), "agent": "website"})
     
-    def _copy_assets(self, week_id):
-        """Copy audio and images to website"""
+    def _copy_assets(self, week_id) -> Dict[str, Any]:
+        """Publish audio and images to the website without re-copying unchanged media"""
         src = Path(f"data/approved/week-{week_id}")
         dest = self.website_path / "public" / "weeks" / week_id
         dest.mkdir(parents=True, exist_ok=True)
         
-        # Copy podcast
-        podcast_src = src / "podcast.mp3"
-        if podcast_src.exists():
-            shutil.copy(podcast_src, dest / "podcast.mp3")
+        assets = [src / "podcast.mp3"] + sorted(src.glob("thumbnail_*.*"))
+        stats = {"files": 0, "skipped": 0, "bytes_written": 0, "methods": {}}
+        for asset in assets:
+            if not asset.exists():
+                continue
+            method, written = publish_file(asset, dest / asset.name)
+            stats["files"] += 1
+            stats["skipped"] += method == "skip"
+            stats["bytes_written"] += written
+            stats["methods"][method] = stats["methods"].get(method, 0) + 1
         
-        # Copy thumbnails
-        for thumb in src.glob("thumbnail_*.png"):
-            shutil.copy(thumb, dest / thumb.name)
+        self.logger.info(
+            f"Assets for {week_id}: {stats['files']} file(s), {stats['skipped']} unchanged, "
+            f"{stats['bytes_written'] / 1024:.0f} KiB written {stats['methods']}"
+        )
+        return stats
+    
+    def _update_site_data(self) -> Dict[str, int]:
+        """Regenerate website/public/data from every approved week"""
+        approved = [week['week_id'] for week in self.storage.get_approved_weeks()]
+        weeks, updated = load_weeks(self.storage.base_path / "processed", approved)
+        return SiteDataWriter(self.website_path / "public" / "data").build(weeks, updated)
+    
+    def _update_search_index(self) -> Dict[str, int]:
+        """Rebuild the search index from every approved week"""
+        weeks = {}
+        for week in self.storage.get_approved_weeks():
+            processed = self.storage.load_processed(week['week_id'])
+            if processed:
+                weeks[week['week_id']] = processed
+        return SearchIndexBuilder(self.website_path / "public" / "data").build(weeks)
     
-    def _create_week_page(self, week_id):
+    async def _publish_images(self, week_id) -> Dict[str, Any]:
+        """
+        Publish srcset derivatives for each story: its article image, or the
+        story's rendered thumbnail when the article has none.
+        """
+        processed = self.storage.load_processed(week_id)
+        stories = [s for s in processed.get('stories', []) if isinstance(s, dict)] if processed else []
+        approved = Path(f"data/approved/week-{week_id}")
+        dest = self.website_path / "public" / "weeks" / week_id / "img"
+        
+        items, positions = [], []
+        for i, story in enumerate(stories):
+            source = story.get('article', {}).get('image_url')
+            name = f"story-{i}"
+            if not source:
+                thumbnails = sorted(approved.glob(f"thumbnail_{i}.*"))
+                source = str(thumbnails[0]) if thumbnails else None
+                name = f"thumbnail-{i}"
+            if source:
+                items.append({"source": source, "dest_dir": dest, "name": name, "url_prefix": f"/weeks/{week_id}/img"})
+                positions.append(i)
+        
+        stats = await self.images.process_all(items)
+        images = [None] * len(stories)
+        for i, image in zip(positions, stats['images']):
+            images[i] = image
+        stats['images'] = images
+        
+        self.logger.info(
+            f"Images for {week_id}: {stats['processed']} processed, {stats['reused']} reused, "
+            f"{stats['failed']} failed, {stats['bytes_written'] / 1024:.0f} KiB written"
+        )
+        return stats
+    
+    def _create_week_page(self, week_id, images=None):
         """Create Astro page for this week"""
         # Load stories
         processed = self.storage.load_processed(week_id)
         stories = processed.get('stories', []) if processed else []
-        
-        # Generate page content
-        stories_html = ""
-        for story in stories:
-            if isinstance(story, dict):
-                art = story.get('article', {})
-                stories_html += f"""
-                <div class="story-card">
-                    <h3>{art.get('title', 'Untitled')}</h3>
-                    <p class="category">{art.get('category', 'News')}</p>
-                    <p>{art.get('summary', '')[:200]}...</p>
-                    <a href="{art.get('url', '#')}" target="_blank">Read more →</a>
-                </div>
-                """
-        
-        template = f"""---
-const weekId = "{week_id}";
----
-<BaseLayout title="Week {{weekId}}">
-  <div class="week-header">
-    <h1 class="text-4xl font-bold mb-4">Week {{weekId}}</h1>
-    <audio controls class="w-full mb-8">
-      <source src="/weeks/{{weekId}}/podcast.mp3" type="audio/mpeg">
-      Your browser does not support the audio element.
-    </audio>
-  </div>
-  
-  <div class="stories-grid space-y-6">
-    {stories_html}
-  </div>
-</BaseLayout>
-"""
+        articles = [story.get('article', {}) for story in stories if isinstance(story, dict)]
         
         page_path = self.website_path / "src" / "pages" / f"week-{week_id}.astro"
-        page_path.parent.mkdir(parents=True, exist_ok=True)
-        page_path.write_text(template)
+        render_to_file(
+            "week_page.astro",
+            page_path,
+            week_id=week_id,
+            articles=articles,
+            images=images or [None] * len(articles)
+        )
     
     def _update_index_page(self, week_id):
         """Update main index page with latest week"""
@@ -0,0 +1,9 @@
+"""
+End-to-end pipeline benchmarks.
+
+`python -m benchmarks.pipeline` generates a synthetic news corpus, starts
+local stand-ins for every external service (news sites, the Anthropic
+Messages API, the X API, an SMTP server; TTS uses the fake backend) and
+runs scrape -> consolidate -> format -> audio -> publish against them,
+reporting per-stage latency percentiles, throughput and peak RSS as JSON.
+"""
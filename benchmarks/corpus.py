@@ -0,0 +1,186 @@
+"""
+Synthetic news corpora for the pipeline benchmark.
+
+A corpus is built deterministically from a seed: categories, a number of
+sources per category and articles per source, with a small share of
+near-duplicate headlines across sources so consolidation's de-duplication
+has work to do. Feeds are RSS 2.0 with content:encoded bodies and
+media:content images, so the scraper never falls back to page scraping.
+"""
+import hashlib
+import io
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, List, Optional
+from xml.sax.saxutils import escape
+from utils.site_data import slugify
+
+WORDS = (
+    "record launch season deal market update rally league chip model startup policy "
+    "vote climate storm streaming album tour trade final coach rookie transfer token "
+    "battery robot drone satellite vaccine study court ruling budget summit festival "
+    "premiere trailer console patch network outage lawsuit merger earnings forecast "
+    "campus housing rent wage strike protest election debate treaty border tariff "
+    "wildfire flood heatwave glacier ocean reef species museum gallery fashion sneaker"
+).split()
+
+VERBS = "beats breaks hits drops faces wins loses sparks reshapes tops delays unveils".split()
+
+# Used when a run asks for more categories than config/categories.yaml has
+FALLBACK_CATEGORY = {"priority": 9, "keywords": ["news"], "min_stories": 2}
+
+@dataclass
+class SyntheticArticle:
+    slug: str
+    title: str
+    summary: str
+    body: str
+    category: str
+    source: str
+    published: datetime
+
+@dataclass
+class SyntheticSource:
+    name: str
+    slug: str
+    category: str
+    articles: List[SyntheticArticle] = field(default_factory=list)
+
+def select_categories(base: List[Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
+    """The first `count` categories of `base`, padded with generic ones"""
+    categories = [dict(c) for c in base[:count]]
+    for i in range(len(categories), count):
+        categories.append({"name": f"Category {i + 1}", **FALLBACK_CATEGORY})
+    return categories
+
+class Corpus:
+    """Feeds, article pages and images for one synthetic news week"""
+
+    def __init__(
+        self,
+        categories: List[Dict[str, Any]],
+        sources_per_category: int = 3,
+        articles_per_source: int = 15,
+        duplicate_ratio: float = 0.05,
+        distinct_images: int = 8,
+        image_size=(1600, 900),
+        seed: int = 42,
+        now: Optional[datetime] = None
+    ):
+        self.categories = categories
+        self.distinct_images = max(1, distinct_images)
+        self.image_size = tuple(image_size)
+        self._images: Dict[int, bytes] = {}
+        rng = random.Random(seed)
+        now = now or datetime.now(timezone.utc)
+
+        self.sources: List[SyntheticSource] = []
+        titles: List[str] = []
+        for category in categories:
+            keywords = category.get("keywords") or [category["name"]]
+            for s in range(sources_per_category):
+                name = f"{category['name']} Wire {s + 1}"
+                source = SyntheticSource(name, slugify(name), category["name"])
+                for a in range(articles_per_source):
+                    if titles and rng.random() < duplicate_ratio:
+                        # Same story picked up by another outlet
+                        title = rng.choice(titles)
+                    else:
+                        title = self._headline(rng, rng.choice(keywords))
+                        titles.append(title)
+                    sentences = [self._sentence(rng, keywords) for _ in range(rng.randint(6, 14))]
+                    source.articles.append(SyntheticArticle(
+                        slug=f"{source.slug}-{a + 1}",
+                        title=title,
+                        summary=" ".join(sentences[:2]),
+                        body=" ".join(sentences),
+                        category=category["name"],
+                        source=name,
+                        # Within the scraper's 14-day window and this week
+                        published=now - timedelta(minutes=rng.randint(5, 3 * 24 * 60))
+                    ))
+                self.sources.append(source)
+        self._articles = {a.slug: a for s in self.sources for a in s.articles}
+        self._feeds = {s.slug: s for s in self.sources}
+
+    @staticmethod
+    def _headline(rng: random.Random, keyword: str) -> str:
+        words = rng.sample(WORDS, 5)
+        return f"{keyword} {words[0]} {rng.choice(VERBS)} {words[1]} {words[2]} as {words[3]} {words[4]}".capitalize()
+
+    @staticmethod
+    def _sentence(rng: random.Random, keywords: List[str]) -> str:
+        words = rng.sample(WORDS, rng.randint(8, 16))
+        words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        return " ".join(words).capitalize() + "."
+
+    @property
+    def article_count(self) -> int:
+        return len(self._articles)
+
+    def sources_config(self, base_url: str) -> Dict[str, Any]:
+        """config/sources.yaml content pointing at the feeds under `base_url`"""
+        sources: Dict[str, List[Dict[str, str]]] = {}
+        for source in self.sources:
+            sources.setdefault(source.category.replace(" ", "_"), []).append({
+                "name": source.name,
+                "url": f"{base_url}/articles/",
+                "rss": f"{base_url}/feeds/{source.slug}.xml",
+            })
+        return {"sources": sources}
+
+    def feed(self, slug: str, base_url: str) -> Optional[bytes]:
+        source = self._feeds.get(slug)
+        if source is None:
+            return None
+        items = []
+        for article in source.articles:
+            link = f"{base_url}/articles/{article.slug}.html"
+            items.append(
+                "<item>"
+                f"<title>{escape(article.title)}</title>"
+                f"<link>{link}</link>"
+                f"<guid>{link}</guid>"
+                f"<pubDate>{format_datetime(article.published)}</pubDate>"
+                f"<description>{escape(article.summary)}</description>"
+                f"<content:encoded><![CDATA[<p>{escape(article.body)}</p>]]></content:encoded>"
+                f'<media:content url="{base_url}/images/{article.slug}.jpg" medium="image" type="image/jpeg"/>'
+                "</item>"
+            )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" '
+            'xmlns:media="http://search.yahoo.com/mrss/">'
+            f"<channel><title>{escape(source.name)}</title><link>{base_url}/</link>"
+            f"<description>{escape(source.category)} news</description>"
+            + "".join(items)
+            + "</channel></rss>"
+        ).encode("utf-8")
+
+    def article_page(self, slug: str) -> Optional[bytes]:
+        article = self._articles.get(slug)
+        if article is None:
+            return None
+        return (
+            f"<!DOCTYPE html><html><head><title>{escape(article.title)}</title></head>"
+            f"<body><article><h1>{escape(article.title)}</h1><p>{escape(article.body)}</p></article></body></html>"
+        ).encode("utf-8")
+
+    def image(self, slug: str) -> Optional[bytes]:
+        """JPEG for an article; articles share `distinct_images` different pictures"""
+        if slug not in self._articles:
+            return None
+        index = int(hashlib.sha256(slug.encode("utf-8")).hexdigest(), 16) % self.distinct_images
+        if index not in self._images:
+            from PIL import Image
+
+            width, height = self.image_size
+            hue = index * 255 // self.distinct_images
+            img = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+            img = Image.merge("RGB", (img.getchannel(0), img.getchannel(1).point(lambda v: (v + hue) % 256), img.getchannel(2)))
+            buffer = io.BytesIO()
+            img.save(buffer, format="JPEG", quality=85)
+            self._images[index] = buffer.getvalue()
+        return self._images[index]
@@ -0,0 +1,112 @@
+"""Timing, percentile and memory helpers for the pipeline benchmark"""
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Sequence
+
+PERCENTILES = (50, 95, 99)
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    """Linearly interpolated percentile (numpy's default method)"""
+    if not samples:
+        raise ValueError("percentile of no samples")
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+def summarize(samples: Sequence[float], digits: int = 4) -> Dict[str, Any]:
+    """{"count", "mean", "min", "p50", "p95", "p99", "max"} of `samples`"""
+    if not samples:
+        return {"count": 0}
+    summary: Dict[str, Any] = {
+        "count": len(samples),
+        "mean": round(sum(samples) / len(samples), digits),
+        "min": round(min(samples), digits),
+    }
+    for q in PERCENTILES:
+        summary[f"p{q}"] = round(percentile(samples, q), digits)
+    summary["max"] = round(max(samples), digits)
+    return summary
+
+def peak_rss_mib() -> Dict[str, Optional[float]]:
+    """
+    High-water resident set size of this process and of its reaped children
+    (process-pool workers), in MiB. None where `resource` is unavailable.
+    """
+    try:
+        import resource
+    except ImportError:
+        return {"self": None, "children": None}
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    unit = 1 if sys.platform == "darwin" else 1024
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2 ** 20, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit / 2 ** 20, 1),
+    }
+
+class StageRecorder:
+    """
+    Collects wall-clock samples and item counts per named stage.
+
+    Each `stage()` block adds one duration sample; `items()` records how
+    much work that sample covered (articles, messages, bytes...) so
+    throughput can be derived. The RSS high-water mark is noted after every
+    stage, which shows which stage raised it.
+    """
+
+    def __init__(self):
+        self.seconds: Dict[str, List[float]] = {}
+        self.counts: Dict[str, List[int]] = {}
+        self.units: Dict[str, str] = {}
+        self.rss_after: Dict[str, Dict[str, Optional[float]]] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds.setdefault(name, []).append(time.perf_counter() - started)
+            self.rss_after[name] = peak_rss_mib()
+
+    def items(self, name: str, count: int, unit: str):
+        self.counts.setdefault(name, []).append(count)
+        self.units[name] = unit
+
+    def clear(self):
+        """Forget everything recorded so far (after warm-up runs)"""
+        self.seconds.clear()
+        self.counts.clear()
+        self.rss_after.clear()
+
+    def report(self) -> Dict[str, Any]:
+        stages = {}
+        for name, samples in self.seconds.items():
+            entry: Dict[str, Any] = {"seconds": summarize(samples)}
+            counts = self.counts.get(name)
+            if counts:
+                total_seconds = sum(samples)
+                entry["items"] = round(sum(counts) / len(counts), 1)
+                entry["unit"] = self.units[name]
+                entry["throughput_per_second"] = round(sum(counts) / total_seconds, 2) if total_seconds else None
+            entry["peak_rss_mib_after"] = self.rss_after.get(name)
+            stages[name] = entry
+        return stages
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Per-stage p50/p95 change between two benchmark reports"""
+    rows = []
+    for name, entry in current.get("stages", {}).items():
+        before = baseline.get("stages", {}).get(name)
+        if not before:
+            continue
+        row: Dict[str, Any] = {"stage": name}
+        for key in ("p50", "p95"):
+            now, then = entry["seconds"].get(key), before["seconds"].get(key)
+            row[key] = now
+            row[f"{key}_baseline"] = then
+            row[f"{key}_change_pct"] = round((now - then) / then * 100, 1) if now is not None and then else None
+        rows.append(row)
+    return rows
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+End-to-end pipeline benchmark against local stand-ins for every external service.
+
+    python -m benchmarks.pipeline --categories 5 --sources 3 --articles 15 --runs 3
+
+Each run gets a fresh working directory (its own config/, data/ and
+website/), so every stage starts cold, and goes through the production
+agents: scrape -> consolidate -> format -> audio -> publish (newsletter,
+X thread and website data concurrently, as on READY_TO_PUBLISH). Feeds,
+article pages and images, the Anthropic API and the X API are served by
+benchmarks.services; mail goes to utils.smtp_sink; TTS uses the fake
+backend. The Astro build itself is skipped: it is npm's work, not ours.
+
+The report (per-stage latency percentiles across runs, throughput, LLM
+call latencies, per-route service timings and peak RSS) is written as JSON
+to benchmarks/results/; pass --baseline with an earlier report to print
+the per-stage change. Span durations (LLM calls, fetches, renders, TTS,
+encodes) are summarized in the report too; --trace also writes the
+measured runs as a Chrome trace.
+"""
+import argparse
+import asyncio
+import copy
+import csv
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.corpus import Corpus, select_categories
+from benchmarks.metrics import StageRecorder, compare, peak_rss_mib, summarize
+from benchmarks.services import FakeServices, twitter_adapter
+from events.event_bus import EventBus
+from events.event_types import Event, EventType
+from utils.email_client import EmailClient
+from utils.llm_client import ClaudeClient
+from utils.runtime import RuntimeContext
+from utils.site_data import slugify
+from utils.smtp_sink import SMTPSink
+from utils.storage import Storage
+from utils import tracing
+
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+TWITTER_ENV = (
+    "TWITTER_BEARER_TOKEN", "TWITTER_API_KEY", "TWITTER_API_SECRET",
+    "TWITTER_ACCESS_TOKEN", "TWITTER_ACCESS_SECRET",
+)
+
+class TimedClaudeClient(ClaudeClient):
+    """The production client pointed at FakeServices, timing every generate() call"""
+
+    def __init__(self, base_url: str):
+        os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+        super().__init__()
+        # Never send a real key to the local server
+        self.client = self.client.with_options(base_url=base_url, api_key="benchmark")
+        self.latencies: List[float] = []
+
+    async def generate(self, *args, **kwargs) -> str:
+        started = time.perf_counter()
+        try:
+            return await super().generate(*args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+
+def benchmark_config() -> Dict[str, Any]:
+    """config/config.yaml with pacing removed and every service pointed at a stand-in"""
+    config = copy.deepcopy(RuntimeContext(REPO_ROOT / "config").config)
+    agents = config.setdefault('agents', {})
+    agents.setdefault('scraper', {}).update(source_delay_seconds=0, scoring_batch_delay_seconds=0)
+    agents.setdefault('audio', {}).update(tts_backend="fake", use_account_quota=False, loudnorm=False)
+    agents.setdefault('twitter', {}).update(min_post_interval_seconds=0)
+    agents.setdefault('newsletter', {}).update(subscribers_file="data/subscribers.csv", retry_delay_seconds=0)
+    config.setdefault('email', {})['approval_recipient'] = "editor@example.com"
+    config.setdefault('storage', {})['base_path'] = "data"
+    config.setdefault('website', {})['deploy_command'] = None
+    # Spans stay in memory for the report; --trace exports them once at the end
+    config['tracing'] = {"enabled": True, "output_dir": None, "format": "chrome"}
+    return config
+
+def write_subscribers(path: Path, count: int, categories: List[str], seed: int):
+    """Synthetic list: a third of readers take everything, the rest pick 1-3 categories"""
+    rng = random.Random(seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["email", "name", "categories"])
+        for i in range(count):
+            picks = rng.sample(categories, min(len(categories), rng.randint(1, 3))) if i % 3 else []
+            writer.writerow([f"reader{i}@example.com", f"Reader {i}", ";".join(picks)])
+
+def event(event_type: EventType, week_id: str) -> Event:
+    return Event(
+        event_type=event_type,
+        timestamp=datetime.now(),
+        data={"week_id": week_id},
+        agent_id="benchmark",
+        correlation_id=str(uuid.uuid4())
+    )
+
+def file_scrape_in_week():
+    """
+    Consolidation reads Monday-Friday of the current week; on a weekend
+    today's scrape is filed under Friday so the run still has a week.
+    """
+    today = datetime.now()
+    if today.weekday() < 5:
+        return
+    friday = today - timedelta(days=today.weekday() - 4)
+    raw = Path("data/raw")
+    (raw / today.strftime("%Y-%m-%d")).rename(raw / friday.strftime("%Y-%m-%d"))
+
+def require(path: Path, stage: str) -> Path:
+    if not path.exists():
+        raise RuntimeError(f"{stage} stage did not produce {path}; rerun with --verbose for the agent logs")
+    return path
+
+async def run_pipeline(
+    workdir: Path,
+    corpus: Corpus,
+    services: FakeServices,
+    sink: SMTPSink,
+    recorder: StageRecorder,
+    claude: TimedClaudeClient,
+    options: argparse.Namespace
+):
+    """One cold pass through every stage inside `workdir`"""
+    from agents import (
+        AudioAgent, ConsolidationAgent, FormatterAgent, NewsletterAgent,
+        ScraperAgent, TwitterAgent, WebsiteAgent
+    )
+    import yaml
+
+    config_dir = workdir / "config"
+    config_dir.mkdir(parents=True)
+    with open(config_dir / "categories.yaml", "w") as f:
+        yaml.safe_dump({"categories": corpus.categories}, f)
+    with open(config_dir / "sources.yaml", "w") as f:
+        yaml.safe_dump(corpus.sources_config(services.base_url), f)
+    write_subscribers(
+        workdir / "data" / "subscribers.csv",
+        options.subscribers,
+        [slugify(c['name']) for c in corpus.categories],
+        options.seed
+    )
+
+    agents = []
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    email_client = EmailClient(
+        smtp_server=sink.host, smtp_port=sink.port, sender="news@example.com", password="benchmark",
+        starttls=False, pool_size=options.smtp_pool
+    )
+    try:
+        context = RuntimeContext(
+            config_dir=str(config_dir),
+            config=benchmark_config(),
+            claude=claude,
+            storage=Storage("data"),
+            email_client=email_client
+        )
+        bus = EventBus()
+
+        def make(agent_class):
+            agent = agent_class(bus, context)
+            if not options.verbose:
+                agent.logger.logger.setLevel(logging.WARNING)
+            agents.append(agent)
+            return agent
+
+        scraper = make(ScraperAgent)
+        with recorder.stage("scrape"):
+            await scraper.run_daily_scrape()
+        scraped = sum(len(json.loads(p.read_text())) for p in Path("data/raw").glob("*/*.json"))
+        if not scraped:
+            raise RuntimeError("scrape stage kept no articles; rerun with --verbose for the agent logs")
+        recorder.items("scrape", scraped, "articles")
+        file_scrape_in_week()
+
+        consolidation = make(ConsolidationAgent)
+        with recorder.stage("consolidate"):
+            await consolidation.run_weekly_consolidation()
+        weeks = sorted(Path("data/processed").glob("week-*.json"))
+        if not weeks:
+            raise RuntimeError("consolidate stage saved no week; rerun with --verbose for the agent logs")
+        processed = weeks[-1]
+        week_id = processed.stem[len("week-"):]
+        stories = len(json.loads(processed.read_text())['stories'])
+        recorder.items("consolidate", scraped, "articles")
+
+        formatter = make(FormatterAgent)
+        with recorder.stage("format"):
+            await formatter.process(event(EventType.APPROVAL_RECEIVED, week_id))
+        approved = Path(f"data/approved/week-{week_id}")
+        require(approved / "newsletter.html", "format")
+        recorder.items("format", stories, "stories")
+
+        audio = make(AudioAgent)
+        audio.synthesizer.backend.delay = options.tts_latency
+        with recorder.stage("audio"):
+            await audio.process(event(EventType.CONTENT_FORMATTED, week_id))
+        recorder.items("audio", require(approved / "podcast.mp3", "audio").stat().st_size, "bytes")
+
+        newsletter, twitter, website = make(NewsletterAgent), make(TwitterAgent), make(WebsiteAgent)
+        twitter.client.session.mount("https://api.twitter.com/", twitter_adapter(services.base_url))
+        website.site_builder.build_command = [sys.executable, "-S", "-c", "pass"]
+        messages_before, tweets_before = sink.stats.messages, len(services.tweets)
+
+        async def timed(name, coroutine):
+            with recorder.stage(name):
+                await coroutine
+
+        ready = event(EventType.READY_TO_PUBLISH, week_id)
+        with recorder.stage("publish"):
+            await asyncio.gather(
+                timed("publish.newsletter", newsletter.process(ready)),
+                timed("publish.twitter", twitter.process(ready)),
+                timed("publish.website", website.process(ready))
+            )
+        sent = sink.stats.messages - messages_before
+        if sent < options.subscribers:
+            raise RuntimeError(f"publish stage sent {sent}/{options.subscribers} newsletters")
+        recorder.items("publish.newsletter", sent, "messages")
+        recorder.items("publish.twitter", len(services.tweets) - tweets_before, "tweets")
+        images = require(Path(f"website/public/weeks/{week_id}/img"), "publish")
+        recorder.items("publish.website", len(list(images.iterdir())), "image files")
+    finally:
+        for agent in agents:
+            await agent.stop()
+        email_client.close()
+        os.chdir(previous_cwd)
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+async def benchmark(options: argparse.Namespace) -> Dict[str, Any]:
+    base_categories = RuntimeContext(REPO_ROOT / "config").categories
+    corpus = Corpus(
+        select_categories(base_categories, options.categories),
+        sources_per_category=options.sources,
+        articles_per_source=options.articles,
+        seed=options.seed
+    )
+    os.environ.update({name: "benchmark" for name in TWITTER_ENV})
+    os.environ.setdefault("NEWSLETTER_SECRET", "benchmark")
+    recorder = StageRecorder()
+    started_at = datetime.now(timezone.utc)
+
+    with FakeServices(corpus, llm_latency=options.llm_latency, http_latency=options.http_latency) as services, \
+            SMTPSink(latency=options.smtp_latency, keep_messages=False) as sink, \
+            tempfile.TemporaryDirectory(prefix="pipeline-bench-") as tmp:
+        claude = TimedClaudeClient(services.base_url)
+        for run in range(options.warmup + options.runs):
+            if run == options.warmup:
+                # Warm-up runs only prime imports, pools and the OS page cache
+                recorder.clear()
+                tracing.get_tracer().clear()
+                services.reset_stats()
+                claude.latencies.clear()
+                smtp_before = (sink.stats.messages, sink.stats.bytes, sink.stats.connections)
+            label = f"warm-up {run + 1}" if run < options.warmup else f"run {run - options.warmup + 1}/{options.runs}"
+            print(f"  {label} ...", flush=True)
+            with tracing.trace("pipeline", run=label):
+                await run_pipeline(Path(tmp) / f"run-{run}", corpus, services, sink, recorder, claude, options)
+
+        llm_latencies = list(claude.latencies)
+        spans = tracing.get_tracer().spans()
+        if options.trace:
+            tracing.get_tracer().export(options.trace, trace_format="chrome")
+        span_seconds: Dict[str, List[float]] = {}
+        for span in spans:
+            span_seconds.setdefault(span.name, []).append(span.duration)
+        route_stats = {
+            route: {"requests": stats.requests, "bytes": stats.bytes, "seconds": summarize(stats.seconds)}
+            for route, stats in sorted(services.stats.items())
+        }
+        smtp = {
+            "messages": sink.stats.messages - smtp_before[0],
+            "bytes": sink.stats.bytes - smtp_before[1],
+            "connections": sink.stats.connections - smtp_before[2],
+        }
+
+    return {
+        "benchmark": "pipeline",
+        "started_at": started_at.isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "categories": options.categories,
+            "sources_per_category": options.sources,
+            "articles_per_source": options.articles,
+            "feed_articles": corpus.article_count,
+            "subscribers": options.subscribers,
+            "runs": options.runs,
+            "warmup": options.warmup,
+            "llm_latency": options.llm_latency,
+            "http_latency": options.http_latency,
+            "smtp_latency": options.smtp_latency,
+            "tts_latency": options.tts_latency,
+            "smtp_pool": options.smtp_pool,
+            "seed": options.seed,
+        },
+        "stages": recorder.report(),
+        "llm_calls": summarize(llm_latencies),
+        "spans": {name: summarize(samples) for name, samples in sorted(span_seconds.items())},
+        "services": route_stats,
+        "smtp": smtp,
+        "peak_rss_mib": peak_rss_mib(),
+    }
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None):
+    print(f"\n  {'stage':<20}{'p50 s':>9}{'p95 s':>9}{'p99 s':>9}{'items':>10}  {'throughput':<22}{'peak RSS':>10}")
+    for name, entry in report["stages"].items():
+        seconds = entry["seconds"]
+        items = f"{entry['items']:.0f}" if "items" in entry else "-"
+        rate = f"{entry['throughput_per_second']:.1f} {entry['unit']}/s" if entry.get("throughput_per_second") else "-"
+        rss = (entry.get("peak_rss_mib_after") or {}).get("self")
+        print(
+            f"  {name:<20}{seconds['p50']:>9.3f}{seconds['p95']:>9.3f}{seconds['p99']:>9.3f}{items:>10}  "
+            f"{rate:<22}{(f'{rss:.0f} MiB' if rss is not None else '-'):>10}"
+        )
+    llm = report["llm_calls"]
+    if llm.get("count"):
+        print(f"\n  LLM calls: {llm['count']}, p50 {llm['p50'] * 1000:.1f} ms, p99 {llm['p99'] * 1000:.1f} ms")
+    spans = sorted(report.get("spans", {}).items(), key=lambda item: item[1]["mean"] * item[1]["count"], reverse=True)
+    if spans:
+        print("  Most time in spans: " + ", ".join(
+            f"{name} {entry['mean'] * entry['count']:.2f}s/{entry['count']}" for name, entry in spans[:6]
+        ))
+    rss = report["peak_rss_mib"]
+    if rss["self"] is not None:
+        print(f"  Peak RSS: {rss['self']:.0f} MiB (largest child process {rss['children']:.0f} MiB)")
+
+    if baseline:
+        print(f"\n  vs baseline {baseline.get('commit') or '?'} ({baseline.get('started_at', '?')[:19]}):")
+        for row in compare(report, baseline):
+            change = row["p50_change_pct"]
+            print(f"  {row['stage']:<20}p50 {row['p50']:.3f}s vs {row['p50_baseline']:.3f}s"
+                  + (f"  ({change:+.1f}%)" if change is not None else ""))
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--categories", type=int, default=5, help="news categories in the corpus")
+    parser.add_argument("--sources", type=int, default=3, help="feeds per category")
+    parser.add_argument("--articles", type=int, default=15, help="articles per feed (the scraper reads at most 15)")
+    parser.add_argument("--subscribers", type=int, default=200, help="newsletter recipients")
+    parser.add_argument("--runs", type=int, default=3, help="measured runs")
+    parser.add_argument("--warmup", type=int, default=1, help="unmeasured runs first")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="seconds added to every LLM reply")
+    parser.add_argument("--http-latency", type=float, default=0.0, help="seconds added to every feed, page, image and X API reply")
+    parser.add_argument("--smtp-latency", type=float, default=0.0, help="seconds added to every SMTP reply")
+    parser.add_argument("--tts-latency", type=float, default=0.0, help="seconds added to every TTS segment")
+    parser.add_argument("--smtp-pool", type=int, default=4, help="pooled SMTP connections (newsletter workers)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="report path (default benchmarks/results/pipeline-<timestamp>.json)")
+    parser.add_argument("--baseline", type=Path, help="earlier report to compare against")
+    parser.add_argument("--verbose", action="store_true", help="show agent logs below WARNING")
+    parser.add_argument("--trace", type=Path, help="also write the measured runs' spans as a Chrome trace to this path")
+    return parser.parse_args(argv)
+
+async def main(argv: List[str]) -> int:
+    options = parse_args(argv)
+    if options.runs < 1:
+        print("--runs must be at least 1")
+        return 2
+    print(
+        f"🏁 Pipeline benchmark: {options.categories} categories x {options.sources} feeds x "
+        f"{options.articles} articles, {options.subscribers} subscribers, "
+        f"{options.runs} run(s) after {options.warmup} warm-up\n"
+    )
+    report = await benchmark(options)
+
+    output = options.output or RESULTS_DIR / f"pipeline-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if options.baseline:
+        with open(options.baseline, "r") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    print(f"\n  Report: {output}")
+    if options.trace:
+        print(f"  Trace: {options.trace}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
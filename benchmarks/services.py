@@ -0,0 +1,243 @@
+"""
+Local stand-ins for the pipeline's external HTTP services.
+
+One threaded HTTP/1.1 server on 127.0.0.1 serves:
+
+    GET  /feeds/<source>.xml       RSS feeds from a Corpus
+    GET  /articles/<slug>.html     article pages
+    GET  /images/<slug>.jpg        article images
+    POST /v1/messages              Anthropic Messages API
+    POST /2/tweets                 X API v2 tweet creation, with x-rate-limit-* headers
+
+LLM replies are canned per prompt type (a relevance number, a JSON
+assessment, a story <div>, a script of the requested length) so the agents
+parse them exactly as they parse real ones. `llm_latency` and
+`http_latency` delay every reply of that kind to model remote round trips.
+Every request is timed per route.
+"""
+import hashlib
+import itertools
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from benchmarks.corpus import Corpus, WORDS
+
+@dataclass
+class RouteStats:
+    requests: int = 0
+    bytes: int = 0
+    seconds: List[float] = field(default_factory=list)
+
+def _score(text: str) -> float:
+    """Deterministic pseudo-random value in [0, 1) for `text`"""
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16) / 0x100000000
+
+def _filler(seed: str, words: int) -> str:
+    picks = [WORDS[int(hashlib.sha256(f"{seed}{i}".encode()).hexdigest()[:6], 16) % len(WORDS)] for i in range(words)]
+    sentences = [" ".join(picks[i:i + 12]).capitalize() + "." for i in range(0, len(picks), 12)]
+    return " ".join(sentences)
+
+def fake_completion(prompt: str) -> str:
+    """The reply a well-behaved model would give to one of the pipeline's prompts"""
+    if "Return ONLY a number" in prompt:
+        return f"{0.45 + _score(prompt) * 0.5:.2f}"
+    if "JSON array of story indices" in prompt:
+        count = int(re.search(r"Rank these (\d+)", prompt).group(1))
+        return json.dumps(list(range(1, count + 1)))
+    if "Assess the quality" in prompt:
+        # Roughly one segment in five scores low enough to be rewritten once
+        confidence = 0.9 if _score(prompt) > 0.2 else 0.6
+        score = round(confidence * 10)
+        return json.dumps({
+            "engagement_score": score, "clarity_score": score, "tone_score": score,
+            "relevance_score": score, "writing_score": score,
+            "overall_confidence": confidence,
+            "weaknesses": [] if confidence > 0.8 else ["Hook is flat"],
+            "improvements": [] if confidence > 0.8 else ["Open with the stakes for readers"],
+        })
+    if '<div class="story">' in prompt:
+        title = re.search(r"^Title: (.*)$", prompt, re.M)
+        heading = title.group(1) if title else "This week's story"
+        return f'<div class="story"><h2>{heading}</h2><p>{_filler(prompt, 110)}</p></div>'
+    if "podcast script" in prompt:
+        target = re.search(r"Word count: ~(\d+) words", prompt)
+        return _filler(prompt, int(target.group(1)) if target else 300)
+    return _filler(prompt, 80)
+
+class FakeServices:
+    """Serves a Corpus and the fake APIs on 127.0.0.1:<port>"""
+
+    def __init__(
+        self,
+        corpus: Corpus,
+        llm_latency: float = 0.0,
+        http_latency: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        self.corpus = corpus
+        self.llm_latency = llm_latency
+        self.http_latency = http_latency
+        self.host = host
+        self.port = port
+        self.stats: Dict[str, RouteStats] = {}
+        self.tweets: List[Dict[str, Optional[str]]] = []
+        self._tweet_ids = itertools.count(1)
+        self._stats_lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.stats = {}
+            self.tweets = []
+
+    def _record(self, route: str, size: int, seconds: float):
+        with self._stats_lock:
+            stats = self.stats.setdefault(route, RouteStats())
+            stats.requests += 1
+            stats.bytes += size
+            stats.seconds.append(seconds)
+
+    def _get(self, path: str) -> Tuple[str, int, str, Optional[bytes]]:
+        """(route, status, content type, body) for a GET"""
+        match = re.fullmatch(r"/(feeds|articles|images)/([\w-]+)\.(xml|html|jpg)", path.split("?")[0])
+        if not match:
+            return "other", 404, "text/plain", b"not found"
+        kind, slug, _ = match.groups()
+        if kind == "feeds":
+            body, content_type = self.corpus.feed(slug, self.base_url), "application/rss+xml"
+        elif kind == "articles":
+            body, content_type = self.corpus.article_page(slug), "text/html; charset=utf-8"
+        else:
+            body, content_type = self.corpus.image(slug), "image/jpeg"
+        if body is None:
+            return kind, 404, "text/plain", b"not found"
+        if self.http_latency:
+            time.sleep(self.http_latency)
+        return kind, 200, content_type, body
+
+    def _messages(self, request: Dict) -> bytes:
+        prompt = "\n".join(
+            m["content"] if isinstance(m["content"], str) else "".join(part.get("text", "") for part in m["content"])
+            for m in request.get("messages", [])
+        )
+        text = fake_completion(prompt)
+        if self.llm_latency:
+            time.sleep(self.llm_latency)
+        return json.dumps({
+            "id": f"msg_{hashlib.sha256(prompt.encode()).hexdigest()[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": request.get("model", "fake"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": len(prompt) // 4, "output_tokens": len(text) // 4},
+        }).encode("utf-8")
+
+    def _tweet(self, request: Dict) -> Tuple[bytes, Dict[str, str]]:
+        tweet_id = str(next(self._tweet_ids))
+        reply_to = (request.get("reply") or {}).get("in_reply_to_tweet_id")
+        with self._stats_lock:
+            self.tweets.append({"id": tweet_id, "reply_to": reply_to})
+            posted = len(self.tweets)
+        if self.http_latency:
+            time.sleep(self.http_latency)
+        headers = {
+            "x-rate-limit-limit": "300",
+            "x-rate-limit-remaining": str(max(0, 300 - posted)),
+            "x-rate-limit-reset": str(int(time.time()) + 900),
+        }
+        return json.dumps({"data": {"id": tweet_id, "text": request.get("text", "")}}).encode("utf-8"), headers
+
+    def _handler(self):
+        services = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, content_type: str, body: bytes, headers: Optional[Dict[str, str]] = None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                started = time.perf_counter()
+                route, status, content_type, body = services._get(self.path)
+                self._send(status, content_type, body)
+                services._record(route, len(body), time.perf_counter() - started)
+
+            def do_POST(self):
+                started = time.perf_counter()
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length) or b"{}")
+                path = self.path.split("?")[0]
+                if path == "/v1/messages":
+                    route = "llm"
+                    body = services._messages(request)
+                    self._send(200, "application/json", body, {"request-id": "req_benchmark"})
+                elif path == "/2/tweets":
+                    route = "tweets"
+                    body, headers = services._tweet(request)
+                    self._send(201, "application/json", body, headers)
+                else:
+                    route, body = "other", b"not found"
+                    self._send(404, "text/plain", body)
+                services._record(route, len(body), time.perf_counter() - started)
+
+        return Handler
+
+    def start(self) -> "FakeServices":
+        """Start serving in a background thread; `port` is set once this returns"""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-services", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self) -> "FakeServices":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def twitter_adapter(base_url: str):
+    """
+    requests transport adapter that sends api.twitter.com calls to `base_url`.
+
+    Mount it on a tweepy.Client's session so the real client code (OAuth
+    signing, payloads, raw responses with rate-limit headers) is exercised
+    against FakeServices.
+    """
+    from requests.adapters import HTTPAdapter
+
+    class LocalTwitterAdapter(HTTPAdapter):
+        def send(self, request, **kwargs):
+            request.url = base_url + request.url[len("https://api.twitter.com"):]
+            return super().send(request, **kwargs)
+
+    return LocalTwitterAdapter()
@@ -28,6 +28,12 @@ class EventBus:
         async with self._lock:
             self.subscribers[event_type].append(callback)
     
+    async def unsubscribe(self, event_type: EventType, callback: Callable):
+        """Remove a previously registered callback"""
+        async with self._lock:
+            if callback in self.subscribers.get(event_type, []):
+                self.subscribers[event_type].remove(callback)
+    
     async def publish(self, event: Event):
         """Publish event to all subscribers"""
         async with self._lock:
@@ -11,9 +11,11 @@ class EventType(Enum):
     APPROVAL_RECEIVED = "approval_received"
     CONTENT_FORMATTED = "content_formatted"
     AUDIO_GENERATED = "audio_generated"
+    VIDEO_GENERATED = "video_generated"
     READY_TO_PUBLISH = "ready_to_publish"
     TWITTER_PUBLISHED = "twitter_published"
     WEBSITE_PUBLISHED = "website_published"
+    NEWSLETTER_SENT = "newsletter_sent"
     ERROR_OCCURRED = "error_occurred"
 
 @dataclass
@@ -0,0 +1,3 @@
+from .daemon import SchedulerDaemon, JobRunner
+
+__all__ = ['SchedulerDaemon', 'JobRunner']
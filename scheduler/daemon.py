@@ -0,0 +1,267 @@
+import asyncio
+import json
+import time
+import uuid
+from collections import defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+from events.event_bus import EventBus
+from events.event_types import Event, EventType
+from utils.runtime import RuntimeContext
+from utils import tracing
+
+class JobRunner:
+    """Runs named jobs under a concurrency cap and records their durations"""
+
+    def __init__(
+        self,
+        max_concurrent_jobs: int = 1,
+        history_size: int = 100,
+        logger=None,
+        on_complete: Optional[Callable[[], None]] = None
+    ):
+        self._semaphore = asyncio.Semaphore(max_concurrent_jobs)
+        self.history = defaultdict(lambda: deque(maxlen=history_size))
+        self.logger = logger
+        self.on_complete = on_complete
+
+    async def run(self, name: str, job: Callable[[], Awaitable[Any]]) -> Optional[Any]:
+        """Run `job` once a slot is free; failures are recorded, not raised"""
+        queued = time.perf_counter()
+        async with self._semaphore:
+            started = time.perf_counter()
+            status, error, result = "ok", None, None
+            try:
+                result = await job()
+            except Exception as e:
+                status, error = "error", str(e)
+                if self.logger:
+                    self.logger.error(f"Job {name} failed: {e}")
+            duration = time.perf_counter() - started
+            self.history[name].append({
+                "started_at": datetime.now().isoformat(),
+                "queued_seconds": round(started - queued, 3),
+                "duration_seconds": round(duration, 3),
+                "status": status,
+                "error": error
+            })
+            if self.logger:
+                self.logger.info(f"Job {name} finished in {duration:.2f}s ({status})")
+            if self.on_complete:
+                self.on_complete()
+            return result
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-job run counts and duration summary"""
+        summary = {}
+        for name, runs in self.history.items():
+            durations = [r["duration_seconds"] for r in runs]
+            summary[name] = {
+                "runs": len(runs),
+                "failures": sum(1 for r in runs if r["status"] != "ok"),
+                "last_seconds": durations[-1] if durations else None,
+                "avg_seconds": round(sum(durations) / len(durations), 3) if durations else None,
+                "max_seconds": max(durations) if durations else None,
+                "last_run": runs[-1] if runs else None
+            }
+        return summary
+
+class SchedulerDaemon:
+    """
+    Long-running process that triggers scrape, consolidation and publishing
+    from the `schedule_cron` entries in config.yaml.
+
+    Agents, the RuntimeContext (Claude client, storage, parsed config) and any
+    in-memory caches are created once and stay warm between runs.
+    """
+
+    STATS_FILE = "scheduler_stats.json"
+    # Events that must arrive for a week before it is marked published
+    REQUIRED_PUBLISH_EVENTS = ("website_published", "twitter_published")
+    # Agent emitting each publish event; events of unconfigured agents are not waited for
+    PUBLISH_EVENT_AGENTS = {"website_published": "website_agent", "twitter_published": "twitter_agent"}
+    # Formatter output in approved/week-*; once present, publishing skips re-formatting
+    FORMATTED_FILES = ("newsletter.html", "twitter.json")
+    ATTEMPTS_FILE = "publish_attempts.json"
+
+    def __init__(self, context: Optional[RuntimeContext] = None, event_bus: Optional[EventBus] = None):
+        self.context = context or RuntimeContext.default()
+        self.event_bus = event_bus or EventBus()
+        self.logger = self.context.get_logger("scheduler")
+        settings = self.context.config.get('scheduler', {}) or {}
+        self.runner = JobRunner(
+            max_concurrent_jobs=settings.get('max_concurrent_jobs', 1),
+            logger=self.logger,
+            on_complete=self._save_stats
+        )
+        self.agents = {}
+        self._scheduler = None
+        self._stopped = asyncio.Event()
+
+    async def start(self):
+        """Start agents once and register cron jobs"""
+        from apscheduler.schedulers.asyncio import AsyncIOScheduler
+        from apscheduler.triggers.cron import CronTrigger
+        from agents.lifecycle import start_agents
+        from agents.scraper_agent import ScraperAgent
+        from agents.consolidation_agent import ConsolidationAgent
+        from agents.formatter_agent import FormatterAgent
+        from agents.audio_agent import AudioAgent
+        from agents.twitter_agent import TwitterAgent
+        from agents.website_agent import WebsiteAgent
+        from agents.newsletter_agent import NewsletterAgent
+
+        agents, timings = await start_agents(
+            [ScraperAgent, ConsolidationAgent, FormatterAgent, AudioAgent, TwitterAgent, WebsiteAgent, NewsletterAgent],
+            self.event_bus,
+            self.context
+        )
+        self.agents = {agent.agent_id: agent for agent in agents}
+
+        timezone = self.context.config.get('system', {}).get('timezone')
+        self._scheduler = AsyncIOScheduler(timezone=timezone) if timezone else AsyncIOScheduler()
+
+        jobs = {
+            "scrape": ("scraper", self.run_scrape),
+            "consolidate": ("consolidation", self.run_consolidation),
+            "publish": ("publisher", self.run_publish),
+        }
+        for name, (section, func) in jobs.items():
+            cron = self.context.agent_config(section).get('schedule_cron')
+            if not cron:
+                self.logger.info(f"No schedule_cron for {section}; job {name} disabled")
+                continue
+            self._scheduler.add_job(
+                self.runner.run,
+                CronTrigger.from_crontab(cron, timezone=timezone),
+                args=[name, func],
+                id=name,
+                max_instances=1,
+                coalesce=True
+            )
+            self.logger.info(f"Scheduled {name} with cron '{cron}'")
+
+        self._scheduler.start()
+        self.logger.info(f"Scheduler daemon started in {timings['total']:.2f}s")
+
+    async def stop(self):
+        """Stop scheduling new runs and unsubscribe agents"""
+        from agents.lifecycle import stop_agents
+
+        if self._scheduler:
+            self._scheduler.shutdown(wait=False)
+        await stop_agents(list(self.agents.values()))
+        self._stopped.set()
+
+    async def run_forever(self):
+        await self.start()
+        await self._stopped.wait()
+
+    async def run_scrape(self):
+        await self.agents["scraper_agent"].run_daily_scrape()
+
+    async def run_consolidation(self):
+        await self.agents["consolidation_agent"].run_weekly_consolidation()
+
+    async def run_publish(self):
+        """
+        Publish every approved week that has not been published yet.
+
+        The bus swallows subscriber errors, so a week is only marked
+        PUBLISHED once every required publish event has been emitted for it;
+        otherwise it is retried on the next run, up to
+        `publisher.max_attempts` runs.
+        """
+        settings = self.context.agent_config('publisher')
+        max_attempts = settings.get('max_attempts', 3)
+        required = self._required_events(settings.get('require_events', self.REQUIRED_PUBLISH_EVENTS))
+        for week_id in self._pending_weeks():
+            week_dir = self.context.storage.base_path / "approved" / f"week-{week_id}"
+            attempts = self._publish_attempts(week_dir)
+            if attempts >= max_attempts:
+                self.logger.debug(f"Skipping week {week_id}; gave up after {attempts} attempt(s)")
+                continue
+            self.logger.info(f"Publishing approved week {week_id}")
+            confirmed = set()
+
+            async def confirm(event: Event):
+                if event.data.get('week_id') == week_id:
+                    confirmed.add(event.event_type)
+
+            for event_type in required:
+                await self.event_bus.subscribe(event_type, confirm)
+            try:
+                # Continue the trace consolidation started for this week
+                trace_id = self.context.storage.load_processed(week_id).get("trace_id")
+                with self.context.tracer.trace("publish", trace_id=trace_id, week_id=week_id):
+                    if not all((week_dir / name).exists() for name in self.FORMATTED_FILES):
+                        await self._publish(EventType.APPROVAL_RECEIVED, week_id)
+                    await self._publish(EventType.READY_TO_PUBLISH, week_id)
+            finally:
+                for event_type in required:
+                    await self.event_bus.unsubscribe(event_type, confirm)
+
+            missing = sorted(e.value for e in required - confirmed)
+            if not missing:
+                (week_dir / "PUBLISHED.txt").touch()
+                (week_dir / self.ATTEMPTS_FILE).unlink(missing_ok=True)
+                continue
+            attempts += 1
+            with open(week_dir / self.ATTEMPTS_FILE, 'w') as f:
+                json.dump({"attempts": attempts, "missing": missing, "last_attempt": datetime.now().isoformat()}, f)
+            if attempts >= max_attempts:
+                self.logger.error(
+                    f"Giving up on week {week_id} after {attempts} attempt(s); no {', '.join(missing)} event. "
+                    f"Delete {week_dir / self.ATTEMPTS_FILE} to retry"
+                )
+            else:
+                self.logger.error(
+                    f"Week {week_id} not marked published; no {', '.join(missing)} event; "
+                    f"will retry ({attempts}/{max_attempts})"
+                )
+
+    def _required_events(self, names):
+        """Publish events to wait for, leaving out those whose agent is not configured"""
+        required = set()
+        for name in names:
+            agent_id = self.PUBLISH_EVENT_AGENTS.get(name)
+            if agent_id is not None:
+                agent = self.agents.get(agent_id)
+                if agent is None or not agent.configured:
+                    self.logger.info(f"Not waiting for {name}; {agent_id} is not configured")
+                    continue
+            required.add(EventType(name))
+        return required
+
+    def _publish_attempts(self, week_dir: Path) -> int:
+        try:
+            with open(week_dir / self.ATTEMPTS_FILE) as f:
+                return int(json.load(f).get("attempts", 0))
+        except (FileNotFoundError, ValueError, AttributeError):
+            return 0
+
+    def _pending_weeks(self):
+        return sorted(
+            week['week_id'] for week in self.context.storage.get_approved_weeks()
+            if not (Path(week['path']) / "PUBLISHED.txt").exists()
+        )
+
+    async def _publish(self, event_type: EventType, week_id: str):
+        await self.event_bus.publish(Event(
+            event_type=event_type,
+            timestamp=datetime.now(),
+            data={"week_id": week_id},
+            agent_id="scheduler",
+            correlation_id=tracing.current_trace_id() or str(uuid.uuid4()),
+            metadata=tracing.event_metadata()
+        ))
+
+    def _save_stats(self):
+        """Write run durations where operators and dashboards can read them"""
+        path = self.context.storage.base_path / self.STATS_FILE
+        with open(path, 'w') as f:
+            json.dump({
+                "updated": datetime.now().isoformat(),
+                "jobs": self.runner.stats()
+            }, f, indent=2, default=str)
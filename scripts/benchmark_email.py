@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Benchmark email sending against a local SMTP sink: connection per message vs pooled"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.email_client import EmailClient
+from utils.smtp_sink import SMTPSink
+
+BODY = "<html><body>" + "<p>Story summary goes here.</p>" * 200 + "</body></html>"
+
+def make_client(sink: SMTPSink, **kwargs) -> EmailClient:
+    return EmailClient(
+        smtp_server=sink.host, smtp_port=sink.port, sender="news@example.com", password="local",
+        starttls=False, **kwargs
+    )
+
+async def main(count: int = 200, latency: float = 0.005):
+    messages = [
+        {"recipient": f"reader{i}@example.com", "subject": "Weekly digest", "body_html": BODY}
+        for i in range(count)
+    ]
+    print(f"📨 {count} messages, {latency * 1000:.0f} ms simulated round trip per SMTP reply\n")
+
+    runs = [
+        ("connect per message", dict(max_messages_per_connection=1), 1),
+        ("pooled (1 conn)", dict(pool_size=1), 1),
+        ("pooled (4 conns)", dict(pool_size=4), 4),
+    ]
+    for label, options, concurrency in runs:
+        with SMTPSink(latency=latency, keep_messages=False) as sink:
+            client = make_client(sink, **options)
+            stats = await client.send_batch_async(messages, concurrency=concurrency)
+            client.close()
+        print(
+            f"  {label:<22} {stats['messages_per_second']:8.1f} msg/s   "
+            f"{stats['seconds']:6.2f} s   {sink.stats.connections:4d} connection(s)   "
+            f"{stats['failed']} failed"
+        )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)))
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""Measure the per-call cost of Logger on the hot path"""
+import sys
+import time
+import logging
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.logger import Logger, shutdown_logging
+
+def bench(label: str, func, calls: int):
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed / calls * 1e6:8.2f} µs/call")
+
+def main(calls: int = 20000):
+    print(f"📏 Logger hot-path cost ({calls} calls each)\n")
+    logger = Logger("benchmark_logging")
+
+    # Console handler only prints INFO+, so keep the terminal quiet with DEBUG
+    bench("debug (queued)", lambda i: logger.debug(f"event {i}"), calls)
+    with logger.correlation("bench-run"):
+        bench("debug + correlation id", lambda i: logger.debug(f"event {i}"), calls)
+
+    logger.logger.setLevel(logging.INFO)
+    bench("debug (level disabled)", lambda i: logger.debug(f"event {i}"), calls)
+
+    start = time.perf_counter()
+    shutdown_logging()
+    print(f"\n  Drained queue in {time.perf_counter() - start:.3f}s")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Benchmark the newsletter fan-out against a local SMTP sink"""
+import asyncio
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.email_client import EmailClient
+from utils.newsletter import NewsletterFanout, Subscriber
+from utils.smtp_sink import SMTPSink
+from utils.templates import render_template
+
+CATEGORIES = ["ai-news", "technology", "sports", "entertainment", "politics"]
+
+def sample_newsletter() -> str:
+    content = "\n".join(
+        f"<!--story:{category}-->\n<div class=\"story\"><h2>{category} story {i}</h2>"
+        f"<p>{'Summary sentence. ' * 40}</p></div>\n<!--/story-->"
+        for i, category in enumerate(CATEGORIES * 2)
+    )
+    return render_template("newsletter.html", content=content)
+
+def synthetic_subscribers(count: int):
+    rng = random.Random(7)
+    for i in range(count):
+        categories = frozenset(rng.sample(CATEGORIES, rng.randint(1, 3))) if i % 3 else None
+        yield Subscriber(f"reader{i}@example.com", f"Reader {i}", categories)
+
+async def main(count: int = 500, latency: float = 0.002):
+    html = sample_newsletter()
+    print(f"📨 {count} subscribers, {latency * 1000:.0f} ms simulated round trip per SMTP reply\n")
+
+    for workers in (1, 4, 8):
+        with tempfile.TemporaryDirectory() as tmp, SMTPSink(latency=latency, keep_messages=False) as sink:
+            client = EmailClient(
+                smtp_server=sink.host, smtp_port=sink.port, sender="news@example.com", password="local",
+                starttls=False, pool_size=workers
+            )
+            fanout = NewsletterFanout(client, Path(tmp) / "progress.log", workers=workers, secret="bench")
+            result = await fanout.send(html, "Weekly digest", synthetic_subscribers(count))
+            client.close()
+        print(
+            f"  {workers} worker(s)   {result['messages_per_second']:8.1f} msg/s   {result['seconds']:6.2f} s   "
+            f"{result['variants']:3d} template variant(s)   {sink.stats.bytes / result['sent'] / 1024:5.1f} KiB/msg"
+        )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)))
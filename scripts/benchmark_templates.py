@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Benchmark template rendering for a 200-story digest"""
+import sys
+import time
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.templates import get_template, render_template
+
+def make_stories(count: int):
+    return [{
+        "category": ["Sports", "Technology", "AI News", "World News"][i % 4],
+        "rank": i + 1,
+        "title": f"Story {i}: Gen Z <reacts> to this week's headline",
+        "summary": "Something happened this week that matters & people are talking. " * 4,
+        "source": "Reuters",
+        "importance_score": 0.9 - i / 1000,
+        "published": "2026-01-05",
+        "url": f"https://example.com/story/{i}"
+    } for i in range(count)]
+
+def bench(label, func, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    print(f"  {label:<32} median {statistics.median(samples):7.2f} ms   p95 {sorted(samples)[int(runs * 0.95) - 1]:7.2f} ms")
+
+def main(count: int = 200, runs: int = 50):
+    stories = make_stories(count)
+    newsletter = "".join(f'<div class="story"><h2>{s["title"]}</h2><p>{s["summary"]}</p></div>' for s in stories)
+
+    print(f"📏 Rendering a {count}-story digest ({runs} runs)\n")
+
+    start = time.perf_counter()
+    get_template("approval_email.html")
+    get_template("newsletter.html")
+    print(f"  {'compile (once per process)':<32} {(time.perf_counter() - start) * 1000:7.2f} ms")
+
+    bench("approval_email.html", lambda: render_template(
+        "approval_email.html", week_id="2026-W01", stories=stories, categories=["Sports"]), runs)
+    bench("newsletter.html", lambda: render_template("newsletter.html", content=newsletter), runs)
+
+    html = render_template("approval_email.html", week_id="2026-W01", stories=stories, categories=["Sports"])
+    print(f"\n  approval email size: {len(html) / 1024:.1f} KiB")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Benchmark the podcast video encode: legacy ffmpeg arguments vs the still-image profile"""
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.ffmpeg import LEGACY_PROFILE, FFmpegRunner, ffmpeg_available, still_image_profile
+from utils.video_frames import background_frame
+
+async def make_silent_audio(runner: FFmpegRunner, path: Path, seconds: int):
+    """Generate a silent MP3 of the given length with ffmpeg's anullsrc source"""
+    await runner.run([
+        '-f', 'lavfi', '-i', 'anullsrc=r=44100:cl=mono',
+        '-t', str(seconds), '-c:a', 'libmp3lame', '-b:a', '64k',
+        str(path)
+    ])
+
+async def main(seconds: int = 300):
+    if not ffmpeg_available():
+        print("❌ ffmpeg not found on PATH")
+        return 1
+
+    runner = FFmpegRunner()
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        audio_path = tmp / "silence.mp3"
+        await make_silent_audio(runner, audio_path, seconds)
+        print(f"🎧 {seconds}s silent episode generated\n")
+
+        image_path = tmp / "frame.png"
+        for label in ("frame (cold)", "frame (cached)"):
+            start = time.perf_counter()
+            background_frame("Gen Z News Weekly", "Week 2026-W01", image_path, cache_dir=str(tmp / "frames"))
+            print(f"  {label:<18} {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        print()
+        for profile in (LEGACY_PROFILE, still_image_profile()):
+            output = tmp / f"{profile.name}.mp4"
+            result = await runner.encode_still(image_path, audio_path, output, profile=profile)
+            size = output.stat().st_size
+            print(
+                f"  {profile.name:<18} {result['seconds']:8.2f} s   "
+                f"{seconds / result['seconds']:6.1f}x realtime   {size / 1024:8.1f} KiB"
+            )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)))
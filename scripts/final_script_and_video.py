@@ -11,6 +11,7 @@ from utils.storage import Storage
 from utils.llm_client import ClaudeClient
 from elevenlabs.client import ElevenLabs
 from elevenlabs import VoiceSettings
+from utils.audio_stream import write_chunks
 from dotenv import load_dotenv
 import os
 import subprocess
@@ -73,12 +74,11 @@ async def generate_final():
             )
         )
         
-        audio = b"".join(audio_generator)
+        # Stream chunks to disk as they arrive
         audio_path = Path(f"data/approved/week-{week_id}/podcast.mp3")
-        with open(audio_path, 'wb') as f:
-            f.write(audio)
+        written = write_chunks(audio_generator, audio_path)
         
-        print(f"✅ Audio: {len(audio) / 1024:.0f} KB\n")
+        print(f"✅ Audio: {written['bytes'] / 1024:.0f} KB (first byte after {written['time_to_first_byte'] or 0:.1f}s)\n")
         
     except Exception as e:
         print(f"❌ Audio error: {e}\n")
@@ -145,7 +145,7 @@ async def generate_final():
     print("🎉 COMPLETE!")
     print(f"\n📁 Generated Files:")
     print(f"   ✅ Script: {script_path} ({len(script)} chars)")
-    print(f"   ✅ Audio: {audio_path} ({len(audio) / 1024:.0f} KB)")
+    print(f"   ✅ Audio: {audio_path} ({written['bytes'] / 1024:.0f} KB)")
     print(f"   ✅ Video: {video_path} ({video_path.stat().st_size / 1024 / 1024:.2f} MB)")
     print(f"\n🎬 To play video:")
     print(f"   open {video_path}")
@@ -12,6 +12,7 @@ from agents.audio_agent import AudioAgent
 from events.event_types import Event, EventType
 from utils.storage import Storage
 from utils.llm_client import ClaudeClient
+from utils.audio_stream import write_chunks
 from dotenv import load_dotenv
 import os
 
@@ -186,16 +187,12 @@ async def generate_full_audio():
             )
         )
         
-        # Convert generator to bytes
-        audio = b"".join(audio_generator)
-        
-        # Save audio
+        # Stream chunks to disk as they arrive
         output_dir = Path(f"data/approved/week-{week_id}")
         output_dir.mkdir(parents=True, exist_ok=True)
         audio_path = output_dir / "podcast.mp3"
         
-        with open(audio_path, 'wb') as f:
-            f.write(audio)
+        written = write_chunks(audio_generator, audio_path)
         
         size = audio_path.stat().st_size
         duration_estimate = len(script) / 150 * 60  # Rough estimate
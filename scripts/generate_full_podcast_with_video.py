@@ -13,6 +13,8 @@ from agents.video_agent import VideoAgent
 from events.event_types import Event, EventType
 from utils.storage import Storage
 from utils.llm_client import ClaudeClient
+from utils.audio_stream import write_chunks
+from utils.tts_budget import plan_script, remaining_characters, trim_script
 from dotenv import load_dotenv
 import os
 
@@ -88,41 +90,31 @@ async def generate_full_podcast():
                 'summary': art.get('summary', '')
             })
     
-    # Check available credits first
-    try:
-        from elevenlabs.client import ElevenLabs
-        temp_client = ElevenLabs(api_key=api_key)
-        # Try to estimate credits - use a shorter script if needed
-        # For now, generate 2-3 minute script to fit in credits
-        estimated_credits = 721  # From error message
-        if estimated_credits < 1000:
-            duration = 2  # 2 minutes = ~3000 chars max
-            print(f"⚠️  Limited credits detected ({estimated_credits}). Generating {duration}-minute script...")
-        else:
-            duration = 5
-    except:
-        duration = 3  # Safe default
+    # Size the script to the remaining ElevenLabs characters before generating it
+    from elevenlabs.client import ElevenLabs
+    remaining = remaining_characters(ElevenLabs(api_key=api_key))
+    if remaining is not None:
+        print(f"💳 ElevenLabs characters remaining: {remaining}")
+    plan = plan_script(story_dicts, max_duration_seconds=300, char_budget=remaining)
+    for note in plan.notes:
+        print(f"⚠️  {note}")
+    if plan.exhausted:
+        print("❌ No ElevenLabs characters left; not generating audio")
+        return
+    print(f"📐 Planned {len(plan.stories)} stories, ~{plan.duration_seconds}s, ~{plan.planned_characters} characters")
     
-    # Generate script that fits credits
-    script = await claude.generate_script(story_dicts, duration_mins=duration)
-    print(f"✅ Enhanced script generated ({len(script)} characters)\n")
+    script = await claude.generate_script(
+        plan.story_dicts(),
+        duration_mins=plan.duration_mins,
+        target_words=plan.target_words
+    )
+    budget = plan.record_actual(script)
+    print(f"✅ Enhanced script generated ({len(script)} characters, {budget['actual_vs_planned']}x planned)\n")
     
-    # If script is too long, truncate intelligently
-    if len(script) > estimated_credits - 100:  # Leave buffer
-        print(f"⚠️  Script too long. Truncating to fit credits...")
-        # Keep intro and first few stories
-        lines = script.split('\n')
-        truncated = []
-        char_count = 0
-        for line in lines:
-            if char_count + len(line) < estimated_credits - 200:
-                truncated.append(line)
-                char_count += len(line)
-            else:
-                break
-        truncated.append("\n\nThat's the news for this week. Stay informed, stay real. Peace out!")
-        script = '\n'.join(truncated)
-        print(f"✅ Script adjusted to {len(script)} characters\n")
+    # Safety net only: the plan already sized the request to the budget
+    if budget['over_budget']:
+        script = trim_script(script, plan.char_budget)
+        print(f"⚠️  Script overshot the budget; trimmed to {len(script)} characters\n")
     
     # Show script preview
     print("📄 Script Preview (first 500 chars):")
@@ -172,12 +164,9 @@ async def generate_full_podcast():
             )
         )
         
-        audio = b"".join(audio_generator)
-        
-        # Save audio
+        # Stream chunks to disk as they arrive
         audio_path = Path(f"data/approved/week-{week_id}/podcast.mp3")
-        with open(audio_path, 'wb') as f:
-            f.write(audio)
+        written = write_chunks(audio_generator, audio_path)
         
         size = audio_path.stat().st_size
         print(f"✅ High-quality audio generated!")
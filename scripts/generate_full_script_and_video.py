@@ -9,6 +9,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.storage import Storage
 from utils.llm_client import ClaudeClient
+from utils.audio_stream import write_chunks
 from dotenv import load_dotenv
 import os
 
@@ -136,12 +137,11 @@ Write the complete script as if you're the host speaking directly."""
             )
         )
         
-        audio = b"".join(audio_generator)
+        # Stream chunks to disk as they arrive
         audio_path = Path(f"data/approved/week-{week_id}/podcast.mp3")
-        with open(audio_path, 'wb') as f:
-            f.write(audio)
+        written = write_chunks(audio_generator, audio_path)
         
-        print(f"✅ Audio generated: {audio_path} ({len(audio) / 1024:.0f} KB)\n")
+        print(f"✅ Audio generated: {audio_path} ({written['bytes'] / 1024:.0f} KB)\n")
         
     except Exception as e:
         print(f"❌ Audio generation failed: {e}\n")
@@ -9,6 +9,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from elevenlabs.client import ElevenLabs
 from elevenlabs import VoiceSettings
+from utils.audio_stream import write_chunks
 from dotenv import load_dotenv
 import os
 
@@ -69,16 +70,13 @@ async def generate_minimal_audio():
             )
         )
         
-        audio = b"".join(audio_generator)
-        
-        # Save
+        # Save, streaming chunks to disk as they arrive
         week_id = datetime.now().strftime('%Y-W%W')
         output_dir = Path(f"data/approved/week-{week_id}")
         output_dir.mkdir(parents=True, exist_ok=True)
         audio_path = output_dir / "podcast.mp3"
         
-        with open(audio_path, 'wb') as f:
-            f.write(audio)
+        written = write_chunks(audio_generator, audio_path)
         
         size = audio_path.stat().st_size
         print(f"\n✅ Audio generated!")
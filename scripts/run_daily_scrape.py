@@ -14,6 +14,7 @@ load_dotenv()
 async def main():
     event_bus = EventBus()
     scraper = ScraperAgent(event_bus)
+    await scraper.start()
     await scraper.run_daily_scrape()
 
 if __name__ == "__main__":
@@ -2,7 +2,6 @@ import asyncio
 from pathlib import Path
 import sys
 from datetime import datetime
-import uuid
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -10,8 +9,11 @@ from agents.formatter_agent import FormatterAgent
 from agents.audio_agent import AudioAgent
 from agents.twitter_agent import TwitterAgent
 from agents.website_agent import WebsiteAgent
+from agents.newsletter_agent import NewsletterAgent
+from agents.lifecycle import start_agents, stop_agents
 from events.event_bus import EventBus
 from events.event_types import Event, EventType
+from utils import tracing
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -19,14 +21,12 @@ load_dotenv()
 async def main():
     event_bus = EventBus()
     
-    # Initialize all agents
-    formatter = FormatterAgent(event_bus)
-    audio = AudioAgent(event_bus)
-    twitter = TwitterAgent(event_bus)
-    website = WebsiteAgent(event_bus)
-    
-    # Wait a moment for agents to subscribe
-    await asyncio.sleep(1)
+    # Initialize all agents; returns once every subscription is registered
+    agents, timings = await start_agents(
+        [FormatterAgent, AudioAgent, TwitterAgent, WebsiteAgent, NewsletterAgent],
+        event_bus
+    )
+    print(f"Agents ready in {timings['total']:.2f}s")
     
     # Get week_id from command line or use current week
     if len(sys.argv) > 1:
@@ -38,30 +38,35 @@ async def main():
     
     print(f"Running publishing pipeline for week {week_id}")
     
-    # Simulate approval received event
-    await event_bus.publish(Event(
-        event_type=EventType.APPROVAL_RECEIVED,
-        timestamp=datetime.now(),
-        data={"week_id": week_id},
-        agent_id="manual",
-        correlation_id=str(uuid.uuid4())
-    ))
+    # One trace covers the whole run; agents continue it from the events
+    with tracing.trace("publish", week_id=week_id):
+        # Simulate approval received event
+        await event_bus.publish(Event(
+            event_type=EventType.APPROVAL_RECEIVED,
+            timestamp=datetime.now(),
+            data={"week_id": week_id},
+            agent_id="manual",
+            correlation_id=tracing.current_trace_id(),
+            metadata=tracing.event_metadata()
+        ))
     
-    # Wait for formatting and audio generation
-    await asyncio.sleep(10)
+        # Wait for formatting and audio generation
+        await asyncio.sleep(10)
     
-    # Trigger publishing
-    await event_bus.publish(Event(
-        event_type=EventType.READY_TO_PUBLISH,
-        timestamp=datetime.now(),
-        data={"week_id": week_id},
-        agent_id="manual",
-        correlation_id=str(uuid.uuid4())
-    ))
+        # Trigger publishing
+        await event_bus.publish(Event(
+            event_type=EventType.READY_TO_PUBLISH,
+            timestamp=datetime.now(),
+            data={"week_id": week_id},
+            agent_id="manual",
+            correlation_id=tracing.current_trace_id(),
+            metadata=tracing.event_metadata()
+        ))
     
-    # Wait for publishing to complete
-    await asyncio.sleep(30)
+        # Wait for publishing to complete
+        await asyncio.sleep(30)
     
+    await stop_agents(agents)
     print("Publishing pipeline complete")
 
 if __name__ == "__main__":
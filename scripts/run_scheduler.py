@@ -0,0 +1,23 @@
+import asyncio
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scheduler.daemon import SchedulerDaemon
+from dotenv import load_dotenv
+
+load_dotenv()
+
+async def main():
+    daemon = SchedulerDaemon()
+    try:
+        await daemon.run_forever()
+    finally:
+        await daemon.stop()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -13,6 +13,7 @@ load_dotenv()
 async def main():
     event_bus = EventBus()
     consolidator = ConsolidationAgent(event_bus)
+    await consolidator.start()
     await consolidator.run_weekly_consolidation()
 
 if __name__ == "__main__":
@@ -1,44 +1,33 @@
 #!/usr/bin/env python3
-"""Update website data file from processed stories"""
-import json
+"""Update website data files from processed stories"""
+import sys
 from pathlib import Path
-from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.search_index import SearchIndexBuilder
+from utils.site_data import SiteDataWriter, load_weeks
+from utils.storage import Storage
 
 def update_website_data():
-    """Copy latest processed data to website public folder"""
-    processed_dir = Path('data/processed')
-    website_data_dir = Path('website/public/data')
-    website_data_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Find latest week file
-    week_files = sorted(processed_dir.glob('week-*.json'), reverse=True)
+    """Regenerate the sharded JSON data under website/public/data"""
+    # Only approved weeks are published; rejected or pending ones stay private
+    approved = [week['week_id'] for week in Storage('data').get_approved_weeks()]
+    weeks, updated = load_weeks(Path('data/processed'), approved)
     
-    if week_files:
-        latest_file = week_files[0]
-        week_id = latest_file.stem.replace('week-', '')
-        
-        # Load and transform data
-        with open(latest_file, 'r') as f:
-            data = json.load(f)
-        
-        # Create website-friendly format
-        website_data = {
-            'weekId': week_id,
-            'stories': data.get('stories', []),
-            'updated': datetime.now().isoformat()
-        }
+    if weeks:
+        writer = SiteDataWriter(Path('website/public/data'))
+        stats = writer.build(weeks, updated)
         
-        # Save to website public folder
-        output_file = website_data_dir / 'latest-stories.json'
-        with open(output_file, 'w') as f:
-            json.dump(website_data, f, indent=2, default=str)
+        print(f'✅ Updated website data: {writer.out_dir}')
+        print(f'   Latest week: {max(weeks)} ({len(weeks)} week(s) in archive)')
+        print(f'   Files: {stats["written"]} written, {stats["unchanged"]} unchanged, {stats["removed"]} removed')
         
-        print(f'✅ Updated website data: {output_file}')
-        print(f'   Week: {week_id}')
-        print(f'   Stories: {len(website_data["stories"])}')
+        search = SearchIndexBuilder(writer.out_dir).build(weeks)
+        print(f'   Search index: {search["files"]} file(s), {search["written"]} written')
         return True
     else:
-        print('⚠️  No processed data found')
+        print('⚠️  No approved weeks with processed data found')
         return False
 
 if __name__ == "__main__":
@@ -0,0 +1,13 @@
+import pytest
+from utils import tracing
+
+@pytest.fixture(autouse=True)
+def traces_in_memory(monkeypatch):
+    """Keep spans in memory; config.yaml's tracing.output_dir would write trace files into logs/"""
+    configure = tracing.configure
+
+    def in_memory(enabled=True, output_dir=None, trace_format="chrome", keep=50):
+        return configure(enabled, None, trace_format, keep)
+
+    monkeypatch.setattr(tracing, "configure", in_memory)
+    tracing.get_tracer().output_dir = None
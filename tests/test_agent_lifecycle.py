@@ -0,0 +1,70 @@
+import pytest
+from datetime import datetime
+from agents.base_agent import BaseAgent
+from agents.lifecycle import start_agents, stop_agents
+from events.event_bus import EventBus
+from events.event_types import Event, EventType
+
+class EchoAgent(BaseAgent):
+    """Minimal agent that records the events it receives"""
+
+    def __init__(self, event_bus, context=None):
+        super().__init__("echo_agent", event_bus, context)
+        self.received = []
+
+    async def _setup_event_listeners(self):
+        await self.subscribe(EventType.APPROVAL_RECEIVED, self.process)
+
+    async def process(self, event: Event):
+        self.received.append(event)
+
+@pytest.mark.asyncio
+async def test_start_registers_before_first_publish():
+    """Events published right after start_agents() are delivered"""
+    event_bus = EventBus()
+    agents, timings = await start_agents([EchoAgent], event_bus)
+    agent = agents[0]
+
+    await event_bus.publish(Event(
+        event_type=EventType.APPROVAL_RECEIVED,
+        timestamp=datetime.now(),
+        data={"week_id": "2026-W01"},
+        agent_id="test",
+        correlation_id="test-123"
+    ))
+
+    assert len(agent.received) == 1
+    assert timings['total'] >= timings['construct']
+    assert 'echo_agent' in timings
+
+    handlers = [callback for _, callback in agent._subscriptions]
+    await stop_agents(agents)
+    assert handlers and not set(handlers) & set(event_bus.subscribers[EventType.APPROVAL_RECEIVED])
+    assert agent._subscriptions == []
+
+class SyncAgent(EchoAgent):
+    """Subscribes a plain function, which EventBus also accepts"""
+
+    async def _setup_event_listeners(self):
+        await self.subscribe(EventType.APPROVAL_RECEIVED, self.received.append)
+
+@pytest.mark.asyncio
+async def test_sync_callbacks_are_called():
+    event_bus = EventBus()
+    agent = SyncAgent(event_bus)
+    await agent.start()
+    (_, handler), = agent._subscriptions
+    try:
+        # Called directly: the bus would swallow an error from awaiting None
+        await handler(Event(EventType.APPROVAL_RECEIVED, datetime.now(), {}, "test", "test-456"))
+    finally:
+        await agent.stop()
+    assert [e.correlation_id for e in agent.received] == ["test-456"]
+
+def test_agents_share_runtime_context():
+    """Agents built without a context reuse the process-wide one"""
+    first = EchoAgent(EventBus())
+    second = EchoAgent(EventBus())
+    assert first.context is second.context
+    assert first.storage is second.storage
+    assert first.config is second.config
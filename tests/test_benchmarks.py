@@ -0,0 +1,89 @@
+import json
+import pytest
+import requests
+from benchmarks.corpus import Corpus, select_categories
+from benchmarks.metrics import StageRecorder, compare, percentile, summarize
+from benchmarks.services import FakeServices, fake_completion
+
+CATEGORIES = [{"name": "Sports", "priority": 1, "keywords": ["NBA"], "min_stories": 2}]
+
+def test_percentiles_interpolate():
+    samples = [float(n) for n in range(1, 101)]
+    assert percentile(samples, 50) == pytest.approx(50.5)
+    assert percentile([3.0], 99) == 3.0
+    summary = summarize(samples)
+    assert summary["count"] == 100 and summary["min"] == 1.0 and summary["max"] == 100.0
+    assert summary["p50"] < summary["p95"] < summary["p99"]
+    assert summarize([]) == {"count": 0}
+
+def test_recorder_reports_throughput_and_compares_runs():
+    recorder = StageRecorder()
+    for _ in range(3):
+        with recorder.stage("scrape"):
+            pass
+        recorder.items("scrape", 10, "articles")
+    report = recorder.report()
+
+    assert report["scrape"]["seconds"]["count"] == 3
+    assert report["scrape"]["items"] == 10 and report["scrape"]["unit"] == "articles"
+
+    before = {"stages": {"scrape": {"seconds": {"p50": 2.0, "p95": 4.0}}}}
+    after = {"stages": {"scrape": {"seconds": {"p50": 1.0, "p95": 4.0}}}}
+    row, = compare(after, before)
+    assert row["p50_change_pct"] == -50.0 and row["p95_change_pct"] == 0.0
+
+def test_corpus_is_deterministic_and_feeds_parse():
+    feedparser = pytest.importorskip("feedparser")
+    corpus = Corpus(CATEGORIES, sources_per_category=2, articles_per_source=4, seed=1)
+    again = Corpus(CATEGORIES, sources_per_category=2, articles_per_source=4, seed=1)
+    assert corpus.article_count == 8
+    assert [a.title for s in corpus.sources for a in s.articles] == [a.title for s in again.sources for a in s.articles]
+
+    source = corpus.sources[0]
+    config = corpus.sources_config("http://bench")
+    assert config["sources"]["Sports"][0]["rss"] == f"http://bench/feeds/{source.slug}.xml"
+
+    feed = feedparser.parse(corpus.feed(source.slug, "http://bench"))
+    entry = feed.entries[0]
+    assert entry.title == source.articles[0].title
+    # Full text and image in the feed keep the scraper off the article pages
+    assert entry.content[0].value and entry.media_content[0]["url"].startswith("http://bench/images/")
+    assert corpus.feed("missing", "http://bench") is None
+
+def test_select_categories_pads_with_generic_ones():
+    categories = select_categories(CATEGORIES, 3)
+    assert [c["name"] for c in categories] == ["Sports", "Category 2", "Category 3"]
+    assert all(c["min_stories"] for c in categories)
+
+def test_fake_completions_parse_like_model_replies():
+    assert 0.45 <= float(fake_completion("Rate it.\nReturn ONLY a number between 0.0 and 1.0")) < 0.95
+    assert json.loads(fake_completion("Rank these 3 news stories\nReturn a JSON array of story indices")) == [1, 2, 3]
+    assessment = json.loads(fake_completion("Assess the quality of this Gen Z newsletter story"))
+    assert 0 < assessment["overall_confidence"] <= 1
+    segment = fake_completion('Format: A single HTML <div class="story"> block\n\nTitle: Big game')
+    assert segment.startswith('<div class="story"><h2>Big game</h2>')
+    script = fake_completion("Create a podcast script\nWord count: ~120 words (hard limit)")
+    assert len(script.split()) == 120
+
+def test_services_serve_corpus_and_apis():
+    corpus = Corpus(CATEGORIES, sources_per_category=1, articles_per_source=2, distinct_images=1, image_size=(64, 36))
+    article = corpus.sources[0].articles[0]
+    with FakeServices(corpus) as services:
+        assert requests.get(f"{services.base_url}/articles/{article.slug}.html").status_code == 200
+        image = requests.get(f"{services.base_url}/images/{article.slug}.jpg")
+        assert image.headers["Content-Type"] == "image/jpeg" and image.content[:2] == b"\xff\xd8"
+        assert requests.get(f"{services.base_url}/feeds/nope.xml").status_code == 404
+
+        message = requests.post(f"{services.base_url}/v1/messages", json={
+            "model": "m", "max_tokens": 10,
+            "messages": [{"role": "user", "content": "Return ONLY a number"}]
+        }).json()
+        assert message["type"] == "message" and float(message["content"][0]["text"])
+
+        first = requests.post(f"{services.base_url}/2/tweets", json={"text": "hook"})
+        reply = requests.post(f"{services.base_url}/2/tweets", json={"text": "2", "reply": {"in_reply_to_tweet_id": "1"}})
+        assert first.status_code == 201 and reply.json()["data"]["id"] == "2"
+        assert reply.headers["x-rate-limit-remaining"] == "298"
+        assert services.tweets[1] == {"id": "2", "reply_to": "1"}
+
+    assert services.stats["llm"].requests == 1 and services.stats["tweets"].requests == 2
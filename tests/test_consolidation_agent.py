@@ -10,3 +10,28 @@ def test_load_categories(consolidator):
     """Test category loading"""
     assert len(consolidator.categories) > 0
     assert consolidator.categories[0]['name'] == "Sports"
+
+def scraped(titles, publish_date):
+    return {"Sports": [
+        {"title": title, "summary": "Summary " * 50, "url": f"https://example.com/{i}",
+         "publish_date": publish_date, "source": "ESPN", "category": "Sports", "relevance_score": 0.9}
+        for i, title in enumerate(titles)
+    ]}
+
+@pytest.mark.asyncio
+async def test_ranking_returns_selected_stories(consolidator):
+    from datetime import datetime
+    titles = ["Playoff upset stuns league", "Rookie signs record deal", "Coach fired after loss",
+              "Stadium vote passes council", "Transfer window opens early"]
+    ranked = await consolidator._rank_with_ralfs_loop(scraped(titles, datetime.now().isoformat()))
+
+    sports = next(c for c in consolidator.categories if c['name'] == "Sports")
+    assert len(ranked) == sports['min_stories']
+    assert [r.rank for r in ranked] == list(range(1, len(ranked) + 1))
+
+@pytest.mark.asyncio
+async def test_ranking_accepts_timezone_aware_feed_dates(consolidator):
+    ranked = await consolidator._rank_with_ralfs_loop(
+        scraped(["Playoff upset stuns league", "Rookie signs record deal"], "Mon, 19 Oct 2026 08:00:00 +0000")
+    )
+    assert len(ranked) == 2
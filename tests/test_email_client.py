@@ -0,0 +1,124 @@
+import email
+import os
+import pytest
+from email import policy
+from utils.email_client import DeliveryUnknownError, EmailClient
+from utils.newsletter import is_permanent
+from utils.smtp_sink import SMTPSink
+
+class LostReplySink(SMTPSink):
+    """Queues the message, then drops the connection instead of answering 250"""
+
+    async def _reply(self, writer, line: str):
+        if line.startswith("250 OK: queued"):
+            writer.close()
+            raise ConnectionResetError
+        await super()._reply(writer, line)
+
+@pytest.fixture
+def sink():
+    with SMTPSink() as server:
+        yield server
+
+def make_client(sink, **kwargs):
+    return EmailClient(
+        smtp_server="127.0.0.1", smtp_port=sink.port, sender="news@example.com", password="secret",
+        starttls=False, **kwargs
+    )
+
+def parse(received):
+    return email.message_from_bytes(received.data, policy=policy.default)
+
+def test_connection_is_reused_across_messages(sink):
+    client = make_client(sink)
+    for i in range(5):
+        assert client.send_email(f"reader{i}@example.com", f"Issue {i}", "<p>Hi</p>")
+    client.close()
+
+    assert sink.stats.messages == 5
+    assert sink.stats.connections == 1 and sink.stats.logins == 1
+    assert parse(sink.messages[3])["Subject"] == "Issue 3"
+
+def test_connection_recycled_after_message_limit(sink):
+    client = make_client(sink, max_messages_per_connection=2)
+    stats = client.send_batch([
+        {"recipient": f"r{i}@example.com", "subject": "s", "body_html": "<p>x</p>"} for i in range(5)
+    ])
+    client.close()
+
+    assert stats["sent"] == 5
+    assert client.connections_opened == 3
+
+def test_attachment_is_streamed_and_dot_stuffing_round_trips(sink, tmp_path):
+    attachment = tmp_path / "podcast.mp3"
+    payload = os.urandom(300 * 1024)
+    attachment.write_bytes(payload)
+    body = "<p>Top story</p>\n.leading dot line\n"
+
+    client = make_client(sink)
+    assert client.send_email("reader@example.com", "Weekly ✨", body, attachments=[attachment])
+    client.close()
+
+    message = parse(sink.messages[0])
+    assert message["Subject"] == "Weekly ✨"
+    parts = list(message.iter_parts())
+    assert ".leading dot line" in parts[0].get_content()
+    assert parts[1].get_filename() == "podcast.mp3"
+    assert parts[1].get_content() == payload
+
+def test_refused_recipient_fails_without_breaking_the_batch(tmp_path):
+    with SMTPSink(reject=["bounce@example.com"]) as sink:
+        client = make_client(sink)
+        stats = client.send_batch([
+            {"recipient": "a@example.com", "subject": "s", "body_html": "x"},
+            {"recipient": "bounce@example.com", "subject": "s", "body_html": "x"},
+            {"recipient": "b@example.com", "subject": "s", "body_html": "x"},
+        ])
+        client.close()
+
+    assert (stats["sent"], stats["failed"]) == (2, 1)
+    assert stats["errors"][0]["recipient"] == "bounce@example.com"
+    assert sink.stats.connections == 1
+
+@pytest.mark.asyncio
+async def test_async_batch_uses_pool(sink):
+    client = make_client(sink, pool_size=3)
+    messages = [{"recipient": f"r{i}@example.com", "subject": "s", "body_html": "x"} for i in range(12)]
+    stats = await client.send_batch_async(messages)
+    client.close()
+
+    assert stats["sent"] == 12 and stats["messages_per_second"] > 0
+    assert sink.stats.connections == 3
+
+class DropFirstDataSink(SMTPSink):
+    """Drops the first connection when DATA is accepted, before any body arrives"""
+
+    async def _reply(self, writer, line: str):
+        if line.startswith("354") and self.stats.connections == 1:
+            writer.close()
+            raise ConnectionResetError
+        await super()._reply(writer, line)
+
+def test_drop_before_data_is_retried_once():
+    with DropFirstDataSink() as sink:
+        client = make_client(sink)
+        client.send_message(client.build_message("a@example.com", "s", "x"))
+        client.close()
+
+    assert sink.stats.messages == 1 and sink.stats.connections == 2
+
+def test_lost_reply_after_data_is_not_resent():
+    with LostReplySink() as sink:
+        client = make_client(sink)
+        with pytest.raises(DeliveryUnknownError) as raised:
+            client.send_message(client.build_message("a@example.com", "s", "x"))
+        client.close()
+
+    # The message reached the server once; no second connection resent it
+    assert sink.stats.messages == 1 and sink.stats.connections == 1
+    assert is_permanent(raised.value)
+
+def test_unconfigured_client_skips(monkeypatch):
+    monkeypatch.delenv("EMAIL_SENDER", raising=False)
+    monkeypatch.delenv("EMAIL_PASSWORD", raising=False)
+    assert EmailClient().send_email("a@example.com", "s", "x") is False
@@ -0,0 +1,74 @@
+import asyncio
+import sys
+import pytest
+from utils.ffmpeg import FFmpegError, FFmpegRunner, parse_progress, progress_seconds, still_image_profile
+
+FAKE_FFMPEG = '''#!{python}
+import sys, time
+args = sys.argv[1:]
+if "--fail" in args:
+    sys.stderr.write("Invalid data found when processing input\\n")
+    sys.exit(1)
+for second in range(1, 4):
+    print(f"frame={{second}}\\nout_time_us={{second * 1_000_000}}\\nprogress=continue", flush=True)
+    time.sleep(float(args[args.index("--sleep") + 1]) if "--sleep" in args else 0)
+print("out_time_us=3000000\\nprogress=end", flush=True)
+open(args[-1], "wb").write(b"mp4")
+'''
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path):
+    path = tmp_path / "ffmpeg"
+    path.write_text(FAKE_FFMPEG.format(python=sys.executable))
+    path.chmod(0o755)
+    return str(path)
+
+def test_parse_progress_block():
+    block = parse_progress(["frame=25", "out_time_us=1500000", "out_time_ms=1500000", "progress=continue"])
+    assert progress_seconds(block) == 1.5
+    assert progress_seconds({"out_time_us": "N/A"}) is None
+
+def test_still_image_profile_arguments():
+    args = still_image_profile(fps=1).build("card.png", "podcast.mp3", "out.mp4")
+    assert args[:5] == ["-loop", "1", "-framerate", "1", "-i"]
+    assert ["-tune", "stillimage"] == args[args.index("-tune"):args.index("-tune") + 2]
+    assert "+faststart" in args
+    assert args[-1] == "out.mp4"
+
+@pytest.mark.asyncio
+async def test_run_reports_progress(fake_ffmpeg, tmp_path):
+    seen = []
+    runner = FFmpegRunner(binary=fake_ffmpeg)
+    result = await runner.run([str(tmp_path / "out.mp4")], duration=3, on_progress=lambda s, f: seen.append(f))
+    assert seen == [pytest.approx(1 / 3), pytest.approx(2 / 3), 1.0, 1.0]
+    assert result["out_time"] == 3.0
+    assert (tmp_path / "out.mp4").read_bytes() == b"mp4"
+
+@pytest.mark.asyncio
+async def test_failure_raises_with_stderr(fake_ffmpeg, tmp_path):
+    runner = FFmpegRunner(binary=fake_ffmpeg)
+    with pytest.raises(FFmpegError, match="Invalid data"):
+        await runner.run(["--fail", str(tmp_path / "out.mp4")])
+
+@pytest.mark.asyncio
+async def test_cancel_terminates_encode_and_removes_output(fake_ffmpeg, tmp_path):
+    output = tmp_path / "out.mp4"
+    output.write_bytes(b"partial")
+    runner = FFmpegRunner(binary=fake_ffmpeg)
+
+    task = asyncio.create_task(runner.run(["--sleep", "10", str(output)], output_path=output))
+    await asyncio.sleep(0.5)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(task, 5)
+    assert not output.exists()
+
+@pytest.mark.asyncio
+async def test_concurrent_encodes_are_capped(fake_ffmpeg, tmp_path):
+    runner = FFmpegRunner(max_concurrent=1, binary=fake_ffmpeg)
+    started = asyncio.get_running_loop().time()
+    await asyncio.gather(*(
+        runner.run(["--sleep", "0.1", str(tmp_path / f"out{i}.mp4")]) for i in range(2)
+    ))
+    # Each fake encode sleeps 3 x 0.1s; serialized, two take at least 0.6s
+    assert asyncio.get_running_loop().time() - started >= 0.6
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import pytest
+from datetime import datetime
+from agents.formatter_agent import FormatterAgent
+from events.event_bus import EventBus
+from events.event_types import Event, EventType
+from utils.runtime import RuntimeContext
+from utils.storage import Storage
+
+class SlowClaude:
+    """Stands in for ClaudeClient with a fixed latency per call"""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    async def format_newsletter_segment(self, story):
+        await asyncio.sleep(self.delay)
+        return f'<div class="story">{story["title"]}</div>'
+
+    async def generate(self, prompt, **kwargs):
+        return json.dumps({"overall_confidence": 0.95, "improvements": []})
+
+class ScriptedClaude:
+    """Scores segments from a table and records every prompt it receives"""
+
+    def __init__(self, scores):
+        self.scores = scores
+        self.prompts = []
+
+    async def format_newsletter_segment(self, story):
+        return f'<div class="story">{story["title"]} v0</div>'
+
+    async def generate(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        if prompt.startswith("Improve"):
+            title = prompt.split('<div class="story">')[1].split(" v")[0]
+            version = int(prompt.split(" v")[1][0]) + 1
+            return f'<div class="story">{title} v{version}</div>'
+        for marker, score in self.scores.items():
+            if marker in prompt:
+                return json.dumps({"overall_confidence": score, "improvements": ["punchier"]})
+        return json.dumps({"overall_confidence": 0.95, "improvements": []})
+
+@pytest.fixture
+def formatter(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    context = RuntimeContext(config={}, claude=SlowClaude(0.3), storage=Storage(str(tmp_path / "data")))
+    agent = FormatterAgent(EventBus(), context)
+
+    async def slow_thumbnails(stories, week_id):
+        await asyncio.sleep(0.3)
+        return {"paths": [], "rendered": 0, "reused": 0}
+
+    agent._generate_thumbnails = slow_thumbnails
+    return agent
+
+@pytest.mark.asyncio
+async def test_formats_run_concurrently(formatter):
+    formatter.storage.save_processed({
+        "week_id": "2026-W01",
+        "stories": [{"article": {"title": f"Story {i}", "category": "Sports", "url": "https://x"}} for i in range(3)]
+    }, "2026-W01")
+    emitted = []
+    formatter.emit_event = lambda event_type, data: asyncio.sleep(0, result=emitted.append((event_type, data)))
+
+    await formatter.process(Event(
+        event_type=EventType.APPROVAL_RECEIVED,
+        timestamp=datetime.now(),
+        data={"week_id": "2026-W01"},
+        agent_id="test",
+        correlation_id="test-123"
+    ))
+
+    event_type, data = emitted[-1]
+    timings = data["timings"]
+    assert event_type == EventType.CONTENT_FORMATTED
+    assert set(timings) == {"newsletter", "twitter", "thumbnails", "total"}
+    # Wall clock tracks the slowest generator, not the sum
+    assert timings["total"] < timings["newsletter"] + timings["thumbnails"]
+    assert (formatter.storage.base_path / "approved" / "week-2026-W01" / "newsletter.html").exists()
+
+@pytest.mark.asyncio
+async def test_refinement_rewrites_only_weak_segments(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # "Weak v0" scores low, its rewrite scores high; "Strong" is fine from the start
+    claude = ScriptedClaude({"Weak v0": 0.5, "Weak v1": 0.9})
+    context = RuntimeContext(config={}, claude=claude, storage=Storage(str(tmp_path / "data")))
+    agent = FormatterAgent(EventBus(), context)
+
+    html = await agent._format_newsletter([
+        {"article": {"title": "Strong"}},
+        {"article": {"title": "Weak"}},
+    ])
+
+    assert "Strong v0" in html and "Weak v1" in html
+    rewrites = [p for p in claude.prompts if p.startswith("Improve")]
+    assessments = [p for p in claude.prompts if p.startswith("Assess")]
+    assert len(rewrites) == 1
+    # Strong v0 is assessed once and then served from the cache
+    assert sum("Strong v0" in p for p in assessments) == 1
@@ -0,0 +1,29 @@
+import os
+from utils.fs import publish_file
+
+def test_publish_file_links_then_skips(tmp_path):
+    src = tmp_path / "podcast.mp3"
+    src.write_bytes(b"a" * 4096)
+    dest = tmp_path / "public" / "podcast.mp3"
+
+    method, written = publish_file(src, dest)
+    assert method in ("reflink", "link")
+    assert written == 0
+    assert dest.read_bytes() == src.read_bytes()
+
+    assert publish_file(src, dest) == ("skip", 0)
+
+def test_identical_copy_is_skipped_changed_file_rewritten(tmp_path):
+    src = tmp_path / "thumbnail_0.png"
+    src.write_bytes(b"png-1")
+    dest = tmp_path / "out" / "thumbnail_0.png"
+
+    assert publish_file(src, dest, methods=("copy",)) == ("copy", 5)
+    assert publish_file(src, dest, methods=("copy",)) == ("skip", 0)
+
+    # Same size, different content: the hash check catches it
+    os.replace(tmp_path / "thumbnail_0.png", tmp_path / "old.png")
+    src.write_bytes(b"png-2")
+    assert publish_file(src, dest, methods=("copy",)) == ("copy", 5)
+    assert dest.read_bytes() == b"png-2"
+    assert not list(dest.parent.glob(".*.tmp"))
@@ -0,0 +1,96 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+pytest.importorskip("PIL")
+
+from PIL import Image
+from utils.image_derivatives import ImagePipeline, srcset, supported_formats, target_widths
+from utils.templates import render_template
+
+def make_source(path, size=(1600, 900), fmt="JPEG"):
+    Image.new("RGB", size, color="#336699").save(path, fmt)
+    return str(path)
+
+def make_pipeline(tmp_path, **kwargs):
+    return ImagePipeline(executor=ThreadPoolExecutor(2), cache_dir=tmp_path / "cache", formats=("webp",), **kwargs)
+
+def item(source, dest, name="story-0"):
+    return {"source": source, "dest_dir": dest, "name": name, "url_prefix": "/weeks/2026-W01/img"}
+
+def test_target_widths_never_upscale():
+    assert target_widths(1600, [320, 640, 1200]) == [320, 640, 1200]
+    assert target_widths(500, [320, 640, 1200]) == [320, 500]
+    assert target_widths(200, [320, 640]) == [200]
+
+@pytest.mark.asyncio
+async def test_derivatives_and_srcset(tmp_path):
+    pipeline = make_pipeline(tmp_path, widths=(320, 640))
+    dest = tmp_path / "public"
+    result = await pipeline.process_all([item(make_source(tmp_path / "a.jpg"), dest)])
+    pipeline.close()
+
+    assert result["processed"] == 1 and result["failed"] == 0
+    with Image.open(dest / "story-0-320.webp") as img:
+        assert img.size == (320, 180) and img.format == "WEBP"
+    image = result["images"][0]
+    assert image["src"] == "/weeks/2026-W01/img/story-0-640.webp"
+    assert image["sources"] == [{
+        "type": "image/webp",
+        "srcset": "/weeks/2026-W01/img/story-0-320.webp 320w, /weeks/2026-W01/img/story-0-640.webp 640w",
+    }]
+
+@pytest.mark.asyncio
+async def test_processed_images_are_reused(tmp_path):
+    source = make_source(tmp_path / "a.png", fmt="PNG")
+    pipeline = make_pipeline(tmp_path, widths=(320,))
+    await pipeline.process_all([item(source, tmp_path / "w1")])
+    second = await pipeline.process_all([item(source, tmp_path / "w1"), item(source, tmp_path / "w2", "thumbnail-0")])
+    pipeline.close()
+
+    assert (second["processed"], second["reused"]) == (0, 2)
+    assert (tmp_path / "w2" / "thumbnail-0-320.webp").exists()
+
+@pytest.mark.asyncio
+async def test_remote_images_are_fetched_once(tmp_path, monkeypatch):
+    pipeline = make_pipeline(tmp_path, widths=(320,))
+    fetched = []
+
+    def fake_fetch(url):
+        fetched.append(url)
+        cached = pipeline.cache_dir / "sources" / "fixture"
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        make_source(cached, fmt="PNG")
+        return cached
+
+    monkeypatch.setattr(pipeline, "_fetch", fake_fetch)
+    url = "https://example.com/a.jpg"
+    result = await pipeline.process_all([item(url, tmp_path / "w1"), item("missing.jpg", tmp_path / "w1", "story-1")])
+    pipeline.close()
+
+    assert fetched == [url]
+    assert result["images"][1] is None and result["failed"] == 1
+
+def test_avif_listed_before_webp():
+    meta = {"variants": [
+        {"width": 320, "height": 180, "format": "avif", "file": "320.avif", "bytes": 1},
+        {"width": 320, "height": 180, "format": "webp", "file": "320.webp", "bytes": 1},
+    ]}
+    image = srcset(meta, "story-0", "/img/")
+    assert [s["type"] for s in image["sources"]] == ["image/avif", "image/webp"]
+    assert image["src"] == "/img/story-0-320.webp"
+
+def test_unsupported_formats_rejected(tmp_path):
+    assert supported_formats(["gif"]) == ()
+    with pytest.raises(ValueError):
+        ImagePipeline(formats=("gif",), cache_dir=tmp_path)
+
+def test_week_page_renders_picture():
+    image = srcset({"variants": [{"width": 640, "height": 360, "format": "webp", "file": "640.webp", "bytes": 1}]}, "story-0", "/img")
+    page = render_template(
+        "week_page.astro",
+        week_id="2026-W01",
+        articles=[{"title": "T", "category": "Tech", "summary": "s", "url": "https://x"}, {"title": "U"}],
+        images=[image, None]
+    )
+    assert '<source type="image/webp" srcset="/img/story-0-640.webp 640w"' in page
+    assert page.count("<picture>") == 1
@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent
+
+# Cumulative import budget per entry point, in milliseconds
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "300"))
+
+ENTRY_POINTS = [
+    "agents",
+    "agents.base_agent",
+    "agents.scraper_agent",
+    "agents.consolidation_agent",
+    "agents.formatter_agent",
+    "agents.audio_agent",
+    "agents.twitter_agent",
+    "agents.website_agent",
+    "agents.newsletter_agent",
+    "agents.video_agent",
+    "agents.lifecycle",
+    "utils",
+    "utils.api_keys",
+    "utils.llm_client",
+]
+
+# Third-party modules that must only load when they are actually used
+HEAVY_MODULES = {
+    "anthropic", "feedparser", "newspaper", "bs4", "PIL",
+    "tweepy", "elevenlabs", "requests", "dotenv", "lxml",
+}
+
+def _import_profile(module: str) -> dict:
+    """Run `python -X importtime -c 'import <module>'` and return {name: cumulative_us}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        profile[name] = max(profile.get(name, 0), int(cumulative))
+    return profile
+
+@pytest.mark.parametrize("module", ENTRY_POINTS)
+def test_import_time_budget(module):
+    profile = _import_profile(module)
+    elapsed_ms = profile[module] / 1000
+    assert elapsed_ms < IMPORT_BUDGET_MS, f"import {module} took {elapsed_ms:.0f}ms"
+
+@pytest.mark.parametrize("module", ENTRY_POINTS)
+def test_heavy_dependencies_not_imported(module):
+    profile = _import_profile(module)
+    loaded = {name.split(".")[0] for name in profile} & HEAVY_MODULES
+    assert not loaded, f"import {module} eagerly loaded {sorted(loaded)}"
@@ -0,0 +1,47 @@
+import json
+import logging
+from utils import logger as logger_module
+from utils.logger import Logger, JsonFormatter, shutdown_logging
+
+def test_repeated_construction_adds_one_handler():
+    """Creating the same agent logger twice must not duplicate output"""
+    Logger("test_logger_agent")
+    Logger("test_logger_agent")
+    assert len(logging.getLogger("test_logger_agent").handlers) == 1
+    shutdown_logging()
+
+def test_json_output_carries_correlation_id(tmp_path, monkeypatch):
+    monkeypatch.setattr(logger_module, "LOG_DIR", tmp_path)
+    log = Logger("test_logger_json")
+    with log.correlation("run-42"):
+        log.info("hello")
+    log.info("no correlation")
+    shutdown_logging()
+
+    lines = (tmp_path / "test_logger_json.log").read_text().splitlines()
+    first, second = (json.loads(line) for line in lines)
+    assert first["message"] == "hello"
+    assert first["correlation_id"] == "run-42"
+    assert "correlation_id" not in second
+
+def test_json_formatter_fields():
+    record = logging.LogRecord("agent", logging.WARNING, __file__, 1, "msg %s", ("x",), None)
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["level"] == "WARNING"
+    assert entry["message"] == "msg x"
+
+def test_loggers_keep_working_across_shutdown(tmp_path, monkeypatch):
+    monkeypatch.setattr(logger_module, "LOG_DIR", tmp_path)
+    registered = []
+    monkeypatch.setattr(logger_module.atexit, "register", registered.append)
+    monkeypatch.setattr(logger_module, "_atexit_registered", False)
+    log = Logger("test_logger_restart")
+    for i in range(3):
+        log.info(f"run {i}")
+        shutdown_logging()
+
+    # The live logger keeps its handler and the listener restarts on demand
+    assert len(logging.getLogger("test_logger_restart").handlers) == 1
+    messages = [json.loads(line)["message"] for line in (tmp_path / "test_logger_restart.log").read_text().splitlines()]
+    assert messages == ["run 0", "run 1", "run 2"]
+    assert len(registered) == 1
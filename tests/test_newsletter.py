@@ -0,0 +1,140 @@
+import email
+import smtplib
+import pytest
+from datetime import datetime
+from email import policy
+from agents.newsletter_agent import NewsletterAgent
+from events.event_bus import EventBus
+from events.event_types import Event, EventType
+from utils.email_client import EmailClient
+from utils.newsletter import NewsletterFanout, NewsletterTemplate, SendProgress, Subscriber, load_subscribers
+from utils.runtime import RuntimeContext
+from utils.smtp_sink import SMTPSink
+
+NEWSLETTER = """<html><body>
+<!--story:ai-->
+<div class="story">AI story</div>
+<!--/story-->
+<!--story:sports-->
+<div class="story">Sports story</div>
+<!--/story-->
+<p>Hi [[name]]</p><a href="[[unsubscribe_url]]">Unsubscribe</a>
+</body></html>"""
+
+def subscribers(n, categories=None):
+    return [Subscriber(f"reader{i}@example.com", f"Reader {i}", categories) for i in range(n)]
+
+def make_client(sink, **kwargs):
+    return EmailClient(
+        smtp_server="127.0.0.1", smtp_port=sink.port, sender="news@example.com", password="secret",
+        starttls=False, **kwargs
+    )
+
+async def no_sleep(seconds):
+    pass
+
+def test_template_filters_categories_and_escapes_values():
+    template = NewsletterTemplate(NEWSLETTER)
+    page = template.render({"name": "<Sam>", "unsubscribe_url": "https://x/u?a=1&b=2"}, frozenset({"sports"}))
+
+    assert "Sports story" in page and "AI story" not in page
+    assert "Hi &lt;Sam&gt;" in page
+    assert 'href="https://x/u?a=1&amp;b=2"' in page
+    # Unknown preferences fall back to the full issue; each selection compiles once
+    assert "AI story" in template.render({}, frozenset({"space"}))
+    template.render({}, frozenset({"sports"}))
+    assert template.variants == 2
+
+def test_load_subscribers_parses_categories(tmp_path):
+    path = tmp_path / "subscribers.csv"
+    path.write_text("email,name,categories\na@example.com,Ann,AI News;Sports\n,,\nb@example.com,,\n")
+    loaded = list(load_subscribers(path))
+    assert loaded == [
+        Subscriber("a@example.com", "Ann", frozenset({"ai-news", "sports"})),
+        Subscriber("b@example.com", "", None),
+    ]
+
+@pytest.mark.asyncio
+async def test_fanout_personalizes_and_resumes(tmp_path):
+    progress = tmp_path / "progress.log"
+    with SMTPSink() as sink:
+        client = make_client(sink, pool_size=3)
+        fanout = NewsletterFanout(client, progress, workers=3, secret="k")
+        first = await fanout.send(NEWSLETTER, "Week 1", subscribers(10) + subscribers(2))
+        second = await fanout.send(NEWSLETTER, "Week 1", subscribers(12))
+        client.close()
+
+    assert (first["total"], first["sent"], first["failed"]) == (10, 10, 0)
+    assert (second["sent"], second["skipped"]) == (2, 10)
+    assert sink.stats.messages == 12
+    message = email.message_from_bytes(sink.messages[0].data, policy=policy.default)
+    assert message["List-Unsubscribe"].strip().startswith("<https://example.com/unsubscribe?token=")
+    assert "Hi Reader" in message.get_content()
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried_and_permanent_ones_are_not(tmp_path):
+    class FlakyClient:
+        pool_size = 2
+
+        def __init__(self):
+            self.attempts = {}
+
+        def build_message(self, recipient, subject, body, headers=None):
+            return recipient
+
+        def send_message(self, recipient):
+            self.attempts[recipient] = self.attempts.get(recipient, 0) + 1
+            if recipient == "bounce@example.com":
+                raise smtplib.SMTPRecipientsRefused({recipient: (550, b"no such user")})
+            if recipient == "flaky@example.com" and self.attempts[recipient] < 3:
+                raise smtplib.SMTPServerDisconnected("dropped")
+
+    client = FlakyClient()
+    delays = []
+
+    async def record_sleep(seconds):
+        delays.append(seconds)
+
+    fanout = NewsletterFanout(client, tmp_path / "progress.log", workers=2, retry_delay=10, sleep=record_sleep)
+    result = await fanout.send(NEWSLETTER, "s", [
+        Subscriber("ok@example.com"), Subscriber("flaky@example.com"), Subscriber("bounce@example.com"),
+    ])
+
+    assert (result["sent"], result["failed"], result["retried"]) == (2, 1, 2)
+    assert client.attempts == {"ok@example.com": 1, "flaky@example.com": 3, "bounce@example.com": 1}
+    assert delays == [10, 20]
+    saved = SendProgress(tmp_path / "progress.log")
+    assert saved.sent == {"ok@example.com", "flaky@example.com"}
+    assert "bounce@example.com" in saved.failed
+
+@pytest.mark.asyncio
+async def test_resume_matches_addresses_case_insensitively(tmp_path):
+    progress = tmp_path / "progress.log"
+    with SMTPSink() as sink:
+        client = make_client(sink)
+        fanout = NewsletterFanout(client, progress, secret="k")
+        await fanout.send(NEWSLETTER, "Week 1", [Subscriber("Reader@Example.com")])
+        second = await fanout.send(NEWSLETTER, "Week 1", [Subscriber("reader@example.com"), Subscriber("READER@example.com")])
+        client.close()
+
+    assert (second["sent"], second["skipped"]) == (0, 1)
+    assert sink.stats.messages == 1
+    assert SendProgress(progress).sent == {"reader@example.com"}
+
+@pytest.mark.asyncio
+async def test_agent_refuses_to_send_without_a_secret(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("NEWSLETTER_SECRET", raising=False)
+    week = tmp_path / "data" / "approved" / "week-2026-W01"
+    week.mkdir(parents=True)
+    (week / "newsletter.html").write_text(NEWSLETTER)
+    (tmp_path / "data" / "subscribers.csv").write_text("email\nreader@example.com\n")
+
+    with SMTPSink() as sink:
+        client = make_client(sink)
+        agent = NewsletterAgent(EventBus(), RuntimeContext(config={}, email_client=client))
+        await agent.process(Event(EventType.READY_TO_PUBLISH, datetime.now(), {"week_id": "2026-W01"}, "test", "c"))
+        client.close()
+
+    assert sink.stats.messages == 0
+    assert not (week / "newsletter_progress.log").exists()
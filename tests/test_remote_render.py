@@ -0,0 +1,151 @@
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+pytest.importorskip("requests")
+
+from utils.remote_render import RemoteRenderClient, RemoteRenderError
+
+VIDEO = bytes(range(256)) * 4096  # 1 MiB
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Minimal HeyGen-shaped API: submit, status polling and a ranged file download"""
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, body, status=200):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        assert self.headers["X-API-KEY"] == "test-key"
+        self._json({"error": None, "data": {"video_id": "job-1"}})
+
+    def do_GET(self):
+        state = self.server.state
+        if self.path.startswith("/v1/video_status.get"):
+            state["polls"] += 1
+            if state.get("fail"):
+                self._json({"data": {"status": "failed", "error": "avatar not found"}})
+            elif state["polls"] < 3:
+                self._json({"data": {"status": "processing"}})
+            else:
+                url = f"http://127.0.0.1:{self.server.server_port}/files/video.mp4"
+                self._json({"data": {"status": "completed", "video_url": url}})
+            return
+
+        assert "X-API-KEY" not in self.headers
+        video = state.get("video", VIDEO)
+        etag = state.get("etag", '"v1"')
+        start = 0
+        if self.headers.get("Range") and self.headers.get("If-Range", etag) == etag:
+            start = int(self.headers["Range"].split("=")[1].rstrip("-"))
+            state["ranges"].append(start)
+        body = video[start:]
+        self.send_response(206 if start else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        if start:
+            self.send_header("Content-Range", f"bytes {start}-{len(video) - 1}/{len(video)}")
+        self.end_headers()
+        if state["drop_after"] and not state["dropped"]:
+            # Simulate a dropped connection halfway through the first download
+            state["dropped"] = True
+            self.wfile.write(body[:state["drop_after"]])
+            self.wfile.flush()
+            self.connection.close()
+            return
+        self.wfile.write(body)
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.state = {"polls": 0, "ranges": [], "drop_after": 0, "dropped": False}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def make_client(server):
+    return RemoteRenderClient(
+        "test-key",
+        base_url=f"http://127.0.0.1:{server.server_port}",
+        poll_interval=0.01,
+        max_poll_interval=0.05,
+        chunk_size=64 * 1024
+    )
+
+@pytest.mark.asyncio
+async def test_render_polls_then_streams_to_disk(stub_server, tmp_path):
+    client = make_client(stub_server)
+    result = await client.render({"video_inputs": []}, tmp_path / "podcast.mp4")
+    client.close()
+
+    assert result["job_id"] == "job-1"
+    assert stub_server.state["polls"] == 3
+    assert (tmp_path / "podcast.mp4").read_bytes() == VIDEO
+    assert not (tmp_path / "podcast.mp4.part").exists()
+    assert result["resumed"] is False
+
+@pytest.mark.asyncio
+async def test_interrupted_download_resumes_with_range(stub_server, tmp_path):
+    stub_server.state["drop_after"] = 300_000
+    client = make_client(stub_server)
+    result = await client.render({"video_inputs": []}, tmp_path / "podcast.mp4")
+    client.close()
+
+    assert (tmp_path / "podcast.mp4").read_bytes() == VIDEO
+    assert result["resumed"] is True
+    assert stub_server.state["ranges"] and stub_server.state["ranges"][0] > 0
+
+def write_partial(tmp_path, data, url, etag='"v1"', length=len(VIDEO)):
+    (tmp_path / "podcast.mp4.part").write_bytes(data)
+    (tmp_path / "podcast.mp4.part.json").write_text(json.dumps({"url": url, "etag": etag, "length": length}))
+
+@pytest.mark.asyncio
+async def test_existing_part_file_is_resumed(stub_server, tmp_path):
+    url = f"http://127.0.0.1:{stub_server.server_port}/files/video.mp4"
+    write_partial(tmp_path, VIDEO[:1000], url)
+    client = make_client(stub_server)
+    await client.download(url, tmp_path / "podcast.mp4")
+    client.close()
+
+    assert stub_server.state["ranges"] == [1000]
+    assert (tmp_path / "podcast.mp4").read_bytes() == VIDEO
+    assert not (tmp_path / "podcast.mp4.part.json").exists()
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sidecar", [None, "other-url", "old-etag", "other-length"])
+async def test_foreign_part_file_is_discarded(stub_server, tmp_path, sidecar):
+    """A partial from another job or an older file is never appended to"""
+    url = f"http://127.0.0.1:{stub_server.server_port}/files/video.mp4"
+    stale = b"\xff" * 1000
+    if sidecar is None:
+        (tmp_path / "podcast.mp4.part").write_bytes(stale)
+    elif sidecar == "other-url":
+        write_partial(tmp_path, stale, url + "?job=old")
+    elif sidecar == "old-etag":
+        write_partial(tmp_path, stale, url, etag='"v0"')
+    else:
+        write_partial(tmp_path, stale, url, etag=None, length=len(VIDEO) + 10)
+    client = make_client(stub_server)
+    await client.download(url, tmp_path / "podcast.mp4")
+    client.close()
+
+    assert (tmp_path / "podcast.mp4").read_bytes() == VIDEO
+
+@pytest.mark.asyncio
+async def test_failed_job_raises(stub_server, tmp_path):
+    stub_server.state["fail"] = True
+    client = make_client(stub_server)
+    with pytest.raises(RemoteRenderError, match="avatar not found"):
+        await client.render({"video_inputs": []}, tmp_path / "podcast.mp4")
+    client.close()
@@ -0,0 +1,127 @@
+import asyncio
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from events.event_bus import EventBus
+from events.event_types import Event, EventType
+from scheduler.daemon import JobRunner, SchedulerDaemon
+from utils.runtime import RuntimeContext
+from utils.storage import Storage
+
+@pytest.mark.asyncio
+async def test_job_runner_caps_concurrency():
+    runner = JobRunner(max_concurrent_jobs=1)
+    running = []
+    peak = []
+
+    async def job():
+        running.append(1)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.pop()
+
+    await asyncio.gather(*(runner.run("scrape", job) for _ in range(3)))
+
+    assert max(peak) == 1
+    assert runner.stats()["scrape"]["runs"] == 3
+
+@pytest.mark.asyncio
+async def test_job_runner_records_failures():
+    runner = JobRunner()
+
+    async def failing():
+        raise RuntimeError("boom")
+
+    assert await runner.run("publish", failing) is None
+    stats = runner.stats()["publish"]
+    assert stats["failures"] == 1
+    assert stats["last_run"]["error"] == "boom"
+
+def make_daemon(tmp_path, bus, twitter_configured=True, config=None):
+    storage = Storage(str(tmp_path / "data"))
+    week_dir = tmp_path / "data" / "approved" / "week-2026-W01"
+    week_dir.mkdir(parents=True)
+    (week_dir / "APPROVED.txt").touch()
+    daemon = SchedulerDaemon(RuntimeContext(config=config or {}, storage=storage), bus)
+    daemon.agents = {
+        "website_agent": SimpleNamespace(configured=True),
+        "twitter_agent": SimpleNamespace(configured=twitter_configured),
+    }
+    return daemon, week_dir
+
+def record(received):
+    async def handler(event):
+        received.append(event.event_type)
+    return handler
+
+@pytest.mark.asyncio
+async def test_publish_is_not_marked_when_a_subscriber_fails(tmp_path):
+    bus = EventBus()
+    daemon, week_dir = make_daemon(tmp_path, bus)
+    twitter_fails = True
+
+    async def website(event):
+        await bus.publish(Event(EventType.WEBSITE_PUBLISHED, datetime.now(), dict(event.data), "website", "c"))
+
+    async def twitter(event):
+        if twitter_fails:
+            raise RuntimeError("rate limited")
+        await bus.publish(Event(EventType.TWITTER_PUBLISHED, datetime.now(), dict(event.data), "twitter", "c"))
+
+    await bus.subscribe(EventType.READY_TO_PUBLISH, website)
+    await bus.subscribe(EventType.READY_TO_PUBLISH, twitter)
+    try:
+        await daemon.run_publish()
+        assert not (week_dir / "PUBLISHED.txt").exists()
+
+        twitter_fails = False
+        await daemon.run_publish()
+        assert (week_dir / "PUBLISHED.txt").exists()
+    finally:
+        await bus.unsubscribe(EventType.READY_TO_PUBLISH, website)
+        await bus.unsubscribe(EventType.READY_TO_PUBLISH, twitter)
+
+@pytest.mark.asyncio
+async def test_publish_waits_only_for_configured_agents_and_skips_formatting(tmp_path):
+    bus = EventBus()
+    daemon, week_dir = make_daemon(tmp_path, bus, twitter_configured=False)
+    for name in ("newsletter.html", "twitter.json"):
+        (week_dir / name).touch()
+    received = []
+    seen = record(received)
+
+    async def website(event):
+        await bus.publish(Event(EventType.WEBSITE_PUBLISHED, datetime.now(), dict(event.data), "website", "c"))
+
+    await bus.subscribe(EventType.APPROVAL_RECEIVED, seen)
+    await bus.subscribe(EventType.READY_TO_PUBLISH, seen)
+    await bus.subscribe(EventType.READY_TO_PUBLISH, website)
+    try:
+        await daemon.run_publish()
+    finally:
+        await bus.unsubscribe(EventType.APPROVAL_RECEIVED, seen)
+        await bus.unsubscribe(EventType.READY_TO_PUBLISH, seen)
+        await bus.unsubscribe(EventType.READY_TO_PUBLISH, website)
+
+    # Formatted content exists, so only READY_TO_PUBLISH goes out
+    assert received == [EventType.READY_TO_PUBLISH]
+    assert (week_dir / "PUBLISHED.txt").exists()
+
+@pytest.mark.asyncio
+async def test_publish_gives_up_after_max_attempts(tmp_path):
+    bus = EventBus()
+    config = {"agents": {"publisher": {"max_attempts": 2}}}
+    daemon, week_dir = make_daemon(tmp_path, bus, config=config)
+    received = []
+    seen = record(received)
+
+    await bus.subscribe(EventType.READY_TO_PUBLISH, seen)
+    try:
+        for _ in range(4):
+            await daemon.run_publish()
+    finally:
+        await bus.unsubscribe(EventType.READY_TO_PUBLISH, seen)
+
+    assert received == [EventType.READY_TO_PUBLISH] * 2
+    assert not (week_dir / "PUBLISHED.txt").exists()
+    assert daemon._publish_attempts(week_dir) == 2
@@ -0,0 +1,79 @@
+import json
+from agents.website_agent import WebsiteAgent
+from events.event_bus import EventBus
+from utils.runtime import RuntimeContext
+from utils.search_index import SearchIndex, SearchIndexBuilder, delta_decode, delta_encode, tokenize
+from utils.storage import Storage
+
+def week(*stories):
+    return {"stories": [
+        {"rank": rank, "article": {"title": title, "summary": summary, "url": f"https://example.com/{rank}", "category": "AI"}}
+        for rank, (title, summary) in enumerate(stories, start=1)
+    ]}
+
+WEEKS = {
+    "2026-W01": week(("Robots learn to fold laundry", "A lab trained a robot on towels."),
+                     ("Café opens on Mars", "Not really, but the rover found ice.")),
+    "2026-W02": week(("Laundry startup raises funding", "The robotics company plans a home robot.")),
+}
+
+def test_tokenize_folds_case_accents_and_stopwords():
+    assert tokenize("The Café is OPEN in 2026!") == ["cafe", "open", "2026"]
+
+def test_delta_round_trip():
+    assert delta_encode([3, 7, 8, 20]) == [3, 4, 1, 12]
+    assert delta_decode([3, 4, 1, 12]) == [3, 7, 8, 20]
+
+def test_build_writes_sharded_delta_postings(tmp_path):
+    stats = SearchIndexBuilder(tmp_path, compress=()).build(WEEKS)
+    search = tmp_path / "search"
+
+    meta = json.loads((search / "index.json").read_text())
+    assert meta["docs"] == 3 and meta["weeks"] == 2
+    docs = json.loads((search / "docs.json").read_text())
+    assert docs[2][:2] == ["2026-W02", "Laundry startup raises funding"]
+    # "laundry" is in the titles of doc 0 and doc 2: postings 1, 5 -> deltas [1, 4]
+    assert json.loads((search / "l.json").read_text())["laundry"] == [1, 4]
+    assert sorted(p.name for p in search.iterdir()) == sorted(["index.json", "docs.json"] + [f"{k}.json" for k in meta["shards"]])
+    assert stats["written"] == stats["files"]
+
+def test_search_ranks_title_hits_and_matches_prefix(tmp_path):
+    SearchIndexBuilder(tmp_path, compress=()).build(WEEKS)
+    index = SearchIndex(tmp_path)
+
+    # Title hit outranks the summary-only hit
+    assert [r["title"] for r in index.search("robot")] == ["Robots learn to fold laundry", "Laundry startup raises funding"]
+    assert [r["weekId"] for r in index.search("laundry fund")] == ["2026-W02"]
+    assert index.search("cafe")[0]["title"] == "Café opens on Mars"
+    assert index.search("zebra") == []
+
+def test_rebuild_only_rewrites_changed_shards(tmp_path):
+    builder = SearchIndexBuilder(tmp_path, compress=())
+    builder.build(WEEKS)
+    assert builder.build(WEEKS)["written"] == 0
+
+    search = tmp_path / "search"
+    before = {p.name: p.stat().st_mtime_ns for p in search.iterdir()}
+    builder.build({**WEEKS, "2026-W03": week(("Quantum chip", "Qubits scale up."))})
+    changed = {p.name for p in search.iterdir() if before.get(p.name) != p.stat().st_mtime_ns}
+    # New docs are appended, so only shards holding the new terms change
+    assert changed == {"index.json", "docs.json", "q.json", "c.json", "s.json"}
+    builder.build(WEEKS)
+    assert not (tmp_path / "search" / "q.json").exists()
+
+def test_website_indexes_only_approved_weeks(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = Storage(str(tmp_path / "data"))
+    for (week_id, data), marker in zip(WEEKS.items(), ("APPROVED.txt", "REJECTED.txt")):
+        storage.save_processed(data, week_id)
+        week_dir = tmp_path / "data" / "approved" / f"week-{week_id}"
+        week_dir.mkdir(parents=True)
+        (week_dir / marker).touch()
+
+    agent = WebsiteAgent(EventBus(), RuntimeContext(config={}, storage=storage))
+    agent._update_search_index()
+    agent.images.close()
+
+    index = SearchIndex(tmp_path / "website" / "public" / "data")
+    assert index.search("robot")[0]["weekId"] == "2026-W01"
+    assert index.search("funding") == []
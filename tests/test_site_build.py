@@ -0,0 +1,76 @@
+import sys
+import pytest
+from utils.site_build import SiteBuilder, route_for
+
+# Stand-in for `astro build`: copies public/ into dist/ and counts invocations
+FAKE_BUILD = """
+import pathlib, shutil
+shutil.rmtree("dist", ignore_errors=True)
+shutil.copytree("public", "dist")
+(pathlib.Path("dist") / "index.html").write_text("built")
+counter = pathlib.Path("builds.txt")
+counter.write_text(str(int(counter.read_text()) + 1 if counter.exists() else 1))
+"""
+
+@pytest.fixture
+def site(tmp_path):
+    (tmp_path / "src" / "pages").mkdir(parents=True)
+    (tmp_path / "src" / "pages" / "index.astro").write_text("<h1>Home</h1>")
+    (tmp_path / "public" / "weeks" / "2026-W01").mkdir(parents=True)
+    (tmp_path / "public" / "weeks" / "2026-W01" / "podcast.mp3").write_bytes(b"audio-1")
+    (tmp_path / "build.py").write_text(FAKE_BUILD)
+    return tmp_path
+
+def make_builder(site):
+    return SiteBuilder(site, build_command=[sys.executable, "build.py"])
+
+def builds(site):
+    return int((site / "builds.txt").read_text())
+
+def test_route_for_pages():
+    assert route_for("src/pages/index.astro") == "/"
+    assert route_for("src/pages/week-2026-W01.astro") == "/week-2026-W01"
+    assert route_for("src/layouts/BaseLayout.astro") is None
+
+@pytest.mark.asyncio
+async def test_unchanged_site_skips_build(site):
+    builder = make_builder(site)
+    first = await builder.build()
+    second = await builder.build()
+
+    assert first["action"] == "build" and first["ok"]
+    assert second["action"] == "skip"
+    assert builds(site) == 1
+
+@pytest.mark.asyncio
+async def test_new_week_page_rebuilds_its_route(site):
+    builder = make_builder(site)
+    await builder.build()
+    (site / "src" / "pages" / "week-2026-W02.astro").write_text("<h1>W02</h1>")
+
+    result = await builder.build()
+    assert result["action"] == "build"
+    assert result["routes"] == ["/week-2026-W02"]
+    assert builds(site) == 2
+
+@pytest.mark.asyncio
+async def test_asset_only_change_is_copied_without_building(site):
+    builder = make_builder(site)
+    await builder.build()
+    (site / "public" / "weeks" / "2026-W01" / "podcast.mp3").write_bytes(b"audio-2")
+    (site / "public" / "weeks" / "2026-W01" / "thumbnail_0.png").write_bytes(b"png")
+
+    result = await builder.build()
+    assert result["action"] == "public"
+    assert result["changed"] == 2
+    assert builds(site) == 1
+    assert (site / "dist" / "weeks" / "2026-W01" / "podcast.mp3").read_bytes() == b"audio-2"
+    assert (site / "dist" / "weeks" / "2026-W01" / "thumbnail_0.png").exists()
+
+@pytest.mark.asyncio
+async def test_failed_build_keeps_old_manifest(site):
+    builder = SiteBuilder(site, build_command=[sys.executable, "-c", "import sys; sys.exit('boom')"])
+    result = await builder.build()
+    assert result["ok"] is False
+    assert "boom" in result["error"]
+    assert not builder.manifest_path.exists()
@@ -0,0 +1,105 @@
+import gzip
+import json
+from agents.website_agent import WebsiteAgent
+from events.event_bus import EventBus
+from utils.runtime import RuntimeContext
+from utils.site_data import SiteDataWriter, compact_story, load_weeks
+from utils.storage import Storage
+
+def story(title, category, rank=1):
+    return {
+        "rank": rank,
+        "importance_score": 0.87654,
+        "article": {
+            "title": title, "summary": f"{title} summary", "category": category,
+            "source": "Wire", "url": f"https://example.com/{rank}", "raw_content": "x" * 5000,
+        },
+        "selection_reason": "long explanation",
+    }
+
+def week(*stories):
+    return {"stories": list(stories)}
+
+def read(out, rel):
+    return json.loads((out / rel).read_text())
+
+def test_compact_story_drops_raw_fields():
+    compact = compact_story(story("Launch", "AI"))
+    assert compact == {
+        "title": "Launch", "summary": "Launch summary", "category": "AI",
+        "source": "Wire", "url": "https://example.com/1", "rank": 1, "score": 0.877,
+    }
+
+def test_build_writes_shards_archive_and_categories(tmp_path):
+    out = tmp_path / "data"
+    weeks = {f"2026-W{n:02d}": week(story(f"Story {n}", "AI" if n % 2 else "Robotics")) for n in range(1, 6)}
+    SiteDataWriter(out, page_size=2).build(weeks)
+
+    assert read(out, "weeks/2026-W03.json")["stories"][0]["title"] == "Story 3"
+    assert read(out, "archive/index.json") == {"latest": "2026-W05", "pages": 3, "pageSize": 2, "total": 5}
+    assert [w["weekId"] for w in read(out, "archive/page-1.json")["weeks"]] == ["2026-W05", "2026-W04"]
+    assert [s["weekId"] for s in read(out, "categories/robotics.json")["stories"]] == ["2026-W04", "2026-W02"]
+    # The index page still reads story.article.*
+    assert read(out, "latest-stories.json")["stories"][0]["article"]["title"] == "Story 5"
+    assert gzip.decompress((out / "weeks/2026-W03.json.gz").read_bytes()) == (out / "weeks/2026-W03.json").read_bytes()
+
+def test_rerun_and_new_week_touch_only_changed_files(tmp_path):
+    out = tmp_path / "data"
+    writer = SiteDataWriter(out, page_size=2, compress=())
+    weeks = {"2026-W01": week(story("One", "AI")), "2026-W02": week(story("Two", "AI"))}
+    first = writer.build(weeks)
+    assert first["written"] == first["files"]
+    assert writer.build(weeks)["written"] == 0
+
+    weeks["2026-W03"] = week(story("Three", "Robotics"))
+    before = {p: p.stat().st_mtime_ns for p in out.rglob("*.json")}
+    stats = writer.build(weeks)
+    changed = {p.relative_to(out).as_posix() for p in out.rglob("*.json") if before.get(p) != p.stat().st_mtime_ns}
+    assert changed == {
+        "weeks/2026-W03.json", "archive/index.json", "archive/page-1.json", "archive/page-2.json",
+        "categories/robotics.json", "latest-stories.json",
+    }
+    assert stats["written"] == len(changed)
+    assert (out / "weeks/2026-W01.json").stat().st_mtime_ns == before[out / "weeks/2026-W01.json"]
+
+def test_removed_week_and_category_are_deleted(tmp_path):
+    out = tmp_path / "data"
+    writer = SiteDataWriter(out, compress=("gzip",))
+    writer.build({"2026-W01": week(story("One", "Space")), "2026-W02": week(story("Two", "AI"))})
+    stats = writer.build({"2026-W02": week(story("Two", "AI"))})
+
+    assert stats["removed"] == 4  # week shard + space feed, each with a .gz
+    assert not (out / "weeks/2026-W01.json").exists()
+    assert not (out / "categories/space.json.gz").exists()
+
+def test_load_weeks_reads_processed_dir(tmp_path):
+    (tmp_path / "week-2026-W07.json").write_text(json.dumps(week(story("Seven", "AI"))))
+    weeks, updated = load_weeks(tmp_path)
+    assert list(weeks) == ["2026-W07"]
+    assert updated["2026-W07"]
+
+def test_load_weeks_can_limit_to_given_weeks(tmp_path):
+    for week_id in ("2026-W07", "2026-W08"):
+        (tmp_path / f"week-{week_id}.json").write_text(json.dumps(week(story(week_id, "AI"))))
+    weeks, updated = load_weeks(tmp_path, ["2026-W08", "2026-W09"])
+    assert list(weeks) == list(updated) == ["2026-W08"]
+
+def test_website_publishes_only_approved_weeks(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = Storage(str(tmp_path / "data"))
+    storage.save_processed(week(story("Approved", "AI")), "2026-W07")
+    storage.save_processed(week(story("Rejected", "Space")), "2026-W08")
+    for week_id, marker in (("2026-W07", "APPROVED.txt"), ("2026-W08", "REJECTED.txt")):
+        week_dir = tmp_path / "data" / "approved" / f"week-{week_id}"
+        week_dir.mkdir(parents=True)
+        (week_dir / marker).touch()
+
+    agent = WebsiteAgent(EventBus(), RuntimeContext(config={}, storage=storage))
+    agent._update_site_data()
+    agent.images.close()
+
+    out = tmp_path / "website" / "public" / "data"
+    assert (out / "weeks/2026-W07.json").exists()
+    assert not (out / "weeks/2026-W08.json").exists()
+    assert not (out / "categories/space.json").exists()
+    assert "Rejected" not in (out / "latest-stories.json").read_text()
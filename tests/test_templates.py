@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("jinja2")
+
+from utils.templates import get_template, render_template
+
+def test_templates_compile_once():
+    assert get_template("newsletter.html") is get_template("newsletter.html")
+
+def test_approval_email_autoescapes_story_fields():
+    html = render_template(
+        "approval_email.html",
+        week_id="2026-W01",
+        stories=[{
+            "category": "Sports",
+            "rank": 1,
+            "title": "<script>alert(1)</script>",
+            "summary": "Fans & players",
+            "source": "ESPN",
+            "importance_score": 0.875,
+            "published": "2026-01-05",
+            "url": "https://example.com"
+        }],
+        categories=["Sports"]
+    )
+    assert "<script>alert(1)</script>" not in html
+    assert "&lt;script&gt;" in html
+    assert "Fans &amp; players" in html
+    assert "⭐ 0.88" in html
+    assert "week-2026-W01/APPROVED.txt" in html
+
+def test_newsletter_keeps_generated_html():
+    html = render_template("newsletter.html", content='<div class="story">Hi</div>')
+    assert '<div class="story">Hi</div>' in html
+
+def test_week_page_escapes_astro_braces():
+    page = render_template(
+        "week_page.astro",
+        week_id="2026-W01",
+        articles=[{"title": "Why {braces} matter", "category": "Tech", "summary": "s", "url": "https://x"}]
+    )
+    assert "{braces}" not in page
+    assert "&#123;braces&#125;" in page
+    assert 'const weekId = "2026-W01";' in page
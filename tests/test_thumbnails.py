@@ -0,0 +1,52 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+pytest.importorskip("PIL")
+
+from PIL import Image
+from utils.thumbnails import ThumbnailRenderer, GlyphWidthCache, load_font, wrap_text
+
+def test_wrap_text_respects_width():
+    widths = GlyphWidthCache(load_font(40))
+    lines = wrap_text("Gen Z voters turn out in record numbers for the midterms", widths, 400)
+    assert len(lines) > 1
+    assert all(widths.font.getlength(line) < 400 or ' ' not in line for line in lines)
+
+def test_word_widths_are_memoized():
+    widths = GlyphWidthCache(load_font(40))
+    widths.width("playoffs")
+    assert "playoffs" in widths._widths
+
+@pytest.mark.asyncio
+async def test_render_all_uses_configured_size_and_format(tmp_path):
+    renderer = ThumbnailRenderer(size=(600, 315), image_format="webp", executor=ThreadPoolExecutor(2), cache_dir=None)
+    jobs = [renderer.make_job(f"Story number {i}", str(tmp_path / f"thumbnail_{i}.webp")) for i in range(3)]
+
+    paths = (await renderer.render_all(jobs))["paths"]
+    renderer.close()
+
+    assert len(paths) == 3
+    with Image.open(paths[0]) as img:
+        assert img.size == (600, 315)
+        assert img.format == "WEBP"
+
+def test_unknown_format_rejected():
+    with pytest.raises(ValueError):
+        ThumbnailRenderer(image_format="gif")
+
+@pytest.mark.asyncio
+async def test_unchanged_titles_are_reused(tmp_path):
+    renderer = ThumbnailRenderer(executor=ThreadPoolExecutor(2), cache_dir=str(tmp_path / "cache"))
+    week = tmp_path / "week"
+    titles = ["Markets rally on AI earnings", "Underdog wins the title"]
+    jobs = [renderer.make_job(t, str(week / f"thumbnail_{i}.png")) for i, t in enumerate(titles)]
+
+    first = await renderer.render_all(jobs)
+    assert (first["rendered"], first["reused"]) == (2, 0)
+
+    jobs[1] = renderer.make_job("A different headline", jobs[1]["path"])
+    second = await renderer.render_all(jobs)
+    renderer.close()
+
+    assert (second["rendered"], second["reused"]) == (1, 1)
+    assert len(list((tmp_path / "cache").iterdir())) == 3
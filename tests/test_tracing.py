@@ -0,0 +1,106 @@
+import json
+import pytest
+from agents.base_agent import BaseAgent
+from events.event_bus import EventBus
+from events.event_types import Event, EventType
+from utils import tracing
+from utils.logger import current_correlation_id
+from utils.runtime import RuntimeContext
+from utils.tracing import Tracer
+
+class RelayAgent(BaseAgent):
+    """Emits CONTENT_FORMATTED; records what its own handler saw"""
+
+    def __init__(self, event_bus, context=None):
+        super().__init__("relay_agent", event_bus, context)
+        self.seen = []
+
+    async def _setup_event_listeners(self):
+        await self.subscribe(EventType.CONTENT_FORMATTED, self.process)
+
+    async def process(self, event: Event):
+        with tracing.span("render.test"):
+            self.seen.append((event, current_correlation_id(), tracing.current_trace_id()))
+
+def test_spans_nest_and_record_errors():
+    tracer = Tracer()
+    with tracer.trace("run") as root:
+        assert current_correlation_id() == root.trace_id
+        with tracer.span("fetch.feed", source="wire") as fetch:
+            fetch.set(entries=3)
+        with pytest.raises(ValueError):
+            with tracer.span("parse.feed"):
+                raise ValueError("bad xml")
+    assert current_correlation_id() is None
+
+    spans = {s.name: s for s in tracer.spans(root.trace_id)}
+    assert spans["fetch.feed"].parent_id == root.span_id
+    assert spans["fetch.feed"].attributes == {"source": "wire", "entries": 3}
+    assert spans["parse.feed"].error == "ValueError: bad xml"
+    assert spans["run"].duration >= spans["fetch.feed"].duration
+
+def test_trace_continues_an_existing_id():
+    tracer = Tracer()
+    with tracer.trace("publish", trace_id="week-trace", parent_id="remote") as span:
+        pass
+    assert (span.trace_id, span.parent_id) == ("week-trace", "remote")
+
+@pytest.mark.asyncio
+async def test_events_carry_the_trace_to_subscribers():
+    context = RuntimeContext(config={"tracing": {"enabled": True, "output_dir": None}})
+    agent = RelayAgent(EventBus(), context)
+    await agent.start()
+    try:
+        with tracing.trace("consolidate") as root:
+            await agent.emit_event(EventType.CONTENT_FORMATTED, {"week_id": "2026-W01"})
+    finally:
+        await agent.stop()
+
+    (event, correlation_id, trace_id), = agent.seen
+    assert event.correlation_id == correlation_id == trace_id == root.trace_id
+    assert event.metadata == {"trace_id": root.trace_id, "parent_span_id": root.span_id}
+
+    spans = {s.name: s for s in tracing.get_tracer().spans(root.trace_id)}
+    handler = spans["relay_agent.content_formatted"]
+    assert handler.parent_id == root.span_id
+    assert spans["render.test"].parent_id == handler.span_id
+
+def test_exports_chrome_and_json(tmp_path):
+    tracer = Tracer(output_dir=tmp_path / "traces", keep=2)
+    for _ in range(3):
+        with tracer.trace("scrape") as root:
+            with tracer.span("llm", model="m"):
+                pass
+    # Only the newest `keep` finished traces stay on disk
+    files = sorted((tmp_path / "traces").glob("trace-*.json"), key=lambda p: p.stat().st_mtime_ns)
+    assert len(files) == 2 and root.trace_id[:8] in files[-1].name
+
+    document = json.loads(files[-1].read_text())
+    complete = [e for e in document["traceEvents"] if e["ph"] == "X"]
+    assert {e["name"] for e in complete} == {"scrape", "llm"}
+    llm = next(e for e in complete if e["name"] == "llm")
+    assert llm["cat"] == "llm" and llm["args"]["model"] == "m" and llm["dur"] >= 0
+    assert any(e["ph"] == "M" and e["name"] == "thread_name" for e in document["traceEvents"])
+
+    (tmp_path / "traces" / "unrelated.json").write_text("{}")
+    with tracer.trace("scrape"):
+        pass
+    # Pruning only touches files the tracer wrote
+    assert (tmp_path / "traces" / "unrelated.json").exists()
+
+    flat = json.loads(tracer.export(tmp_path / "flat.json", root.trace_id, trace_format="json").read_text())
+    assert [s["name"] for s in flat["spans"]] == ["scrape", "llm"]
+
+def test_disabled_tracer_records_nothing_but_keeps_correlation(tmp_path):
+    tracer = Tracer(enabled=False, output_dir=tmp_path)
+    with tracer.trace("scrape") as span:
+        span.set(ignored=True)
+        assert current_correlation_id() is not None
+        with tracer.span("fetch.feed"):
+            pass
+    assert tracer.spans() == []
+    assert list(tmp_path.iterdir()) == []
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        Tracer(trace_format="otlp")
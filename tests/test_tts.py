@@ -0,0 +1,147 @@
+import asyncio
+import pytest
+from utils.audio_stream import stream_to_file
+from utils.tts import FakeTTSBackend, SegmentedSynthesizer, split_script
+
+SETTINGS = {"stability": 0.6, "similarity_boost": 0.8, "style": 0.7, "use_speaker_boost": True}
+
+SCRIPT = "\n\n".join([
+    "Welcome back to Gen Z News Weekly!",
+    "First up, a new climate bill just passed the Senate.",
+    "Next, the playoffs delivered another buzzer beater.",
+    "That's it for this week, see you next time!",
+])
+
+def make_synth(tmp_path, backend, **kwargs):
+    return SegmentedSynthesizer(
+        backend, voice_id="voice", settings=SETTINGS,
+        cache_dir=str(tmp_path / "tts"), max_segment_chars=60, **kwargs
+    )
+
+def test_split_script_keeps_story_boundaries():
+    segments = split_script(SCRIPT, max_chars=60)
+    assert segments == [p for p in SCRIPT.split("\n\n")]
+
+def test_split_script_splits_long_paragraph_between_sentences():
+    paragraph = " ".join(f"Sentence number {i} is here." for i in range(10))
+    segments = split_script(paragraph, max_chars=80)
+    assert all(len(s) <= 80 for s in segments)
+    assert " ".join(segments) == paragraph
+
+@pytest.mark.asyncio
+async def test_segments_are_stitched_in_order(tmp_path):
+    backend = FakeTTSBackend()
+    result = await make_synth(tmp_path, backend).synthesize(SCRIPT)
+
+    expected = b"".join([await FakeTTSBackend().synthesize(s, "voice", SETTINGS) for s in split_script(SCRIPT, 60)])
+    assert result["audio"] == expected
+    assert result["segments"] == 4
+    assert result["synthesized"] == 4
+
+@pytest.mark.asyncio
+async def test_one_story_edit_resynthesizes_one_segment(tmp_path):
+    await make_synth(tmp_path, FakeTTSBackend()).synthesize(SCRIPT)
+
+    backend = FakeTTSBackend()
+    edited = SCRIPT.replace("buzzer beater", "triple overtime thriller")
+    result = await make_synth(tmp_path, backend).synthesize(edited)
+
+    assert backend.calls == ["Next, the playoffs delivered another triple overtime thriller."]
+    assert result["synthesized"] == 1
+    assert result["cached"] == 3
+
+@pytest.mark.asyncio
+async def test_voice_settings_are_part_of_cache_key(tmp_path):
+    await make_synth(tmp_path, FakeTTSBackend()).synthesize(SCRIPT)
+
+    backend = FakeTTSBackend()
+    synth = SegmentedSynthesizer(
+        backend, voice_id="voice", settings={**SETTINGS, "stability": 0.3},
+        cache_dir=str(tmp_path / "tts"), max_segment_chars=60
+    )
+    result = await synth.synthesize(SCRIPT)
+    assert result["cached"] == 0
+    assert len(backend.calls) == 4
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped(tmp_path):
+    active = 0
+    peak = 0
+
+    class TrackingBackend(FakeTTSBackend):
+        async def stream(self, text, voice_id, settings):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            async for chunk in super().stream(text, voice_id, settings):
+                yield chunk
+
+    await make_synth(tmp_path, TrackingBackend(), max_concurrency=2).synthesize(SCRIPT)
+    assert peak == 2
+
+@pytest.mark.asyncio
+async def test_failed_segment_is_retried_alone(tmp_path, monkeypatch):
+    monkeypatch.setattr(asyncio, "sleep", _no_sleep(asyncio.sleep))
+    failures = {"count": 0}
+
+    class FlakyBackend(FakeTTSBackend):
+        async def stream(self, text, voice_id, settings):
+            if "climate" in text and failures["count"] == 0:
+                failures["count"] += 1
+                raise RuntimeError("429 Too Many Requests")
+            async for chunk in super().stream(text, voice_id, settings):
+                yield chunk
+
+    backend = FlakyBackend()
+    result = await make_synth(tmp_path, backend).synthesize(SCRIPT)
+    assert result["synthesized"] == 4
+    assert len(backend.calls) == 4
+
+@pytest.mark.asyncio
+async def test_stream_to_file_writes_in_order_and_records_first_byte(tmp_path):
+    synth = make_synth(tmp_path, FakeTTSBackend(chunk_size=64))
+    stats = {}
+    written = await stream_to_file(synth.stream(SCRIPT, stats), tmp_path / "podcast.mp3")
+
+    expected = b"".join(FakeTTSBackend.audio_for(s) for s in split_script(SCRIPT, 60))
+    assert (tmp_path / "podcast.mp3").read_bytes() == expected
+    assert written["bytes"] == len(expected)
+    assert written["time_to_first_byte"] is not None
+    assert stats["synthesized"] == 4
+
+@pytest.mark.asyncio
+async def test_stream_holds_only_a_window_of_segments(tmp_path):
+    started = []
+
+    class RecordingBackend(FakeTTSBackend):
+        async def stream(self, text, voice_id, settings):
+            started.append(text)
+            async for chunk in super().stream(text, voice_id, settings):
+                yield chunk
+
+    stream = make_synth(tmp_path, RecordingBackend(), max_concurrency=2).stream(SCRIPT)
+    await stream.__anext__()
+    assert len(started) == 2
+    await stream.aclose()
+
+@pytest.mark.asyncio
+async def test_failed_stream_leaves_no_partial_file(tmp_path):
+    class BrokenBackend(FakeTTSBackend):
+        async def stream(self, text, voice_id, settings):
+            yield b"partial"
+            raise RuntimeError("connection reset")
+
+    synth = make_synth(tmp_path, BrokenBackend())
+    with pytest.raises(RuntimeError):
+        await stream_to_file(synth.stream(SCRIPT), tmp_path / "podcast.mp3")
+
+    assert not (tmp_path / "podcast.mp3").exists()
+    assert not (tmp_path / "podcast.mp3.part").exists()
+    assert not list((tmp_path / "tts").glob("*.mp3"))
+
+def _no_sleep(real_sleep):
+    async def sleep(delay, *args, **kwargs):
+        return await real_sleep(0)
+    return sleep
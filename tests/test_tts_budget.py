@@ -0,0 +1,86 @@
+import pytest
+from datetime import datetime
+from agents.audio_agent import AudioAgent
+from events.event_bus import EventBus
+from events.event_types import Event, EventType
+from utils.runtime import RuntimeContext
+from utils.storage import Storage
+from utils.tts_budget import CHARS_PER_SECOND, plan_script, trim_script
+
+def make_stories(n):
+    return [{'title': f"Story {i}", 'summary': "...", 'rank': i + 1} for i in range(n)]
+
+def test_unlimited_budget_uses_max_duration():
+    plan = plan_script(make_stories(5), max_duration_seconds=300)
+    assert len(plan.stories) == 5
+    assert plan.dropped == []
+    assert plan.duration_seconds <= 300
+    assert plan.planned_characters == round(plan.duration_seconds * CHARS_PER_SECOND)
+
+def test_small_budget_drops_lowest_ranked_stories():
+    stories = list(reversed(make_stories(6)))
+    plan = plan_script(stories, max_duration_seconds=300, char_budget=1800)
+
+    kept_ranks = [alloc.story['rank'] for alloc in plan.stories]
+    assert kept_ranks == sorted(kept_ranks)
+    assert kept_ranks[0] == 1
+    assert all(s['rank'] > max(kept_ranks) for s in plan.dropped)
+    assert plan.planned_characters <= 1800
+    assert all(alloc.seconds >= 25 for alloc in plan.stories)
+
+def test_tiny_budget_shortens_top_story():
+    plan = plan_script(make_stories(3), char_budget=400)
+    assert len(plan.stories) == 1
+    assert plan.stories[0].story['rank'] == 1
+    assert plan.planned_characters <= 400
+    assert any("shortened" in note for note in plan.notes)
+
+def test_record_actual_tracks_overshoot():
+    plan = plan_script(make_stories(3), char_budget=1000)
+    summary = plan.record_actual("x" * 1200)
+    assert summary['actual_characters'] == 1200
+    assert summary['over_budget'] is True
+
+def test_trim_script_keeps_outro():
+    script = "\n\n".join(["Intro here.", "Story one " * 20, "Story two " * 20, "Peace out!"])
+    trimmed = trim_script(script, 250)
+    assert len(trimmed) <= 250
+    assert trimmed.startswith("Intro here.")
+    assert trimmed.endswith("Peace out!")
+
+def test_credit_budget_is_converted_to_characters():
+    # 2 credits per character: 2000 credits buy 1000 characters
+    plan = plan_script(make_stories(3), char_budget=2000, credits_per_char=2.0)
+    assert plan.char_budget == 1000 and plan.credit_budget == 2000
+    assert plan.planned_characters <= 1000
+    assert plan.record_actual("x" * 1200)['over_budget'] is True
+    assert len(trim_script("\n\n".join(["Intro.", "a " * 400, "b " * 400, "Bye."]), plan.char_budget)) <= 1000
+
+def test_exhausted_budget_keeps_no_stories():
+    for remaining in (0, -50):
+        plan = plan_script(make_stories(3), char_budget=remaining)
+        assert plan.exhausted and plan.stories == [] and len(plan.dropped) == 3
+        assert plan.summary()["over_budget"] is False
+    assert not plan_script(make_stories(3)).exhausted
+
+class NoScriptClaude:
+    async def generate_script(self, *args, **kwargs):
+        raise AssertionError("no script should be generated on an exhausted budget")
+
+@pytest.mark.asyncio
+async def test_audio_agent_skips_synthesis_when_budget_exhausted(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = Storage(str(tmp_path / "data"))
+    storage.save_processed({"stories": [{"article": {"title": "Story", "summary": "..."}, "rank": 1}]}, "2026-W01")
+    config = {"agents": {"audio": {"tts_backend": "fake", "use_account_quota": False, "char_budget": 0}}}
+    agent = AudioAgent(EventBus(), RuntimeContext(config=config, claude=NoScriptClaude(), storage=storage))
+    errors = []
+
+    async def record(event_type, data):
+        errors.append((event_type, data))
+
+    agent.emit_event = record
+    await agent.process(Event(EventType.CONTENT_FORMATTED, datetime.now(), {"week_id": "2026-W01"}, "test", "c"))
+
+    assert errors == [(EventType.ERROR_OCCURRED, {"error": "TTS budget exhausted", "agent": "audio"})]
+    assert not (tmp_path / "data" / "approved" / "week-2026-W01" / "podcast.mp3").exists()
@@ -0,0 +1,133 @@
+import json
+import pytest
+from utils.tweet_publisher import RateLimit, RateLimitExceeded, ThreadPublisher, ThreadState, TweepyTweetAPI
+
+TWEETS = [{"text": f"Tweet {i}", "position": i} for i in range(1, 6)]
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class FakeTweetAPI:
+    """Local stand-in for POST /2/tweets with a rate-limit window"""
+
+    def __init__(self, clock, limit=3, window=900, fail_at=None):
+        self.clock = clock
+        self.limit = limit
+        self.window = window
+        self.fail_at = fail_at
+        self.reset = clock.time() + window
+        self.remaining = limit
+        self.posts = []
+
+    def _headers(self):
+        return {
+            "x-rate-limit-limit": str(self.limit),
+            "x-rate-limit-remaining": str(self.remaining),
+            "x-rate-limit-reset": str(int(self.reset)),
+        }
+
+    def post(self, text, reply_to=None):
+        if self.clock.time() >= self.reset:
+            self.reset = self.clock.time() + self.window
+            self.remaining = self.limit
+        if self.remaining == 0:
+            raise RateLimitExceeded(RateLimit.from_headers(self._headers()))
+        if self.fail_at is not None and len(self.posts) == self.fail_at:
+            self.fail_at = None
+            raise ConnectionError("connection reset")
+        self.remaining -= 1
+        tweet_id = str(100 + len(self.posts))
+        self.posts.append((text, reply_to, tweet_id))
+        return tweet_id, self._headers()
+
+def make_publisher(api, clock, state_path, **kwargs):
+    return ThreadPublisher(api, ThreadState(state_path), min_interval=2, sleep=clock.sleep, clock=clock.time, **kwargs)
+
+@pytest.mark.asyncio
+async def test_thread_is_chained_and_paced_by_headers(tmp_path):
+    clock = FakeClock()
+    api = FakeTweetAPI(clock, limit=3, window=900)
+    result = await make_publisher(api, clock, tmp_path / "state.json").publish(TWEETS)
+
+    assert result["complete"] and result["posted"] == 5
+    assert [reply_to for _, reply_to, _ in api.posts] == [None, "100", "101", "102", "103"]
+    # Two short gaps while quota remains, then one wait until the window resets
+    assert clock.sleeps[:2] == [2, 2]
+    assert clock.sleeps[2] == pytest.approx(900 - 4 + 1)
+
+@pytest.mark.asyncio
+async def test_rerun_resumes_mid_thread(tmp_path):
+    clock = FakeClock()
+    api = FakeTweetAPI(clock, limit=100, fail_at=2)
+
+    with pytest.raises(ConnectionError):
+        await make_publisher(api, clock, tmp_path / "state.json").publish(TWEETS)
+    assert json.loads((tmp_path / "state.json").read_text())["posted"] == {"1": "100", "2": "101"}
+
+    result = await make_publisher(api, clock, tmp_path / "state.json").publish(TWEETS)
+    assert result == {"posted": 3, "skipped": 2, "complete": True, "ids": ["100", "101", "102", "103", "104"]}
+    assert api.posts[2] == ("Tweet 3", "101", "102")
+
+@pytest.mark.asyncio
+async def test_long_reset_stops_run_incomplete(tmp_path):
+    clock = FakeClock()
+    api = FakeTweetAPI(clock, limit=2, window=24 * 3600)
+    result = await make_publisher(api, clock, tmp_path / "state.json", max_wait=900).publish(TWEETS)
+
+    assert result["complete"] is False
+    assert result["posted"] == 2
+    assert max(clock.sleeps) <= 900
+
+def test_tweepy_client_exposes_rate_limit_headers():
+    tweepy = pytest.importorskip("tweepy")
+    requests = pytest.importorskip("requests")
+    from requests.adapters import BaseAdapter
+
+    class LocalTwitterAdapter(BaseAdapter):
+        def __init__(self, status=201):
+            super().__init__()
+            self.status = status
+            self.requests = []
+
+        def send(self, request, **kwargs):
+            self.requests.append(request)
+            response = requests.Response()
+            response.status_code = self.status
+            response.request = request
+            response.url = request.url
+            response.headers.update({
+                "x-rate-limit-limit": "200",
+                "x-rate-limit-remaining": "0" if self.status == 429 else "199",
+                "x-rate-limit-reset": "1700000000",
+            })
+            response._content = json.dumps({"data": {"id": "42", "text": "hi"}}).encode()
+            return response
+
+        def close(self):
+            pass
+
+    client = tweepy.Client(
+        consumer_key="k", consumer_secret="s", access_token="t", access_token_secret="ts",
+        return_type=requests.Response
+    )
+    adapter = LocalTwitterAdapter()
+    client.session.mount("https://api.twitter.com/", adapter)
+
+    tweet_id, headers = TweepyTweetAPI(client).post("hi", reply_to="41")
+    assert tweet_id == "42"
+    assert RateLimit.from_headers(headers).remaining == 199
+    assert json.loads(adapter.requests[0].body)["reply"] == {"in_reply_to_tweet_id": "41"}
+
+    adapter.status = 429
+    with pytest.raises(RateLimitExceeded) as excinfo:
+        TweepyTweetAPI(client).post("hi")
+    assert excinfo.value.rate_limit.reset == 1700000000
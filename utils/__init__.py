@@ -1,6 +1,23 @@
-from .logger import Logger
-from .llm_client import ClaudeClient
-from .storage import Storage
-from .email_client import EmailClient
+import importlib
 
-__all__ = ['Logger', 'ClaudeClient', 'Storage', 'EmailClient']
+# Resolved lazily so that importing one utility does not import anthropic
+# (via llm_client) or other heavy dependencies of its siblings.
+_EXPORTS = {
+    'Logger': '.logger',
+    'ClaudeClient': '.llm_client',
+    'Storage': '.storage',
+    'EmailClient': '.email_client',
+    'RuntimeContext': '.runtime',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -8,12 +8,19 @@ Supports:
 import os
 from pathlib import Path
 from typing import Optional, Dict
-from dotenv import load_dotenv
 
-# Load .env file if it exists
 env_path = Path(__file__).parent.parent / ".env"
-if env_path.exists():
-    load_dotenv(env_path)
+_env_loaded = False
+
+def _load_env_file():
+    """Load the .env file on first key lookup rather than at import time"""
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    if env_path.exists():
+        from dotenv import load_dotenv
+        load_dotenv(env_path)
 
 class APIKeyManager:
     """Manages API keys from multiple sources"""
@@ -75,6 +82,8 @@ class APIKeyManager:
         Returns:
             API key value or None
         """
+        _load_env_file()
+
         # First, try the exact key name
         value = os.getenv(key_name)
         if value:
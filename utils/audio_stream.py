@@ -0,0 +1,147 @@
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Union
+from utils import tracing
+
+# EBU R128-style target for spoken-word podcasts
+LOUDNORM_FILTER = "loudnorm=I=-16:TP=-1.5:LRA=11"
+
+class AudioFileWriter:
+    """
+    Incremental audio writer.
+
+    Chunks are appended to `<path>.part` as they arrive and the file is
+    renamed into place only when the stream completes, so a failed or
+    cancelled episode never leaves a truncated podcast.mp3 behind.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + ".part")
+        self.bytes_written = 0
+        self.time_to_first_byte: Optional[float] = None
+        self._started = time.perf_counter()
+        self._file = None
+
+    def open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.tmp_path, "wb")
+        self._started = time.perf_counter()
+        return self
+
+    def write(self, chunk: bytes):
+        if not chunk:
+            return
+        if self.time_to_first_byte is None:
+            self.time_to_first_byte = time.perf_counter() - self._started
+        self._file.write(chunk)
+        self.bytes_written += len(chunk)
+
+    def commit(self):
+        self._file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self._file.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "bytes": self.bytes_written,
+            "time_to_first_byte": self.time_to_first_byte,
+            "seconds": time.perf_counter() - self._started,
+        }
+
+def write_chunks(chunks: Iterable[bytes], path: Union[str, Path]) -> Dict[str, Any]:
+    """Write a synchronous chunk iterator (e.g. ElevenLabs convert()) to disk"""
+    writer = AudioFileWriter(path)
+    with writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return writer.stats()
+
+async def loudnorm_stream(
+    chunks: AsyncIterator[bytes],
+    audio_filter: str = LOUDNORM_FILTER,
+    read_size: int = 64 * 1024
+) -> AsyncIterator[bytes]:
+    """
+    Pipe MP3 chunks through ffmpeg's loudnorm filter.
+
+    Single-pass loudnorm works on a sliding window, so audio flows through
+    the subprocess as it arrives instead of being buffered in Python.
+    """
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-hide_banner", "-loglevel", "error",
+        "-f", "mp3", "-i", "pipe:0",
+        "-af", audio_filter,
+        "-f", "mp3", "pipe:1",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+
+    async def feed():
+        try:
+            async for chunk in chunks:
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+        finally:
+            process.stdin.close()
+
+    feeder = asyncio.create_task(feed())
+    try:
+        while True:
+            data = await process.stdout.read(read_size)
+            if not data:
+                break
+            yield data
+        await feeder
+        stderr = await process.stderr.read()
+        if await process.wait() != 0:
+            raise RuntimeError(f"ffmpeg loudnorm failed: {stderr.decode(errors='replace').strip()}")
+    finally:
+        if not feeder.done():
+            feeder.cancel()
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+
+async def stream_to_file(
+    chunks: AsyncIterator[bytes],
+    path: Union[str, Path],
+    normalize: bool = False
+) -> Dict[str, Any]:
+    """
+    Drain an async chunk iterator into `path`, optionally loudness-normalized.
+
+    Returns {"path", "bytes", "time_to_first_byte", "seconds"}; file writes
+    run in a worker thread so the event loop keeps serving other agents.
+    """
+    if normalize:
+        chunks = loudnorm_stream(chunks)
+    writer = AudioFileWriter(path)
+    with tracing.span("encode.audio", path=Path(path).name, normalize=normalize) as span:
+        await asyncio.to_thread(writer.open)
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(writer.write, chunk)
+        except BaseException:
+            await asyncio.to_thread(writer.abort)
+            raise
+        await asyncio.to_thread(writer.commit)
+        stats = writer.stats()
+        span.set(bytes=stats["bytes"])
+    return stats
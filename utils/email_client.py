@@ -1,73 +1,399 @@
+import asyncio
+import base64
+import mimetypes
 import os
+import queue
+import re
 import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from email.policy import SMTP
+from email.utils import formatdate, make_msgid
 from pathlib import Path
 from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional
+
+# 57 input bytes encode to one 76-character base64 line; read attachments
+# in whole lines so chunks can be dot-stuffed independently
+ATTACHMENT_CHUNK = 57 * 1024
+
+# Bytes collected before each socket write while streaming DATA
+SEND_BUFFER = 64 * 1024
+
+# Disconnects are retried once on a fresh connection
+RETRYABLE_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+class DeliveryUnknownError(smtplib.SMTPException):
+    """
+    The connection failed after the DATA terminator went out, so the server
+    may already have queued the message. Resending could deliver it twice.
+    """
+
+def _to_wire(chunk: bytes) -> bytes:
+    """CRLF line endings and dot-stuffing for one chunk that starts at a line boundary"""
+    chunk = re.sub(rb"(?:\r\n|\n|\r(?!\n))", b"\r\n", chunk)
+    return re.sub(rb"(?m)^\.", b"..", chunk)
+
+@dataclass
+class OutgoingMessage:
+    """
+    One email, serialized lazily.
+
+    `chunks()` yields the RFC 5322 message in pieces: headers and the HTML
+    part first, then each attachment base64-encoded straight from disk, so
+    large attachments are never held in memory.
+    """
+    sender: str
+    recipients: List[str]
+    subject: str
+    body_html: str
+    attachments: List[Path] = field(default_factory=list)
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    def _root_headers(self, content_type: Optional[str]) -> EmailMessage:
+        root = EmailMessage(policy=SMTP)
+        root['From'] = self.sender
+        root['To'] = ", ".join(self.recipients)
+        root['Subject'] = self.subject
+        root['Date'] = formatdate(localtime=True)
+        root['Message-ID'] = make_msgid()
+        for name, value in self.headers.items():
+            root[name] = value
+        if content_type:
+            root['MIME-Version'] = "1.0"
+            root['Content-Type'] = content_type
+        return root
+
+    def chunks(self) -> Iterator[bytes]:
+        attachments = [path for path in self.attachments if path.exists()]
+        if not attachments:
+            root = self._root_headers(None)
+            root.set_content(self.body_html, subtype='html', cte='quoted-printable')
+            yield root.as_bytes()
+            return
+
+        boundary = f"=_{uuid.uuid4().hex}"
+        # Serialize headers only; the generator would add an empty multipart body
+        root = self._root_headers(f'multipart/mixed; boundary="{boundary}"')
+        yield b"".join(SMTP.fold_binary(name, value) for name, value in root.items()) + b"\r\n"
+
+        html = EmailMessage(policy=SMTP)
+        html.set_content(self.body_html, subtype='html', cte='quoted-printable')
+        del html['MIME-Version']
+        yield f"--{boundary}\r\n".encode() + html.as_bytes() + b"\r\n"
+
+        for path in attachments:
+            content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+            yield (
+                f"--{boundary}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Transfer-Encoding: base64\r\n"
+                f'Content-Disposition: attachment; filename="{path.name}"\r\n\r\n'
+            ).encode()
+            with open(path, 'rb') as f:
+                while True:
+                    block = f.read(ATTACHMENT_CHUNK)
+                    if not block:
+                        break
+                    yield base64.encodebytes(block)
+        yield f"--{boundary}--\r\n".encode()
+
+@dataclass
+class _PooledConnection:
+    smtp: smtplib.SMTP
+    created: float
+    last_used: float
+    messages: int = 0
 
 class EmailClient:
-    """Email client for notifications and approvals"""
-    
-    def __init__(self):
-        self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-        self.smtp_port = int(os.getenv("SMTP_PORT", 587))
-        self.sender = os.getenv("EMAIL_SENDER")
-        self.password = os.getenv("EMAIL_PASSWORD")
-    
+    """
+    Email client for notifications, approvals and newsletters.
+
+    Authenticated SMTP connections are pooled and reused across messages
+    instead of reconnecting, running STARTTLS and logging in for each one.
+    A connection is recycled after `max_messages_per_connection` messages
+    and checked with NOOP when it has been idle longer than
+    `keepalive_check_seconds`. smtplib is blocking, so async callers should
+    use `send_email_async` / `send_batch_async`, which run on worker threads
+    (up to `pool_size` connections in parallel).
+    """
+
+    def __init__(
+        self,
+        smtp_server: Optional[str] = None,
+        smtp_port: Optional[int] = None,
+        sender: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: Optional[bool] = None,
+        auth: bool = True,
+        pool_size: int = 1,
+        max_messages_per_connection: int = 100,
+        keepalive_check_seconds: float = 30.0,
+        timeout: float = 30.0
+    ):
+        self.smtp_server = smtp_server or os.getenv("SMTP_SERVER", "smtp.gmail.com")
+        self.smtp_port = int(smtp_port or os.getenv("SMTP_PORT", 587))
+        self.sender = sender or os.getenv("EMAIL_SENDER")
+        self.password = password or os.getenv("EMAIL_PASSWORD")
+        if starttls is None:
+            starttls = os.getenv("SMTP_STARTTLS", "true").lower() not in ("0", "false", "no")
+        self.starttls = starttls
+        self.auth = auth
+        self.pool_size = max(1, pool_size)
+        self.max_messages_per_connection = max_messages_per_connection
+        self.keepalive_check_seconds = keepalive_check_seconds
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[_PooledConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.pool_size)
+        self._stats_lock = threading.Lock()
+        self.connections_opened = 0
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.sender) and (bool(self.password) or not self.auth)
+
+    # -- connection pool ------------------------------------------------
+
+    def _connect(self) -> _PooledConnection:
+        smtp = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+        try:
+            smtp.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            smtp.ehlo()
+            if self.starttls:
+                smtp.starttls()
+                smtp.ehlo()
+            if self.auth:
+                smtp.login(self.sender, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        with self._stats_lock:
+            self.connections_opened += 1
+        now = time.monotonic()
+        return _PooledConnection(smtp, created=now, last_used=now)
+
+    @staticmethod
+    def _discard(conn: _PooledConnection):
+        try:
+            conn.smtp.quit()
+        except Exception:
+            conn.smtp.close()
+
+    def _acquire(self) -> _PooledConnection:
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+                if conn.messages >= self.max_messages_per_connection:
+                    self._discard(conn)
+                    continue
+                if time.monotonic() - conn.last_used > self.keepalive_check_seconds:
+                    try:
+                        if conn.smtp.noop()[0] != 250:
+                            raise smtplib.SMTPServerDisconnected("NOOP failed")
+                    except Exception:
+                        conn.smtp.close()
+                        continue
+                return conn
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, conn: Optional[_PooledConnection], broken: bool = False):
+        try:
+            if conn is not None:
+                if broken:
+                    conn.smtp.close()
+                else:
+                    conn.last_used = time.monotonic()
+                    self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Quit every idle pooled connection"""
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+    # -- sending --------------------------------------------------------
+
+    def _transmit(self, smtp: smtplib.SMTP, message: OutgoingMessage):
+        """MAIL/RCPT/DATA with the body streamed chunk by chunk"""
+        code, reply = smtp.mail(message.sender)
+        if code != 250:
+            raise smtplib.SMTPSenderRefused(code, reply, message.sender)
+        refused = {}
+        for recipient in message.recipients:
+            code, reply = smtp.rcpt(recipient)
+            if code not in (250, 251):
+                refused[recipient] = (code, reply)
+        if len(refused) == len(message.recipients):
+            smtp.rset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+
+        smtp.putcmd("data")
+        code, reply = smtp.getreply()
+        if code != 354:
+            raise smtplib.SMTPDataError(code, reply)
+        # Coalesce small pieces; separate tiny writes stall on Nagle + delayed ACK
+        buffer = bytearray()
+        for chunk in message.chunks():
+            buffer += _to_wire(chunk)
+            if len(buffer) >= SEND_BUFFER:
+                smtp.send(bytes(buffer))
+                buffer.clear()
+        smtp.send(bytes(buffer) + b".\r\n")
+        try:
+            code, reply = smtp.getreply()
+        except RETRYABLE_ERRORS as e:
+            raise DeliveryUnknownError(f"No reply after DATA; message may have been delivered: {e}") from e
+        if code != 250:
+            raise smtplib.SMTPDataError(code, reply)
+
+    def send_message(self, message: OutgoingMessage):
+        """
+        Send on a pooled connection, retrying once if the connection dropped
+        before the message was complete. A drop while waiting for the final
+        reply raises DeliveryUnknownError instead of resending.
+        """
+        for attempt in range(2):
+            conn = self._acquire()
+            try:
+                self._transmit(conn.smtp, message)
+            except RETRYABLE_ERRORS:
+                self._release(conn, broken=True)
+                if attempt:
+                    raise
+                continue
+            except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+                # The server answered; the session is still usable after RSET
+                try:
+                    conn.smtp.rset()
+                    self._release(conn)
+                except Exception:
+                    self._release(conn, broken=True)
+                raise
+            except BaseException:
+                self._release(conn, broken=True)
+                raise
+            conn.messages += 1
+            self._release(conn)
+            return
+
+    def build_message(
+        self,
+        recipient: str,
+        subject: str,
+        body_html: str,
+        attachments: Optional[list] = None,
+        headers: Optional[Mapping[str, str]] = None
+    ) -> OutgoingMessage:
+        return OutgoingMessage(
+            sender=self.sender,
+            recipients=[recipient],
+            subject=subject,
+            body_html=body_html,
+            attachments=[Path(a) for a in attachments or []],
+            headers=dict(headers or {}),
+        )
+
     def send_email(
-        self, 
-        recipient: str, 
-        subject: str, 
+        self,
+        recipient: str,
+        subject: str,
         body_html: str,
-        attachments: list = None
-    ):
-        """Send HTML email"""
-        if not self.sender or not self.password:
+        attachments: list = None,
+        headers: Optional[Mapping[str, str]] = None
+    ) -> bool:
+        """Send HTML email; returns False if it was not sent"""
+        if not self.configured:
             print("Email credentials not configured. Skipping email send.")
-            return
-        
-        msg = MIMEMultipart('alternative')
-        msg['From'] = self.sender
-        msg['To'] = recipient
-        msg['Subject'] = subject
-        
-        # Attach HTML body
-        msg.attach(MIMEText(body_html, 'html'))
-        
-        # Attach files if provided
-        if attachments:
-            for filepath in attachments:
-                self._attach_file(msg, filepath)
-        
-        # Send email
+            return False
+
         try:
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender, self.password)
-                server.send_message(msg)
+            self.send_message(self.build_message(recipient, subject, body_html, attachments, headers))
+            return True
         except Exception as e:
             print(f"Error sending email: {e}")
-    
-    def _attach_file(self, msg: MIMEMultipart, filepath: str):
-        """Attach file to email"""
-        path = Path(filepath)
-        if not path.exists():
-            return
-        
-        with open(path, 'rb') as f:
-            part = MIMEBase('application', 'octet-stream')
-            part.set_payload(f.read())
-            encoders.encode_base64(part)
-            part.add_header(
-                'Content-Disposition',
-                f'attachment; filename={path.name}'
-            )
-            msg.attach(part)
-    
+            return False
+
+    def send_batch(
+        self,
+        messages: Iterable[Dict[str, Any]],
+        on_result: Optional[Callable[[Dict[str, Any], Optional[Exception]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Send message dicts ({"recipient", "subject", "body_html", optional
+        "attachments" and "headers"}) over one reused connection.
+
+        `on_result(message, error)` is called after each send. Returns
+        {"sent", "failed", "seconds", "messages_per_second", "errors"}.
+        """
+        if not self.configured:
+            print("Email credentials not configured. Skipping email send.")
+            return {"sent": 0, "failed": 0, "seconds": 0.0, "messages_per_second": 0.0, "errors": []}
+        started = time.perf_counter()
+        sent = failed = 0
+        errors: List[Dict[str, str]] = []
+        for message in messages:
+            error = None
+            try:
+                self.send_message(self.build_message(
+                    message['recipient'], message['subject'], message['body_html'],
+                    message.get('attachments'), message.get('headers')
+                ))
+                sent += 1
+            except Exception as e:
+                error = e
+                failed += 1
+                errors.append({"recipient": message['recipient'], "error": str(e)})
+            if on_result:
+                on_result(message, error)
+        seconds = time.perf_counter() - started
+        return {
+            "sent": sent,
+            "failed": failed,
+            "seconds": round(seconds, 3),
+            "messages_per_second": round(sent / seconds, 1) if seconds else 0.0,
+            "errors": errors,
+        }
+
+    async def send_email_async(self, *args, **kwargs) -> bool:
+        """send_email on a worker thread"""
+        return await asyncio.to_thread(self.send_email, *args, **kwargs)
+
+    async def send_batch_async(self, messages: List[Dict[str, Any]], concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """Split a batch across up to `concurrency` (default pool_size) connections"""
+        if not self.configured:
+            print("Email credentials not configured. Skipping email send.")
+            return {"sent": 0, "failed": 0, "seconds": 0.0, "messages_per_second": 0.0, "errors": []}
+        workers = max(1, min(concurrency or self.pool_size, len(messages)))
+        started = time.perf_counter()
+        results = await asyncio.gather(*(
+            asyncio.to_thread(self.send_batch, messages[i::workers]) for i in range(workers)
+        ))
+        seconds = time.perf_counter() - started
+        sent = sum(r["sent"] for r in results)
+        return {
+            "sent": sent,
+            "failed": sum(r["failed"] for r in results),
+            "seconds": round(seconds, 3),
+            "messages_per_second": round(sent / seconds, 1) if seconds else 0.0,
+            "errors": [e for r in results for e in r["errors"]],
+        }
+
     def send_approval_request(self, report_html: str, recipient: str):
         """Send weekly approval email"""
         week_id = datetime.now().strftime('%Y-W%W')
         subject = f"Weekly News Digest Approval - Week {week_id}"
-        self.send_email(recipient, subject, report_html)
+        return self.send_email(recipient, subject, report_html)
@@ -0,0 +1,213 @@
+import asyncio
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+from utils import tracing
+
+class FFmpegError(Exception):
+    """ffmpeg exited with a non-zero status"""
+
+    def __init__(self, returncode: int, stderr: str):
+        super().__init__(f"ffmpeg exited with {returncode}: {stderr.strip()[-500:]}")
+        self.returncode = returncode
+        self.stderr = stderr
+
+@dataclass
+class EncodingProfile:
+    """Arguments for turning one still image plus an audio track into an MP4"""
+    name: str
+    input_args: List[str]
+    video_args: List[str]
+    audio_args: List[str]
+    output_args: List[str] = field(default_factory=list)
+
+    def build(self, image_path: Union[str, Path], audio_path: Union[str, Path], output_path: Union[str, Path]) -> List[str]:
+        return [
+            *self.input_args, '-i', str(image_path),
+            '-i', str(audio_path),
+            *self.video_args,
+            *self.audio_args,
+            *self.output_args,
+            str(output_path),
+        ]
+
+def still_image_profile(fps: int = 1, crf: int = 28, preset: str = "veryfast", audio_bitrate: str = "128k") -> EncodingProfile:
+    """
+    Profile for a podcast card: one static frame for the whole episode.
+
+    The image is read at `fps` instead of 25, so ffmpeg encodes a handful of
+    nearly-empty P-frames per second of audio rather than full-rate video.
+    libx264's stillimage tune and a long GOP keep those frames tiny, and
+    +faststart moves the moov atom up front so the file streams on the web.
+    """
+    return EncodingProfile(
+        name="still",
+        input_args=['-loop', '1', '-framerate', str(fps)],
+        video_args=[
+            '-c:v', 'libx264', '-preset', preset, '-tune', 'stillimage',
+            '-crf', str(crf), '-r', str(fps), '-g', str(fps * 300),
+            '-pix_fmt', 'yuv420p',
+        ],
+        audio_args=['-c:a', 'aac', '-b:a', audio_bitrate],
+        output_args=['-movflags', '+faststart', '-shortest'],
+    )
+
+# The arguments VideoAgent used before the still-image profile; kept for benchmarks
+LEGACY_PROFILE = EncodingProfile(
+    name="legacy",
+    input_args=['-loop', '1'],
+    video_args=['-c:v', 'libx264', '-tune', 'stillimage', '-pix_fmt', 'yuv420p'],
+    audio_args=['-c:a', 'aac', '-b:a', '192k'],
+    output_args=['-shortest'],
+)
+
+def parse_progress(lines: List[str]) -> Dict[str, str]:
+    """Parse one block of `-progress` key=value output"""
+    block = {}
+    for line in lines:
+        key, sep, value = line.strip().partition('=')
+        if sep:
+            block[key] = value
+    return block
+
+def progress_seconds(block: Dict[str, str]) -> Optional[float]:
+    """Encoded media time in seconds from a progress block"""
+    # out_time_ms is actually microseconds in ffmpeg's progress output
+    for key in ('out_time_us', 'out_time_ms'):
+        value = block.get(key)
+        if value and value.lstrip('-').isdigit():
+            return max(0.0, int(value) / 1_000_000)
+    return None
+
+def ffmpeg_available(binary: str = "ffmpeg") -> bool:
+    return shutil.which(binary) is not None
+
+class FFmpegRunner:
+    """
+    Runs ffmpeg as an asyncio subprocess.
+
+    At most `max_concurrent` encodes run at once; progress is parsed from
+    `-progress pipe:1` and reported through `on_progress(seconds, fraction)`;
+    cancelling the awaiting task terminates ffmpeg and removes the partial
+    output.
+    """
+
+    def __init__(self, max_concurrent: int = 1, binary: str = "ffmpeg", logger=None, kill_timeout: float = 5.0):
+        self.binary = binary
+        self.logger = logger
+        self.kill_timeout = kill_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def _read_progress(self, stream, duration, on_progress, state):
+        lines = []
+        while True:
+            raw = await stream.readline()
+            if not raw:
+                break
+            line = raw.decode(errors='replace').strip()
+            lines.append(line)
+            if not line.startswith('progress='):
+                continue
+            block = parse_progress(lines)
+            lines = []
+            seconds = progress_seconds(block)
+            if seconds is None:
+                continue
+            state['out_time'] = seconds
+            if on_progress:
+                fraction = min(1.0, seconds / duration) if duration else None
+                on_progress(seconds, fraction)
+
+    async def _terminate(self, process):
+        if process.returncode is not None:
+            return
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), self.kill_timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+    async def run(
+        self,
+        args: List[str],
+        duration: Optional[float] = None,
+        on_progress: Optional[Callable[[float, Optional[float]], None]] = None,
+        output_path: Optional[Union[str, Path]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run `ffmpeg <args>` and return {"seconds": wall time, "out_time": media seconds}.
+
+        `output_path`, if given, is deleted when the encode fails or is cancelled.
+        """
+        async with self._semaphore:
+            output = Path(output_path).name if output_path is not None else (args[-1] if args else None)
+            with tracing.span("encode.ffmpeg", output=output, media_seconds=duration):
+                started = time.perf_counter()
+                process = await asyncio.create_subprocess_exec(
+                    self.binary, '-hide_banner', '-nostats', '-loglevel', 'error',
+                    '-progress', 'pipe:1', '-y', *args,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    stdin=asyncio.subprocess.DEVNULL
+                )
+                state: Dict[str, Any] = {'out_time': None}
+                try:
+                    _, stderr, returncode = await asyncio.gather(
+                        self._read_progress(process.stdout, duration, on_progress, state),
+                        process.stderr.read(),
+                        process.wait()
+                    )
+                except BaseException:
+                    await self._terminate(process)
+                    if output_path is not None:
+                        Path(output_path).unlink(missing_ok=True)
+                    raise
+
+                if returncode != 0:
+                    if output_path is not None:
+                        Path(output_path).unlink(missing_ok=True)
+                    raise FFmpegError(returncode, stderr.decode(errors='replace'))
+
+                return {'seconds': time.perf_counter() - started, 'out_time': state['out_time']}
+
+    async def probe_duration(self, path: Union[str, Path], ffprobe: str = "ffprobe") -> Optional[float]:
+        """Media duration in seconds via ffprobe, or None if it cannot be read"""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                ffprobe, '-v', 'error', '-show_entries', 'format=duration',
+                '-of', 'default=noprint_wrappers=1:nokey=1', str(path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            stdout, _ = await process.communicate()
+            return float(stdout.decode().strip())
+        except (OSError, ValueError):
+            return None
+
+    async def encode_still(
+        self,
+        image_path: Union[str, Path],
+        audio_path: Union[str, Path],
+        output_path: Union[str, Path],
+        profile: Optional[EncodingProfile] = None,
+        on_progress: Optional[Callable[[float, Optional[float]], None]] = None
+    ) -> Dict[str, Any]:
+        """Encode image + audio to `output_path` atomically (temp file, then rename)"""
+        profile = profile or still_image_profile()
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output_path.with_name(f"{output_path.stem}.part{output_path.suffix}")
+
+        duration = await self.probe_duration(audio_path) if on_progress else None
+        result = await self.run(
+            profile.build(image_path, audio_path, tmp_path),
+            duration=duration,
+            on_progress=on_progress,
+            output_path=tmp_path
+        )
+        os.replace(tmp_path, output_path)
+        return {**result, 'profile': profile.name, 'path': str(output_path)}
@@ -0,0 +1,85 @@
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import Tuple
+
+def link_or_copy(src: Path, dest: Path) -> str:
+    """
+    Place `src` at `dest` without duplicating data where possible.
+
+    Tries a hard link first and falls back to a copy (e.g. across devices).
+    Returns the method used: "link" or "copy".
+    """
+    src, dest = Path(src), Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if dest.exists() or dest.is_symlink():
+        dest.unlink()
+    try:
+        os.link(src, dest)
+        return "link"
+    except OSError:
+        shutil.copy2(src, dest)
+        return "copy"
+
+# Linux ioctl that shares extents between files (btrfs, XFS, bcachefs, ...)
+FICLONE = 0x40049409
+
+def reflink(src: Path, dest: Path) -> bool:
+    """Copy-on-write clone of `src` to `dest`; False if the filesystem can't"""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    with open(src, "rb") as s, open(dest, "wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+            return True
+        except OSError:
+            pass
+    Path(dest).unlink(missing_ok=True)
+    return False
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def publish_file(src: Path, dest: Path, methods: Tuple[str, ...] = ("reflink", "link", "copy")) -> Tuple[str, int]:
+    """
+    Make `dest` an up-to-date copy of `src`, writing as little as possible.
+
+    Skips files that are already the same inode or match in size and
+    sha256; otherwise tries each of `methods` in order ("reflink", "link",
+    "copy") on a temp name and renames it into place. Returns (method,
+    bytes written), where "skip" and the zero-copy methods write 0 bytes.
+    """
+    src, dest = Path(src), Path(dest)
+    if dest.exists():
+        if dest.samefile(src):
+            return "skip", 0
+        if dest.stat().st_size == src.stat().st_size and file_sha256(dest) == file_sha256(src):
+            return "skip", 0
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest.with_name(f".{dest.name}.tmp")
+    tmp_path.unlink(missing_ok=True)
+    for method in methods:
+        if method == "reflink":
+            if not reflink(src, tmp_path):
+                continue
+            written = 0
+        elif method == "link":
+            try:
+                os.link(src, tmp_path)
+            except OSError:
+                continue
+            written = 0
+        else:
+            shutil.copy2(src, tmp_path)
+            written = src.stat().st_size
+        os.replace(tmp_path, dest)
+        return method, written
+    raise OSError(f"Could not publish {src} to {dest} with {methods}")
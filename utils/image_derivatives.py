@@ -0,0 +1,245 @@
+import asyncio
+import hashlib
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from utils.fs import file_sha256, publish_file
+from utils import tracing
+
+DEFAULT_WIDTHS = (320, 640, 960, 1200)
+DEFAULT_FORMATS = ("avif", "webp")
+
+# Bump whenever render_derivatives' output changes so cached sets are redone
+PIPELINE_VERSION = 1
+
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+
+SAVE_OPTIONS = {
+    "webp": lambda quality: {"format": "WEBP", "quality": quality, "method": 4},
+    "avif": lambda quality: {"format": "AVIF", "quality": quality, "speed": 6},
+}
+
+def supported_formats(formats: Sequence[str]) -> Tuple[str, ...]:
+    """The subset of `formats` this Pillow build can encode"""
+    from PIL import features
+
+    return tuple(f for f in formats if f in SAVE_OPTIONS and features.check(f))
+
+def target_widths(original: int, widths: Sequence[int]) -> List[int]:
+    """Requested widths narrower than the original, plus the largest size without upscaling"""
+    below = sorted(w for w in set(widths) if w < original)
+    top = min(original, max(widths))
+    return below if top in below else below + [top]
+
+def render_derivatives(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Write every width/format variant of job['source'] into job['out_dir'].
+
+    Module-level so it runs in a ProcessPoolExecutor worker. meta.json is
+    written last, so its presence marks a complete set.
+    """
+    from PIL import Image, ImageOps
+
+    out_dir = Path(job["out_dir"])
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    with Image.open(job["source"]) as img:
+        largest = min(img.width, max(job["widths"]))
+        if img.getexif().get(0x0112, 1) < 5:
+            # Let JPEG decode at reduced scale; orientations 5-8 swap the axes, so skip those
+            img.draft("RGB", (largest, round(img.height * largest / img.width)))
+        img = ImageOps.exif_transpose(img)
+        img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+        widths = target_widths(img.width, job["widths"])
+        original = img.size
+
+        variants = []
+        for width in reversed(widths):
+            height = max(1, round(original[1] * width / original[0]))
+            resized = img if (width, height) == img.size else img.resize((width, height), Image.LANCZOS)
+            for image_format in job["formats"]:
+                path = out_dir / f"{width}.{image_format}"
+                tmp_path = path.with_name(path.name + ".tmp")
+                resized.save(tmp_path, **SAVE_OPTIONS[image_format](job["quality"]))
+                os.replace(tmp_path, path)
+                variants.append({
+                    "width": width,
+                    "height": height,
+                    "format": image_format,
+                    "file": path.name,
+                    "bytes": path.stat().st_size,
+                })
+            # Scale the next (smaller) width from this one instead of the full image
+            img = resized
+
+    meta = {"variants": sorted(variants, key=lambda v: (v["format"], v["width"]))}
+    meta_path = out_dir / "meta.json"
+    tmp_path = meta_path.with_name(meta_path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, meta_path)
+    return meta
+
+def srcset(meta: Dict[str, Any], name: str, url_prefix: str) -> Dict[str, Any]:
+    """
+    Markup-ready metadata for one image: a <source> per format (best first)
+    and a fallback `src` (the largest WebP, or the largest variant).
+    """
+    url_prefix = url_prefix.rstrip("/")
+    sources = []
+    for image_format in DEFAULT_FORMATS:
+        variants = [v for v in meta["variants"] if v["format"] == image_format]
+        if variants:
+            sources.append({
+                "type": MIME_TYPES[image_format],
+                "srcset": ", ".join(f"{url_prefix}/{name}-{v['width']}.{image_format} {v['width']}w" for v in variants),
+            })
+    fallback = max(
+        meta["variants"],
+        key=lambda v: (v["format"] == "webp", v["width"])
+    )
+    return {
+        "src": f"{url_prefix}/{name}-{fallback['width']}.{fallback['format']}",
+        "width": fallback["width"],
+        "height": fallback["height"],
+        "sources": sources,
+    }
+
+class ImagePipeline:
+    """
+    Fetches article images once and publishes responsive derivatives.
+
+    Remote sources are downloaded into `<cache_dir>/sources/` keyed by URL
+    and never fetched again. Derivative sets live in `<cache_dir>/derived/`
+    keyed by a hash of the source bytes and the width/format/quality
+    settings, so an image is only resized once; later runs just link the
+    cached files into place. Resizing and encoding run on a reusable process
+    pool. AVIF is skipped when the installed Pillow cannot encode it.
+    """
+
+    def __init__(
+        self,
+        widths: Sequence[int] = DEFAULT_WIDTHS,
+        formats: Sequence[str] = DEFAULT_FORMATS,
+        quality: int = 70,
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        cache_dir: Union[str, Path] = "data/cache/images",
+        max_concurrent_fetches: int = 4,
+        fetch_timeout: float = 15.0,
+        max_source_bytes: int = 20 * 1024 * 1024,
+        logger=None
+    ):
+        self.widths = tuple(sorted(int(w) for w in widths))
+        self.formats = supported_formats(formats)
+        if not self.formats:
+            raise ValueError(f"None of the image formats {list(formats)} can be encoded")
+        self.quality = quality
+        self.max_workers = max_workers
+        self.cache_dir = Path(cache_dir)
+        self.fetch_timeout = fetch_timeout
+        self.max_source_bytes = max_source_bytes
+        self.logger = logger
+        self._fetch_semaphore = asyncio.Semaphore(max_concurrent_fetches)
+        self._executor = executor
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _fetch(self, url: str) -> Path:
+        """Download `url` into the source cache (once); returns the cached path"""
+        path = self.cache_dir / "sources" / hashlib.sha256(url.encode("utf-8")).hexdigest()
+        if path.exists():
+            return path
+
+        import requests
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".part")
+        with requests.get(url, stream=True, timeout=self.fetch_timeout) as response:
+            response.raise_for_status()
+            size = 0
+            with open(tmp_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    size += len(chunk)
+                    if size > self.max_source_bytes:
+                        raise ValueError(f"Image larger than {self.max_source_bytes} bytes: {url}")
+                    f.write(chunk)
+        os.replace(tmp_path, path)
+        return path
+
+    async def fetch(self, source: str) -> Path:
+        """Local path of `source`, downloading http(s) URLs through the cache"""
+        if not source.startswith(("http://", "https://")):
+            return Path(source)
+        async with self._fetch_semaphore:
+            with tracing.span("fetch.image", url=source):
+                return await asyncio.to_thread(self._fetch, source)
+
+    def cache_key(self, source_path: Path) -> str:
+        payload = json.dumps([file_sha256(source_path), list(self.widths), list(self.formats), self.quality, PIPELINE_VERSION])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def _derive(self, source_path: Path) -> Tuple[Path, Dict[str, Any], bool]:
+        """(derived dir, meta, reused) for one source"""
+        key = await asyncio.to_thread(self.cache_key, source_path)
+        out_dir = self.cache_dir / "derived" / key
+        meta_path = out_dir / "meta.json"
+        if meta_path.exists():
+            with open(meta_path, "r") as f:
+                return out_dir, json.load(f), True
+        job = {
+            "source": str(source_path),
+            "out_dir": str(out_dir),
+            "widths": list(self.widths),
+            "formats": list(self.formats),
+            "quality": self.quality,
+        }
+        loop = asyncio.get_running_loop()
+        with tracing.span("render.images", source=source_path.name, formats=",".join(self.formats)):
+            meta = await loop.run_in_executor(self.executor, render_derivatives, job)
+        return out_dir, meta, False
+
+    @staticmethod
+    def _publish(out_dir: Path, meta: Dict[str, Any], dest_dir: Path, name: str) -> int:
+        written = 0
+        for variant in meta["variants"]:
+            _, size = publish_file(out_dir / variant["file"], dest_dir / f"{name}-{variant['width']}.{variant['format']}")
+            written += size
+        return written
+
+    async def process_one(self, item: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], str, int]:
+        """(srcset metadata or None, "processed" | "reused" | "failed", bytes written)"""
+        try:
+            source_path = await self.fetch(item["source"])
+            out_dir, meta, reused = await self._derive(source_path)
+            written = await asyncio.to_thread(self._publish, out_dir, meta, Path(item["dest_dir"]), item["name"])
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"Image {item['source']} skipped: {e}")
+            return None, "failed", 0
+        return srcset(meta, item["name"], item["url_prefix"]), "reused" if reused else "processed", written
+
+    async def process_all(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Publish derivatives for items of {"source", "dest_dir", "name", "url_prefix"}.
+
+        Returns {"images": [srcset metadata or None, in item order],
+        "processed": n, "reused": n, "failed": n, "bytes_written": n}
+        """
+        results = await asyncio.gather(*(self.process_one(item) for item in items))
+        stats = {"images": [image for image, _, _ in results], "processed": 0, "reused": 0, "failed": 0, "bytes_written": 0}
+        for _, outcome, written in results:
+            stats[outcome] += 1
+            stats["bytes_written"] += written
+        return stats
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -1,8 +1,8 @@
 import os
-import anthropic
 from typing import Dict, List, Any, Optional
 import asyncio
 from functools import wraps
+from utils import tracing
 
 def retry_on_error(max_retries=3, delay=1):
     """Decorator for retry logic with exponential backoff"""
@@ -26,6 +26,7 @@ class ClaudeClient:
         # Try to get API key from multiple sources
         # Import here to avoid circular dependency
         from utils.api_keys import APIKeyManager
+        import anthropic
         
         api_key = APIKeyManager.get_key("ANTHROPIC_API_KEY")
         if not api_key:
@@ -57,8 +58,13 @@ class ClaudeClient:
         if system:
             kwargs["system"] = system
         
-        response = self.client.messages.create(**kwargs)
-        return response.content[0].text
+        # The SDK call blocks; run it off the event loop so concurrent
+        # generators (newsletter, scoring, scripts) actually overlap
+        with tracing.span("llm", model=self.model, max_tokens=max_tokens, prompt_chars=len(prompt)) as span:
+            response = await asyncio.to_thread(self.client.messages.create, **kwargs)
+            text = response.content[0].text
+            span.set(output_chars=len(text))
+        return text
     
     async def analyze_relevance(self, article: Dict[str, Any]) -> float:
         """Assess article relevance for Gen Z (0-1 score)"""
@@ -102,17 +108,28 @@ Example: [3, 1, 5, 2, 4]"""
         except:
             return stories
     
-    async def generate_script(self, stories: List[Dict], duration_mins: int = 5) -> str:
-        """Generate realistic, engaging podcast script"""
+    async def generate_script(self, stories: List[Dict], duration_mins: float = 5, target_words: Optional[int] = None) -> str:
+        """
+        Generate realistic, engaging podcast script.
+
+        Stories may carry a `seconds` slot (see utils.tts_budget.plan_script);
+        `target_words` overrides the length derived from `duration_mins`.
+        """
+        target_words = target_words or round(duration_mins * 150)
+        story_lines = [
+            f"{i+1}. {s['title']}" + (f" (~{s['seconds']} sec)" if s.get('seconds') else "")
+            + f": {s.get('summary', '')[:150]}..."
+            for i, s in enumerate(stories[:7])
+        ]
         prompt = f"""Create a {duration_mins}-minute podcast script for "Gen Z News Weekly" - a real, engaging news podcast.
 
 Tone: Excited teenager with composure - energetic but credible, like a real Gen Z host
 Target: Gen Z listeners (ages 16-26)
-Word count: ~{duration_mins * 150} words
+Word count: ~{target_words} words (hard limit, do not exceed)
 Style: Natural, conversational, like talking to friends
 
 Stories to cover:
-{chr(10).join(f"{i+1}. {s['title']}: {s.get('summary', '')[:150]}..." for i, s in enumerate(stories[:7]))}
+{chr(10).join(story_lines)}
 
 Script Structure:
 - INTRO (30-45 sec): 
@@ -121,7 +138,7 @@ Script Structure:
   * Preview top 3 stories
   * Set the vibe
 
-- STORY SEGMENTS ({duration_mins - 1.5} min total):
+- STORY SEGMENTS ({max(duration_mins - 1.2, 0.5):.1f} min total):
   For each story:
   * Natural transition: "Okay, so..."
   * Story headline with excitement
@@ -144,7 +161,9 @@ Requirements:
 
 Write the full script as if you're the host speaking directly to listeners."""
         
-        return await self.generate(prompt, max_tokens=3000, temperature=0.8)
+        # ~1.3 tokens per spoken word plus headroom, instead of a flat 3000
+        max_tokens = min(3000, round(target_words * 1.6) + 200)
+        return await self.generate(prompt, max_tokens=max_tokens, temperature=0.8)
     
     async def format_newsletter(self, stories: List[Dict]) -> str:
         """Generate newsletter content"""
@@ -165,3 +184,25 @@ For each story:
 Use short sentences, active voice, occasional exclamation points (but not excessive)."""
         
         return await self.generate(prompt, max_tokens=3000)
+    
+    async def format_newsletter_segment(self, story: Dict) -> str:
+        """Generate newsletter content for a single story"""
+        prompt = f"""Write engaging newsletter content for this story.
+
+Tone: Excited teenager with composure
+Audience: Gen Z
+Format: A single HTML <div class="story"> block
+
+Title: {story['title']}
+Category: {story.get('category', '')}
+Summary: {story.get('summary', '')}
+
+Include:
+- Catchy headline
+- 100-150 word summary in engaging style
+- Why it matters to Gen Z
+
+Use short sentences, active voice, occasional exclamation points (but not excessive).
+Return only the <div class="story"> block."""
+        
+        return await self.generate(prompt, max_tokens=600)
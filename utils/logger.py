@@ -1,64 +1,200 @@
+import atexit
+import json
 import logging
+import queue
+import threading
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Dict, Optional
 from contextlib import contextmanager
 
+LOG_DIR = Path("logs")
+
+# Correlation id for the current task; contextvars keep it per asyncio task
+_correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log files"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        correlation_id = getattr(record, "correlation_id", None)
+        if correlation_id:
+            entry["correlation_id"] = correlation_id
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class TextFormatter(logging.Formatter):
+    """Human-readable console format with the correlation id as a prefix"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        correlation_id = getattr(record, "correlation_id", None)
+        if correlation_id:
+            record.message = f"[{correlation_id}] {record.message}"
+        return super().formatMessage(record)
+
+class _RoutingFileHandler(logging.Handler):
+    """Writes each record to logs/<logger name>.log, opening files on demand"""
+
+    def __init__(self, formatter: logging.Formatter):
+        super().__init__(logging.DEBUG)
+        self.setFormatter(formatter)
+        self._files: Dict[str, logging.FileHandler] = {}
+
+    def emit(self, record: logging.LogRecord):
+        handler = self._files.get(record.name)
+        if handler is None:
+            LOG_DIR.mkdir(exist_ok=True)
+            handler = logging.FileHandler(LOG_DIR / f"{record.name}.log", encoding="utf-8")
+            handler.setFormatter(self.formatter)
+            self._files[record.name] = handler
+        handler.handle(record)
+
+    def close(self):
+        for handler in self._files.values():
+            handler.close()
+        self._files.clear()
+        super().close()
+
+class _SubsystemQueueHandler(QueueHandler):
+    """Queue handler that restarts the listener if logging was shut down"""
+
+    def __init__(self, subsystem: "_LogSubsystem"):
+        super().__init__(subsystem.queue)
+        self._subsystem = subsystem
+
+    def enqueue(self, record: logging.LogRecord):
+        self._subsystem.ensure_started()
+        super().enqueue(record)
+
+class _LogSubsystem:
+    """
+    Process-wide queue, background listener and handler registry.
+
+    Agent threads and coroutines only enqueue records; formatting and file
+    or console I/O happen on the listener thread. The queue and each
+    logger's handler live as long as the process, so loggers keep working
+    across shutdown_logging(); the listener is started again on demand.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._listener: Optional[QueueListener] = None
+        self._configured = set()
+        self._exiting = False
+
+    def _start(self):
+        global _atexit_registered
+        console = logging.StreamHandler()
+        console.setLevel(logging.INFO)
+        console.setFormatter(TextFormatter())
+        self._listener = QueueListener(
+            self.queue,
+            _RoutingFileHandler(JsonFormatter()),
+            console,
+            respect_handler_level=True
+        )
+        self._listener.start()
+        if not _atexit_registered:
+            atexit.register(_shutdown_at_exit)
+            _atexit_registered = True
+
+    def ensure_started(self):
+        """Start the listener unless it is running or the process is exiting"""
+        if self._listener is not None or self._exiting:
+            return
+        with self._lock:
+            if self._listener is None:
+                self._start()
+
+    def configure(self, name: str) -> logging.Logger:
+        """Attach the queue handler to `name` exactly once"""
+        logger = logging.getLogger(name)
+        with self._lock:
+            if self._listener is None and not self._exiting:
+                self._start()
+            if name in self._configured:
+                return logger
+            logger.setLevel(logging.DEBUG)
+            logger.propagate = False
+            logger.addHandler(_SubsystemQueueHandler(self))
+            self._configured.add(name)
+        return logger
+
+    def shutdown(self):
+        """Flush pending records and stop the listener thread"""
+        with self._lock:
+            if self._listener is None:
+                return
+            # stop() drains the queue; loggers keep their handlers and
+            # restart the listener with their next record
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+
+_atexit_registered = False
+_subsystem = _LogSubsystem()
+
+def _shutdown_at_exit():
+    _subsystem._exiting = True
+    _subsystem.shutdown()
+
+def shutdown_logging():
+    """Flush queued log records; call before exit or between test runs"""
+    _subsystem.shutdown()
+
+def current_correlation_id() -> Optional[str]:
+    return _correlation_id.get()
+
+@contextmanager
+def correlation(correlation_id: str):
+    """Tag log records of the current task (and tasks it creates) with `correlation_id`"""
+    token = _correlation_id.set(correlation_id)
+    try:
+        yield
+    finally:
+        _correlation_id.reset(token)
+
 class Logger:
     """Agent-specific logger with correlation tracking"""
-    
+
     def __init__(self, agent_id: str):
         self.agent_id = agent_id
-        self.correlation_id = None
-        
-        # Create logs directory
-        Path("logs").mkdir(exist_ok=True)
-        
-        # Setup logger
-        self.logger = logging.getLogger(agent_id)
-        self.logger.setLevel(logging.DEBUG)
-        
-        # File handler
-        fh = logging.FileHandler(f"logs/{agent_id}.log")
-        fh.setLevel(logging.DEBUG)
-        
-        # Console handler
-        ch = logging.StreamHandler()
-        ch.setLevel(logging.INFO)
-        
-        # Formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        fh.setFormatter(formatter)
-        ch.setFormatter(formatter)
-        
-        self.logger.addHandler(fh)
-        self.logger.addHandler(ch)
-    
-    @contextmanager
+        self.logger = _subsystem.configure(agent_id)
+
+    @property
+    def correlation_id(self) -> Optional[str]:
+        return _correlation_id.get()
+
     def correlation(self, correlation_id: str):
         """Context manager for correlation tracking"""
-        old_id = self.correlation_id
-        self.correlation_id = correlation_id
-        try:
-            yield
-        finally:
-            self.correlation_id = old_id
-    
-    def _format_message(self, message: str) -> str:
-        if self.correlation_id:
-            return f"[{self.correlation_id}] {message}"
-        return message
-    
+        return correlation(correlation_id)
+
+    def _log(self, level: int, message: str):
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, message, extra={"correlation_id": _correlation_id.get()})
+
     def debug(self, message: str):
-        self.logger.debug(self._format_message(message))
-    
+        self._log(logging.DEBUG, message)
+
     def info(self, message: str):
-        self.logger.info(self._format_message(message))
-    
+        self._log(logging.INFO, message)
+
     def warning(self, message: str):
-        self.logger.warning(self._format_message(message))
-    
+        self._log(logging.WARNING, message)
+
     def error(self, message: str):
-        self.logger.error(self._format_message(message))
+        self._log(logging.ERROR, message)
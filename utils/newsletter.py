@@ -0,0 +1,300 @@
+import asyncio
+import csv
+import hashlib
+import hmac
+import html
+import re
+import smtplib
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
+from urllib.parse import quote
+from utils.email_client import DeliveryUnknownError
+from utils.site_data import slugify
+
+# `[[name]]` placeholders are filled per recipient; story blocks are wrapped
+# in <!--story:<category-slug>--> ... <!--/story--> by the formatter
+PLACEHOLDER = re.compile(r"\[\[(\w+)\]\]")
+STORY_BLOCK = re.compile(r"<!--story:([\w-]*)-->(.*?)<!--/story-->", re.S)
+
+def address_key(email: str) -> str:
+    """Normalized address used for de-duplication, the progress log and tokens"""
+    return email.strip().lower()
+
+@dataclass(frozen=True)
+class Subscriber:
+    email: str
+    name: str = ""
+    # Category slugs the subscriber wants; None means everything
+    categories: Optional[FrozenSet[str]] = None
+
+    @property
+    def key(self) -> str:
+        return address_key(self.email)
+
+def load_subscribers(path: Union[str, Path]) -> Iterator[Subscriber]:
+    """Stream subscribers from a CSV with `email`, optional `name` and `categories` (a;b;c) columns"""
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            email = (row.get("email") or "").strip()
+            if not email:
+                continue
+            categories = [slugify(c) for c in (row.get("categories") or "").split(";") if c.strip()]
+            yield Subscriber(email, (row.get("name") or "").strip(), frozenset(categories) or None)
+
+def unsubscribe_token(email: str, secret: str) -> str:
+    """Stable per-address token so unsubscribe links cannot be forged"""
+    return hmac.new(secret.encode(), address_key(email).encode(), hashlib.sha256).hexdigest()[:32]
+
+class NewsletterTemplate:
+    """
+    The approved newsletter HTML, compiled once per category selection.
+
+    Each selection (all stories, or the stories of a subscriber's
+    categories) is split once into literal text and placeholder names, so
+    rendering for a recipient is a single join of precomputed pieces with
+    their escaped values. Newsletters without story markers render whole.
+    """
+
+    def __init__(self, source: str):
+        self.blocks: List[Tuple[Optional[str], str]] = []
+        pos = 0
+        for match in STORY_BLOCK.finditer(source):
+            self.blocks.append((None, source[pos:match.start()]))
+            self.blocks.append((match.group(1), match.group(2)))
+            pos = match.end()
+        self.blocks.append((None, source[pos:]))
+        self.categories = frozenset(category for category, _ in self.blocks if category)
+        self._variants: Dict[Optional[FrozenSet[str]], Tuple[List[str], List[str]]] = {}
+
+    @property
+    def variants(self) -> int:
+        return len(self._variants)
+
+    def _variant(self, categories: Optional[FrozenSet[str]]) -> Tuple[List[str], List[str]]:
+        selection = categories & self.categories if categories else None
+        if not selection:
+            # No preference, or none of this week's categories: send everything
+            selection = None
+        compiled = self._variants.get(selection)
+        if compiled is None:
+            text = "".join(body for category, body in self.blocks if category is None or selection is None or category in selection)
+            parts = PLACEHOLDER.split(text)
+            compiled = (parts[0::2], parts[1::2])
+            self._variants[selection] = compiled
+        return compiled
+
+    def render(self, values: Mapping[str, str], categories: Optional[FrozenSet[str]] = None) -> str:
+        literals, names = self._variant(categories)
+        out = [literals[0]]
+        for name, literal in zip(names, literals[1:]):
+            out.append(html.escape(values.get(name, ""), quote=True))
+            out.append(literal)
+        return "".join(out)
+
+class SendProgress:
+    """
+    Append-only log of finished recipients for one week's send.
+
+    One line per recipient ("sent\\t<email>" or "failed\\t<email>\\t<error>"),
+    flushed as it happens, so a crashed or interrupted run resumes without
+    re-sending and without rewriting a growing state file. Addresses are
+    kept as `address_key()`, so a list whose capitalization changed
+    between runs still matches.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.sent: Set[str] = set()
+        self.failed: Dict[str, str] = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    status, _, rest = line.rstrip("\n").partition("\t")
+                    email, _, error = rest.partition("\t")
+                    email = address_key(email)
+                    if status == "sent":
+                        self.sent.add(email)
+                        self.failed.pop(email, None)
+                    elif status == "failed":
+                        self.failed[email] = error
+        self._file = None
+
+    def _append(self, line: str):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(line + "\n")
+        self._file.flush()
+
+    def record_sent(self, email: str):
+        email = address_key(email)
+        self.sent.add(email)
+        self.failed.pop(email, None)
+        self._append(f"sent\t{email}")
+
+    def record_failed(self, email: str, error: str):
+        email = address_key(email)
+        self.failed[email] = error
+        self._append(f"failed\t{email}\t{' '.join(error.split())}")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+def is_permanent(error: Exception) -> bool:
+    """
+    Rejections that retrying will not fix (unknown mailbox, 5xx replies),
+    and sends that may already have been delivered
+    """
+    if isinstance(error, (smtplib.SMTPRecipientsRefused, DeliveryUnknownError)):
+        return True
+    return isinstance(error, smtplib.SMTPResponseException) and 500 <= error.smtp_code < 600
+
+class NewsletterFanout:
+    """
+    Sends one week's newsletter to every subscriber.
+
+    `workers` sends run concurrently on EmailClient's pooled connections
+    (keep it at or below the client's pool_size). Recipients that fail with
+    a transient error go to a retry queue that is worked through again after
+    `retry_delay` seconds, doubling each round, up to `max_attempts`.
+    Progress is logged per recipient, so rerunning a week only sends to
+    the addresses that have not received it yet.
+    """
+
+    def __init__(
+        self,
+        email_client,
+        progress_path: Union[str, Path],
+        workers: int = 4,
+        max_attempts: int = 3,
+        retry_delay: float = 30.0,
+        unsubscribe_url: str = "https://example.com/unsubscribe?token={token}",
+        preferences_url: str = "https://example.com/preferences?token={token}",
+        secret: str = "",
+        logger=None,
+        sleep: Callable = asyncio.sleep
+    ):
+        self.email_client = email_client
+        self.progress_path = Path(progress_path)
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        self.unsubscribe_url = unsubscribe_url
+        self.preferences_url = preferences_url
+        self.secret = secret
+        self.logger = logger
+        self._sleep = sleep
+
+    def values_for(self, subscriber: Subscriber) -> Dict[str, str]:
+        token = unsubscribe_token(subscriber.email, self.secret)
+        fields = {"token": token, "email": quote(subscriber.email)}
+        return {
+            "name": subscriber.name or "there",
+            "email": subscriber.email,
+            "unsubscribe_url": self.unsubscribe_url.format(**fields),
+            "preferences_url": self.preferences_url.format(**fields),
+        }
+
+    def message_for(self, template: NewsletterTemplate, subject: str, subscriber: Subscriber):
+        values = self.values_for(subscriber)
+        return self.email_client.build_message(
+            subscriber.email,
+            subject,
+            template.render(values, subscriber.categories),
+            headers={
+                # One-click unsubscribe (RFC 8058)
+                "List-Unsubscribe": f"<{values['unsubscribe_url']}>",
+                "List-Unsubscribe-Post": "List-Unsubscribe=One-Click",
+            }
+        )
+
+    async def _send_round(
+        self,
+        template: NewsletterTemplate,
+        subject: str,
+        pending: List[Subscriber],
+        progress: SendProgress,
+        final: bool,
+        counts: Dict[str, int]
+    ) -> List[Subscriber]:
+        """Send to `pending` with bounded workers; returns the transient failures"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.workers * 4)
+        retry: List[Subscriber] = []
+
+        async def produce():
+            for subscriber in pending:
+                await queue.put(subscriber)
+            for _ in range(self.workers):
+                await queue.put(None)
+
+        async def work():
+            while True:
+                subscriber = await queue.get()
+                if subscriber is None:
+                    return
+                message = self.message_for(template, subject, subscriber)
+                try:
+                    await asyncio.to_thread(self.email_client.send_message, message)
+                except Exception as e:
+                    if final or is_permanent(e):
+                        progress.record_failed(subscriber.email, str(e))
+                        counts["failed"] += 1
+                    else:
+                        retry.append(subscriber)
+                else:
+                    progress.record_sent(subscriber.email)
+                    counts["sent"] += 1
+
+        await asyncio.gather(produce(), *(work() for _ in range(self.workers)))
+        return retry
+
+    async def send(self, newsletter_html: str, subject: str, subscribers: Iterable[Subscriber]) -> Dict[str, Any]:
+        """
+        Fan the newsletter out to `subscribers` (duplicates ignored).
+
+        Returns {"total", "sent", "skipped", "failed", "retried",
+        "variants", "seconds", "messages_per_second"}
+        """
+        template = NewsletterTemplate(newsletter_html)
+        progress = SendProgress(self.progress_path)
+        counts = {"sent": 0, "failed": 0, "retried": 0, "skipped": 0}
+        seen: Set[str] = set()
+        pending: List[Subscriber] = []
+        for subscriber in subscribers:
+            if subscriber.key in seen:
+                continue
+            seen.add(subscriber.key)
+            if subscriber.key in progress.sent:
+                counts["skipped"] += 1
+            else:
+                pending.append(subscriber)
+
+        started = time.perf_counter()
+        try:
+            for attempt in range(1, self.max_attempts + 1):
+                if not pending:
+                    break
+                if attempt > 1:
+                    delay = self.retry_delay * 2 ** (attempt - 2)
+                    if self.logger:
+                        self.logger.warning(f"Retrying {len(pending)} recipient(s) in {delay:.0f}s (attempt {attempt})")
+                    counts["retried"] += len(pending)
+                    await self._sleep(delay)
+                pending = await self._send_round(
+                    template, subject, pending, progress, attempt == self.max_attempts, counts
+                )
+        finally:
+            progress.close()
+
+        seconds = time.perf_counter() - started
+        return {
+            "total": len(seen),
+            **counts,
+            "variants": template.variants,
+            "seconds": round(seconds, 3),
+            "messages_per_second": round(counts["sent"] / seconds, 1) if seconds else 0.0,
+        }
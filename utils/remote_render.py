@@ -0,0 +1,219 @@
+import asyncio
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Tuple, Union
+
+class RemoteRenderError(Exception):
+    """The render service rejected, failed or timed out a job"""
+
+class RemoteRenderClient:
+    """
+    Async client for HeyGen-style render services.
+
+    Jobs are submitted, polled with exponential backoff and the finished
+    file is streamed to disk in chunks. HTTP runs on a pooled
+    requests.Session in worker threads, so the event loop stays free and
+    memory does not grow with the size of the video. Interrupted downloads
+    resume from the `.part` file with a Range request; a `.part.json`
+    sidecar records the URL, ETag and size the partial belongs to.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.heygen.com",
+        submit_path: str = "/v2/video/generate",
+        status_path: str = "/v1/video_status.get",
+        poll_interval: float = 5.0,
+        max_poll_interval: float = 60.0,
+        backoff: float = 1.5,
+        timeout: float = 1800.0,
+        request_timeout: float = 30.0,
+        chunk_size: int = 1024 * 1024,
+        max_download_attempts: int = 5,
+        logger=None
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.submit_path = submit_path
+        self.status_path = status_path
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff = backoff
+        self.timeout = timeout
+        self.request_timeout = request_timeout
+        self.chunk_size = chunk_size
+        self.max_download_attempts = max_download_attempts
+        self.logger = logger
+        self._session = None
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+            self._session.headers.update({"X-API-KEY": self.api_key, "Accept": "application/json"})
+        return self._session
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _request_json(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        response = self.session.request(method, f"{self.base_url}{path}", timeout=self.request_timeout, **kwargs)
+        if response.status_code >= 400:
+            raise RemoteRenderError(f"{method} {path} failed: {response.status_code} - {response.text[:300]}")
+        body = response.json()
+        if body.get("error"):
+            raise RemoteRenderError(f"{method} {path} failed: {body['error']}")
+        return body.get("data", body)
+
+    async def submit(self, payload: Dict[str, Any]) -> str:
+        """Create a render job and return its id"""
+        data = await asyncio.to_thread(self._request_json, "POST", self.submit_path, json=payload)
+        job_id = data.get("video_id")
+        if not job_id:
+            raise RemoteRenderError(f"No video_id in submit response: {data}")
+        return job_id
+
+    async def status(self, job_id: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(
+            self._request_json, "GET", self.status_path, params={"video_id": job_id}
+        )
+
+    async def wait(self, job_id: str) -> str:
+        """Poll until the job completes and return the result URL"""
+        deadline = time.monotonic() + self.timeout
+        interval = self.poll_interval
+        while True:
+            data = await self.status(job_id)
+            state = data.get("status")
+            if state == "completed":
+                video_url = data.get("video_url")
+                if not video_url:
+                    raise RemoteRenderError(f"Job {job_id} completed without a video_url")
+                return video_url
+            if state == "failed":
+                raise RemoteRenderError(f"Job {job_id} failed: {data.get('error')}")
+
+            if time.monotonic() + interval > deadline:
+                raise RemoteRenderError(f"Job {job_id} still '{state}' after {self.timeout:.0f}s")
+            if self.logger:
+                self.logger.debug(f"Render job {job_id} is {state}; next poll in {interval:.1f}s")
+            await asyncio.sleep(interval)
+            interval = min(self.max_poll_interval, interval * self.backoff)
+
+    @staticmethod
+    def _partial_meta_path(part_path: Path) -> Path:
+        return part_path.with_name(part_path.name + ".json")
+
+    def _discard_partial(self, part_path: Path):
+        part_path.unlink(missing_ok=True)
+        self._partial_meta_path(part_path).unlink(missing_ok=True)
+
+    def _resume_offset(self, url: str, part_path: Path) -> Tuple[int, Dict[str, Any]]:
+        """
+        (offset, sidecar) for resuming `url` from `part_path`.
+
+        A partial is only resumed when its sidecar records the same URL;
+        anything else (another job's file, a partial from before sidecars)
+        is deleted and the download starts from zero.
+        """
+        if not part_path.exists():
+            return 0, {}
+        try:
+            with open(self._partial_meta_path(part_path), "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+        if meta.get("url") != url:
+            if self.logger:
+                self.logger.warning(f"Discarding {part_path.name}: it does not belong to this download")
+            self._discard_partial(part_path)
+            return 0, {}
+        return part_path.stat().st_size, meta
+
+    def _download_once(self, url: str, part_path: Path) -> bool:
+        """Fetch (the rest of) `url` into `part_path`; True when the file is complete"""
+        import requests
+
+        offset, meta = self._resume_offset(url, part_path)
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            if meta.get("etag"):
+                # A changed file comes back whole (200) instead of as a range
+                headers["If-Range"] = meta["etag"]
+        # Result URLs are pre-signed; do not send the API key to the CDN
+        with requests.get(url, headers=headers, stream=True, timeout=self.request_timeout) as response:
+            if response.status_code == 416:
+                if offset and offset == meta.get("length"):
+                    return True
+                self._discard_partial(part_path)
+                return False
+            response.raise_for_status()
+
+            total = None
+            if response.status_code == 206:
+                match = re.fullmatch(r"bytes (\d+)-\d+/(\d+|\*)", response.headers.get("Content-Range", ""))
+                total = int(match.group(2)) if match and match.group(2) != "*" else None
+                if not match or int(match.group(1)) != offset or (
+                    total is not None and meta.get("length") is not None and total != meta["length"]
+                ):
+                    # Not the tail of the file we have; start over
+                    self._discard_partial(part_path)
+                    return False
+            else:
+                # Full body: the server ignored the Range or the ETag changed
+                offset = 0
+                if response.headers.get("Content-Length"):
+                    total = int(response.headers["Content-Length"])
+
+            if not offset:
+                with open(self._partial_meta_path(part_path), "w") as f:
+                    json.dump({"url": url, "etag": response.headers.get("ETag"), "length": total}, f)
+
+            with open(part_path, "ab" if offset else "wb") as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    f.write(chunk)
+                size = f.tell()
+        return total is None or size >= total
+
+    def _download(self, url: str, dest: Path) -> Dict[str, Any]:
+        import requests
+
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        part_path = dest.with_name(dest.name + ".part")
+        resumed = part_path.exists()
+        for attempt in range(1, self.max_download_attempts + 1):
+            try:
+                if self._download_once(url, part_path):
+                    break
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                if attempt == self.max_download_attempts:
+                    raise RemoteRenderError(f"Download failed after {attempt} attempts: {e}")
+            resumed = True
+            time.sleep(min(self.max_poll_interval, self.poll_interval * attempt))
+        else:
+            raise RemoteRenderError(f"Download incomplete after {self.max_download_attempts} attempts")
+        os.replace(part_path, dest)
+        self._partial_meta_path(part_path).unlink(missing_ok=True)
+        return {"path": str(dest), "bytes": dest.stat().st_size, "resumed": resumed}
+
+    async def download(self, url: str, dest: Union[str, Path]) -> Dict[str, Any]:
+        """Stream `url` to `dest` in chunks, resuming a previous partial download"""
+        return await asyncio.to_thread(self._download, url, Path(dest))
+
+    async def render(self, payload: Dict[str, Any], dest: Union[str, Path]) -> Dict[str, Any]:
+        """Submit, wait and download; returns {"job_id", "path", "bytes", "resumed", "seconds"}"""
+        started = time.perf_counter()
+        job_id = await self.submit(payload)
+        if self.logger:
+            self.logger.info(f"Render job {job_id} submitted")
+        video_url = await self.wait(job_id)
+        result = await self.download(video_url, dest)
+        return {"job_id": job_id, **result, "seconds": time.perf_counter() - started}
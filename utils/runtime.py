@@ -0,0 +1,127 @@
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from utils.logger import Logger
+from utils.storage import Storage
+
+class RuntimeContext:
+    """
+    Shared per-process resources handed to every agent.
+
+    Holds the parsed YAML config, the Claude client (one HTTP connection
+    pool), storage handles, the email client and the tracer. Everything is created
+    lazily on first use and then reused by all agents and across scheduler
+    runs, so constructing an agent is cheap.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(
+        self,
+        config_dir: str = "config",
+        config: Optional[Dict[str, Any]] = None,
+        claude=None,
+        storage: Optional[Storage] = None,
+        email_client=None
+    ):
+        self.config_dir = Path(config_dir)
+        self._config = config
+        self._claude = claude
+        self._storage = storage
+        self._email_client = email_client
+        self._tracer = None
+        self._yaml_cache: Dict[str, Any] = {}
+        # Agents may be constructed from worker threads (see agents.lifecycle)
+        self._lock = threading.RLock()
+
+    @classmethod
+    def default(cls) -> "RuntimeContext":
+        """Process-wide context used when an agent is not given one"""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    @classmethod
+    def reset_default(cls):
+        """Drop the process-wide context (tests, config reloads)"""
+        with cls._default_lock:
+            cls._default = None
+
+    def load_yaml(self, filename: str) -> Dict[str, Any]:
+        """Parse a YAML file from the config directory once and cache it"""
+        with self._lock:
+            if filename not in self._yaml_cache:
+                path = self.config_dir / filename
+                data = {}
+                if path.exists():
+                    import yaml
+                    with open(path, 'r') as f:
+                        data = yaml.safe_load(f) or {}
+                self._yaml_cache[filename] = data
+            return self._yaml_cache[filename]
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        if self._config is None:
+            self._config = self.load_yaml("config.yaml")
+        return self._config
+
+    @property
+    def categories(self) -> List[Dict[str, Any]]:
+        return self.load_yaml("categories.yaml").get('categories', [])
+
+    @property
+    def sources(self) -> Dict[str, Any]:
+        return self.load_yaml("sources.yaml").get('sources', {})
+
+    @property
+    def claude(self):
+        with self._lock:
+            if self._claude is None:
+                from utils.llm_client import ClaudeClient
+                self._claude = ClaudeClient()
+            return self._claude
+
+    @property
+    def storage(self) -> Storage:
+        with self._lock:
+            if self._storage is None:
+                base_path = self.config.get('storage', {}).get('base_path', 'data')
+                self._storage = Storage(base_path)
+            return self._storage
+
+    @property
+    def email_client(self):
+        with self._lock:
+            if self._email_client is None:
+                from utils.email_client import EmailClient
+                email_config = self.config.get('email', {}) or {}
+                self._email_client = EmailClient(
+                    pool_size=email_config.get('pool_size', 1),
+                    max_messages_per_connection=email_config.get('max_messages_per_connection', 100)
+                )
+            return self._email_client
+
+    @property
+    def tracer(self):
+        """Process-wide tracer, configured from the `tracing` section"""
+        with self._lock:
+            if self._tracer is None:
+                from utils import tracing
+                tracing_config = self.config.get('tracing', {}) or {}
+                self._tracer = tracing.configure(
+                    enabled=tracing_config.get('enabled', True),
+                    output_dir=tracing_config.get('output_dir'),
+                    trace_format=tracing_config.get('format', 'chrome'),
+                    keep=tracing_config.get('keep', 50)
+                )
+            return self._tracer
+
+    def get_logger(self, agent_id: str) -> Logger:
+        return Logger(agent_id)
+
+    def agent_config(self, name: str) -> Dict[str, Any]:
+        """Return the `agents.<name>` section of config.yaml"""
+        return self.config.get('agents', {}).get(name, {}) or {}
@@ -0,0 +1,160 @@
+import json
+import re
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from utils.site_data import SiteDataWriter
+
+INDEX_VERSION = 1
+SEARCH_DIR = "search"
+SUMMARY_CHARS = 200
+
+# Words too common in headlines to narrow a search
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this to was were will with
+after over new says into about more than up out how what why who
+""".split())
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase ASCII-folded words of 2+ characters, minus stopwords"""
+    folded = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode().lower()
+    return [t for t in re.findall(r"[a-z0-9]+", folded) if len(t) > 1 and t not in STOPWORDS]
+
+def shard_key(term: str) -> str:
+    """Shard a term lives in: its first letter, or '0' for digits"""
+    return term[0] if "a" <= term[0] <= "z" else "0"
+
+def delta_encode(values: Iterable[int]) -> List[int]:
+    out, prev = [], 0
+    for value in values:
+        out.append(value - prev)
+        prev = value
+    return out
+
+def delta_decode(deltas: Iterable[int]) -> List[int]:
+    out, total = [], 0
+    for delta in deltas:
+        total += delta
+        out.append(total)
+    return out
+
+class SearchIndexBuilder:
+    """
+    Builds the client-side search index under `<data>/search/`.
+
+    Files:
+      search/index.json     version, doc count, term count per shard
+      search/docs.json      [weekId, title, summary, url, category] per doc id
+      search/<shard>.json   {term: postings} for terms starting with <shard>
+
+    Doc ids follow week order (oldest first) then rank, so a new week only
+    appends ids and shards without its terms stay byte-identical. A posting is
+    `doc_id * 2 + 1` when the term is in the title and `doc_id * 2` when it
+    is only in the summary, so the sorted list stays monotonic and is
+    stored delta-encoded. The browser fetches the index, docs and only the
+    shards its query terms start with. Files go through SiteDataWriter, so
+    unchanged shards are not rewritten and get the same .gz/.br siblings.
+    """
+
+    def __init__(self, out_dir: Union[str, Path] = "website/public/data", compress=("gzip", "br")):
+        self.writer = SiteDataWriter(out_dir, compress=compress)
+
+    @staticmethod
+    def _articles(weeks: Dict[str, Dict[str, Any]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(week_id, article) in doc id order"""
+        for week_id in sorted(weeks):
+            stories = [s for s in weeks[week_id].get("stories", []) if isinstance(s, dict)]
+            for story in sorted(stories, key=lambda s: s.get("rank") or 0):
+                article = story.get("article", {})
+                if article.get("title"):
+                    yield week_id, article
+
+    def documents(self, weeks: Dict[str, Dict[str, Any]]) -> List[List[Any]]:
+        return [[
+            week_id,
+            article["title"],
+            (article.get("summary") or "")[:SUMMARY_CHARS],
+            article.get("url") or "",
+            article.get("category") or "",
+        ] for week_id, article in self._articles(weeks)]
+
+    def postings(self, weeks: Dict[str, Dict[str, Any]]) -> Dict[str, List[int]]:
+        """{term: sorted postings} before delta encoding"""
+        terms: Dict[str, Set[int]] = defaultdict(set)
+        for doc_id, (_week_id, article) in enumerate(self._articles(weeks)):
+            title_terms = set(tokenize(article["title"]))
+            for term in title_terms:
+                terms[term].add(doc_id * 2 + 1)
+            for term in set(tokenize(article.get("summary") or "")) - title_terms:
+                terms[term].add(doc_id * 2)
+        return {term: sorted(ids) for term, ids in terms.items()}
+
+    def build(self, weeks: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        """Write the index for {week_id: processed week data}; returns writer stats"""
+        docs = self.documents(weeks)
+        shards: Dict[str, Dict[str, List[int]]] = defaultdict(dict)
+        for term, ids in self.postings(weeks).items():
+            shards[shard_key(term)][term] = delta_encode(ids)
+
+        outputs = [(f"{SEARCH_DIR}/docs.json", docs)]
+        outputs += [(f"{SEARCH_DIR}/{key}.json", shard) for key, shard in shards.items()]
+        outputs.append((f"{SEARCH_DIR}/index.json", {
+            "version": INDEX_VERSION,
+            "docs": len(docs),
+            "weeks": len(weeks),
+            "shards": {key: len(shard) for key, shard in sorted(shards.items())},
+        }))
+
+        written = sum(self.writer.write_json(rel, data) for rel, data in outputs)
+        removed = self.writer.remove_stale((rel for rel, _ in outputs), [SEARCH_DIR])
+        return {"files": len(outputs), "written": written, "unchanged": len(outputs) - written, "removed": removed}
+
+class SearchIndex:
+    """Reads a built index the way the site's search page does (shards on demand)"""
+
+    def __init__(self, data_dir: Union[str, Path] = "website/public/data"):
+        self.path = Path(data_dir) / SEARCH_DIR
+        self.meta = self._load("index.json")
+        self.docs = self._load("docs.json")
+        self._shards: Dict[str, Dict[str, List[int]]] = {}
+
+    def _load(self, name: str) -> Any:
+        with open(self.path / name, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _postings(self, term: str, prefix: bool = False) -> Dict[int, int]:
+        """{doc_id: weight} for a term (or every term it prefixes); titles weigh 2"""
+        key = shard_key(term)
+        if key not in self.meta["shards"]:
+            return {}
+        if key not in self._shards:
+            self._shards[key] = self._load(f"{key}.json")
+        shard = self._shards[key]
+        matches = [t for t in shard if t.startswith(term)] if prefix else [term] if term in shard else []
+        weights: Dict[int, int] = {}
+        for match in matches:
+            for posting in delta_decode(shard[match]):
+                doc_id = posting >> 1
+                weights[doc_id] = max(weights.get(doc_id, 0), 2 if posting & 1 else 1)
+        return weights
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Docs containing every query term (the last one as a prefix), best then newest first"""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        scores: Optional[Dict[int, int]] = None
+        for i, term in enumerate(terms):
+            weights = self._postings(term, prefix=i == len(terms) - 1)
+            if scores is None:
+                scores = weights
+            else:
+                scores = {doc: score + weights[doc] for doc, score in scores.items() if doc in weights}
+            if not scores:
+                return []
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))[:limit]
+        return [
+            dict(zip(("weekId", "title", "summary", "url", "category"), self.docs[doc_id]), score=score)
+            for doc_id, score in ranked
+        ]
@@ -0,0 +1,177 @@
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+from utils.fs import file_sha256, publish_file
+
+# Everything outside public/ that can change Astro's output
+SOURCE_GLOBS = ["src/**/*", "astro.config.*", "tailwind.config.*", "package.json", "package-lock.json"]
+MANIFEST_NAME = ".build-manifest.json"
+
+def route_for(source: str) -> Optional[str]:
+    """URL route of an Astro page source (src/pages/week-X.astro -> /week-X)"""
+    if not source.startswith("src/pages/") or not source.endswith(".astro"):
+        return None
+    route = source[len("src/pages/"):-len(".astro")]
+    if route == "index" or route.endswith("/index"):
+        route = route[:-len("index")]
+    return "/" + route.rstrip("/") if route else "/"
+
+@dataclass
+class BuildPlan:
+    """What changed since the last successful build and what to do about it"""
+    changed_sources: List[str] = field(default_factory=list)
+    changed_public: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def action(self) -> str:
+        """'skip', 'public' (copy assets into dist/) or 'build' (astro build)"""
+        if self.changed_sources or any(not path.startswith("public/") for path in self.removed):
+            return "build"
+        if self.changed_public or self.removed:
+            return "public"
+        return "skip"
+
+    @property
+    def affected_routes(self) -> List[str]:
+        routes = {route_for(path) for path in self.changed_sources}
+        if any(route_for(path) is None for path in self.changed_sources):
+            # Layouts, components or config changed: every route is affected
+            return ["*"]
+        return sorted(route for route in routes if route)
+
+class SiteBuilder:
+    """
+    Incremental Astro build driven by a content-hash manifest.
+
+    Hashes of the Astro sources and public/ files from the last successful
+    build are kept in `<website>/.build-manifest.json`. Unchanged trees skip
+    the build; public-only changes (new audio, thumbnails) are copied
+    straight into dist/, which is all Astro would do with them. Hashes are
+    reused while a file's size and mtime are unchanged, so large media is
+    not re-read on every run.
+    """
+
+    def __init__(
+        self,
+        website_path: Union[str, Path] = "website",
+        build_command: Optional[List[str]] = None,
+        out_dir: str = "dist",
+        logger=None
+    ):
+        self.website_path = Path(website_path)
+        self.build_command = build_command or ["npm", "run", "build"]
+        self.out_dir = self.website_path / out_dir
+        self.manifest_path = self.website_path / MANIFEST_NAME
+        self.logger = logger
+
+    def load_manifest(self) -> Dict[str, Any]:
+        if self.manifest_path.exists():
+            with open(self.manifest_path, "r") as f:
+                return json.load(f)
+        return {"files": {}}
+
+    def save_manifest(self, manifest: Dict[str, Any]):
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _tracked_files(self) -> List[Path]:
+        files = set()
+        for pattern in SOURCE_GLOBS + ["public/**/*"]:
+            files.update(p for p in self.website_path.glob(pattern) if p.is_file())
+        return sorted(files)
+
+    def scan(self, previous: Dict[str, Any]) -> Dict[str, Any]:
+        """Current {relative path: {"size", "mtime_ns", "sha256"}} for tracked files"""
+        old_files = previous.get("files", {})
+        files = {}
+        for path in self._tracked_files():
+            rel = path.relative_to(self.website_path).as_posix()
+            stat = path.stat()
+            old = old_files.get(rel)
+            if old and old["size"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+                sha = old["sha256"]
+            else:
+                sha = file_sha256(path)
+            files[rel] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha}
+        return {"files": files}
+
+    def plan(self, previous: Dict[str, Any], current: Dict[str, Any]) -> BuildPlan:
+        old_files = previous.get("files", {})
+        new_files = current["files"]
+        plan = BuildPlan()
+        if not self.out_dir.exists():
+            # Nothing built yet (or dist/ was cleaned): everything is new
+            old_files = {}
+        for rel, entry in new_files.items():
+            if old_files.get(rel, {}).get("sha256") != entry["sha256"]:
+                (plan.changed_public if rel.startswith("public/") else plan.changed_sources).append(rel)
+        plan.removed = sorted(set(old_files) - set(new_files))
+        return plan
+
+    def _sync_public(self, plan: BuildPlan):
+        for rel in plan.changed_public:
+            publish_file(self.website_path / rel, self.out_dir / rel[len("public/"):])
+        for rel in plan.removed:
+            (self.out_dir / rel[len("public/"):]).unlink(missing_ok=True)
+
+    async def run_command(self, command: List[str]) -> Dict[str, Any]:
+        """Run a command in the website directory without blocking the loop"""
+        started = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            cwd=self.website_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+        return {
+            "returncode": process.returncode,
+            "stdout": stdout.decode(errors="replace"),
+            "stderr": stderr.decode(errors="replace"),
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+
+    async def build(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Bring dist/ up to date.
+
+        Returns {"action", "changed", "routes", "seconds", "ok", ...}; the
+        manifest is only updated after a successful build or asset sync.
+        """
+        started = time.perf_counter()
+        previous = await asyncio.to_thread(self.load_manifest)
+        current = await asyncio.to_thread(self.scan, previous)
+        plan = self.plan(previous, current)
+        action = "build" if force else plan.action
+        result: Dict[str, Any] = {
+            "action": action,
+            "changed": len(plan.changed_sources) + len(plan.changed_public) + len(plan.removed),
+            "routes": plan.affected_routes,
+            "ok": True,
+        }
+
+        if action == "build":
+            command = await self.run_command(self.build_command)
+            result["build_seconds"] = command["seconds"]
+            if command["returncode"] != 0:
+                result.update(ok=False, error=command["stderr"] or command["stdout"])
+        elif action == "public":
+            await asyncio.to_thread(self._sync_public, plan)
+
+        if result["ok"] and action != "skip":
+            await asyncio.to_thread(self.save_manifest, current)
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        return result
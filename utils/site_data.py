@@ -0,0 +1,208 @@
+import gzip
+import json
+import math
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+# Article fields the website renders; everything else (raw_content,
+# image scraping leftovers, selection reasons) stays out of the public data
+ARTICLE_FIELDS = ("title", "summary", "category", "source", "url", "publish_date", "image_url")
+
+# Directories owned by the generator; stale files in them are removed
+MANAGED_DIRS = ("weeks", "archive", "categories")
+
+def slugify(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "uncategorized"
+
+def compact_story(story: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a processed story to the fields pages render"""
+    article = story.get("article", {}) if isinstance(story, dict) else {}
+    compact = {key: article[key] for key in ARTICLE_FIELDS if article.get(key) not in (None, "")}
+    if story.get("rank") is not None:
+        compact["rank"] = story["rank"]
+    if story.get("importance_score") is not None:
+        compact["score"] = round(float(story["importance_score"]), 3)
+    return compact
+
+def encode(data: Any) -> bytes:
+    """Compact, deterministic JSON so unchanged data produces identical bytes"""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+
+def _brotli():
+    try:
+        import brotli
+        return brotli
+    except ImportError:
+        return None
+
+class SiteDataWriter:
+    """
+    Generates the website's static JSON data API under `public/data`.
+
+    Layout:
+      latest-stories.json          newest week (shape the index page reads)
+      weeks/<week_id>.json         one compact shard per week
+      archive/index.json           page count and newest week
+      archive/page-<n>.json        week summaries, newest first
+      categories/<slug>.json       recent stories in one category
+
+    Each file gets a .gz sibling (and .br when the brotli module is
+    installed) for servers that serve precompressed assets. Files are only
+    rewritten when their bytes change, so a new week touches its own shard,
+    the first archive page(s) and the categories it contains.
+    """
+
+    def __init__(
+        self,
+        out_dir: Union[str, Path] = "website/public/data",
+        page_size: int = 12,
+        category_limit: int = 50,
+        compress: Tuple[str, ...] = ("gzip", "br")
+    ):
+        self.out_dir = Path(out_dir)
+        self.page_size = page_size
+        self.category_limit = category_limit
+        self.compress = tuple(c for c in compress if c != "br" or _brotli() is not None)
+
+    def _siblings(self, path: Path) -> List[Tuple[Path, Any]]:
+        siblings = []
+        if "gzip" in self.compress:
+            # mtime=0 keeps the .gz byte-identical across runs
+            siblings.append((path.with_name(path.name + ".gz"), lambda b: gzip.compress(b, 9, mtime=0)))
+        if "br" in self.compress:
+            siblings.append((path.with_name(path.name + ".br"), lambda b: _brotli().compress(b, quality=11)))
+        return siblings
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def write_json(self, rel_path: str, data: Any) -> bool:
+        """Write one data file and its compressed siblings; False if unchanged"""
+        path = self.out_dir / rel_path
+        payload = encode(data)
+        siblings = self._siblings(path)
+        if path.exists() and path.read_bytes() == payload and all(p.exists() for p, _ in siblings):
+            return False
+        self._write_atomic(path, payload)
+        for sibling, compress in siblings:
+            self._write_atomic(sibling, compress(payload))
+        return True
+
+    def _files_for(self, rel_path: str) -> Set[Path]:
+        path = self.out_dir / rel_path
+        return {path} | {sibling for sibling, _ in self._siblings(path)}
+
+    def build(self, weeks: Dict[str, Dict[str, Any]], updated: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+        """
+        Regenerate all data files from {week_id: processed week data}.
+
+        `updated` optionally maps week ids to a timestamp for latest-stories.json.
+        Returns {"files", "written", "unchanged", "removed"}.
+        """
+        ordered = sorted(weeks, reverse=True)
+        shards: Dict[str, List[Dict[str, Any]]] = {
+            week_id: [compact_story(s) for s in weeks[week_id].get("stories", []) if isinstance(s, dict)]
+            for week_id in ordered
+        }
+        outputs: List[Tuple[str, Any]] = []
+
+        for week_id in ordered:
+            stories = shards[week_id]
+            outputs.append((f"weeks/{week_id}.json", {
+                "weekId": week_id,
+                "categories": sorted({s["category"] for s in stories if s.get("category")}),
+                "stories": stories,
+            }))
+
+        summaries = [{
+            "weekId": week_id,
+            "storyCount": len(shards[week_id]),
+            "top": shards[week_id][0].get("title") if shards[week_id] else None,
+            "categories": sorted({s["category"] for s in shards[week_id] if s.get("category")}),
+        } for week_id in ordered]
+        pages = max(1, math.ceil(len(summaries) / self.page_size))
+        outputs.append(("archive/index.json", {
+            "latest": ordered[0] if ordered else None,
+            "pages": pages,
+            "pageSize": self.page_size,
+            "total": len(summaries),
+        }))
+        for page in range(1, pages + 1):
+            start = (page - 1) * self.page_size
+            outputs.append((f"archive/page-{page}.json", {
+                "page": page,
+                "pages": pages,
+                "weeks": summaries[start:start + self.page_size],
+            }))
+
+        categories: Dict[str, Dict[str, Any]] = {}
+        for week_id in ordered:
+            for story in shards[week_id]:
+                name = story.get("category")
+                if not name:
+                    continue
+                feed = categories.setdefault(slugify(name), {"category": name, "stories": []})
+                if len(feed["stories"]) < self.category_limit:
+                    feed["stories"].append({**story, "weekId": week_id})
+        for slug, feed in categories.items():
+            outputs.append((f"categories/{slug}.json", feed))
+
+        if ordered:
+            latest = ordered[0]
+            # Same nesting the index page already reads (story.article.*)
+            latest_data = {
+                "weekId": latest,
+                "stories": [{
+                    "article": {k: v for k, v in s.items() if k not in ("rank", "score")},
+                    "rank": s.get("rank"),
+                    "importance_score": s.get("score"),
+                } for s in shards[latest]],
+            }
+            if updated and updated.get(latest):
+                latest_data["updated"] = updated[latest]
+            outputs.append(("latest-stories.json", latest_data))
+
+        written = sum(self.write_json(rel, data) for rel, data in outputs)
+        removed = self.remove_stale((rel for rel, _ in outputs), MANAGED_DIRS)
+        return {"files": len(outputs), "written": written, "unchanged": len(outputs) - written, "removed": removed}
+
+    def remove_stale(self, rel_paths: Iterable[str], directories: Iterable[str]) -> int:
+        """Delete files in `directories` that are not one of `rel_paths` (or their siblings)"""
+        keep: Set[Path] = set()
+        for rel in rel_paths:
+            keep |= self._files_for(rel)
+        removed = 0
+        for directory in directories:
+            for path in (self.out_dir / directory).glob("*"):
+                if path.is_file() and path not in keep:
+                    path.unlink()
+                    removed += 1
+        return removed
+
+def load_weeks(
+    processed_dir: Union[str, Path] = "data/processed",
+    week_ids: Optional[Iterable[str]] = None
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+    """
+    Read processed weeks; returns ({week_id: data}, {week_id: mtime iso}).
+
+    `week_ids` limits the result to those weeks (the approved ones, for
+    anything published); None reads every processed week.
+    """
+    wanted = set(week_ids) if week_ids is not None else None
+    weeks, updated = {}, {}
+    for path in sorted(Path(processed_dir).glob("week-*.json")):
+        week_id = path.stem[len("week-"):]
+        if wanted is not None and week_id not in wanted:
+            continue
+        with open(path, "r") as f:
+            weeks[week_id] = json.load(f)
+        updated[week_id] = datetime.fromtimestamp(path.stat().st_mtime).isoformat(timespec="seconds")
+    return weeks, updated
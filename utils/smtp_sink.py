@@ -0,0 +1,188 @@
+"""
+Local SMTP sink for tests and benchmarks.
+
+Speaks enough ESMTP for smtplib (EHLO/HELO, AUTH PLAIN/LOGIN accepting any
+credentials, MAIL, RCPT, DATA, RSET, NOOP, QUIT) and counts what it
+receives instead of delivering it. STARTTLS is not offered, so clients
+must connect with STARTTLS disabled. `latency` delays every reply to model
+a remote server's round trip. The server runs its own event loop in a
+background thread, so it works from sync scripts and async tests alike.
+"""
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+@dataclass
+class ReceivedMessage:
+    mail_from: str
+    rcpt_tos: List[str]
+    data: bytes
+
+@dataclass
+class SinkStats:
+    connections: int = 0
+    messages: int = 0
+    recipients: int = 0
+    bytes: int = 0
+    logins: int = 0
+    first_message_at: Optional[float] = None
+    last_message_at: Optional[float] = None
+
+    @property
+    def messages_per_second(self) -> float:
+        if not self.messages or self.first_message_at is None or self.last_message_at == self.first_message_at:
+            return 0.0
+        return (self.messages - 1) / (self.last_message_at - self.first_message_at)
+
+@dataclass
+class _Session:
+    mail_from: Optional[str] = None
+    rcpt_tos: List[str] = field(default_factory=list)
+
+class SMTPSink:
+    """Accepts and discards (or keeps) mail on 127.0.0.1:<port>"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        keep_messages: bool = True,
+        reject: Optional[List[str]] = None
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.keep_messages = keep_messages
+        self.reject = set(reject or [])
+        self.messages: List[ReceivedMessage] = []
+        self.stats = SinkStats()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    async def _reply(self, writer, line: str):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        writer.write(line.encode("ascii") + b"\r\n")
+        await writer.drain()
+
+    async def _read_data(self, reader) -> bytes:
+        lines = []
+        while True:
+            line = await reader.readline()
+            if not line or line in (b".\r\n", b".\n"):
+                break
+            # Undo dot-stuffing
+            lines.append(line[1:] if line.startswith(b"..") else line)
+        return b"".join(lines)
+
+    async def _handle(self, reader, writer):
+        self.stats.connections += 1
+        session = _Session()
+        await self._reply(writer, "220 localhost SMTP sink ready")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command, _, arg = line.decode("utf-8", "replace").strip().partition(" ")
+                verb = command.upper()
+
+                if verb == "EHLO":
+                    if self.latency:
+                        await asyncio.sleep(self.latency)
+                    writer.write(b"250-localhost\r\n250-8BITMIME\r\n250-SIZE 52428800\r\n250 AUTH PLAIN LOGIN\r\n")
+                    await writer.drain()
+                elif verb == "HELO":
+                    await self._reply(writer, "250 localhost")
+                elif verb == "AUTH":
+                    mechanism = arg.split()[0].upper() if arg else ""
+                    if mechanism == "LOGIN":
+                        await self._reply(writer, "334 VXNlcm5hbWU6")
+                        await reader.readline()
+                        await self._reply(writer, "334 UGFzc3dvcmQ6")
+                        await reader.readline()
+                    elif mechanism == "PLAIN" and len(arg.split()) == 1:
+                        await self._reply(writer, "334 ")
+                        await reader.readline()
+                    self.stats.logins += 1
+                    await self._reply(writer, "235 Authentication successful")
+                elif verb == "MAIL":
+                    session = _Session(mail_from=arg.partition(":")[2].split(" ")[0].strip("<>"))
+                    await self._reply(writer, "250 OK")
+                elif verb == "RCPT":
+                    address = arg.partition(":")[2].split(" ")[0].strip("<>")
+                    if address in self.reject:
+                        await self._reply(writer, "550 No such user")
+                    else:
+                        session.rcpt_tos.append(address)
+                        await self._reply(writer, "250 OK")
+                elif verb == "DATA":
+                    if session.mail_from is None or not session.rcpt_tos:
+                        await self._reply(writer, "503 Bad sequence of commands")
+                        continue
+                    await self._reply(writer, "354 End data with <CR><LF>.<CR><LF>")
+                    data = await self._read_data(reader)
+                    now = time.perf_counter()
+                    self.stats.messages += 1
+                    self.stats.recipients += len(session.rcpt_tos)
+                    self.stats.bytes += len(data)
+                    self.stats.first_message_at = self.stats.first_message_at or now
+                    self.stats.last_message_at = now
+                    if self.keep_messages:
+                        self.messages.append(ReceivedMessage(session.mail_from, session.rcpt_tos, data))
+                    session = _Session()
+                    await self._reply(writer, "250 OK: queued")
+                elif verb == "RSET":
+                    session = _Session()
+                    await self._reply(writer, "250 OK")
+                elif verb == "NOOP":
+                    await self._reply(writer, "250 OK")
+                elif verb == "QUIT":
+                    await self._reply(writer, "221 Bye")
+                    break
+                else:
+                    await self._reply(writer, "502 Command not implemented")
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(asyncio.start_server(self._handle, self.host, self.port))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+        self._server.close()
+        # End sessions clients left open
+        sessions = asyncio.all_tasks(self._loop)
+        for task in sessions:
+            task.cancel()
+        self._loop.run_until_complete(asyncio.gather(*sessions, return_exceptions=True))
+        self._loop.run_until_complete(self._server.wait_closed())
+        self._loop.close()
+
+    def start(self) -> "SMTPSink":
+        """Start serving in a background thread; `port` is set once this returns"""
+        self._thread = threading.Thread(target=self._run, name="smtp-sink", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+
+    def __enter__(self) -> "SMTPSink":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
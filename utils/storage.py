@@ -121,3 +121,11 @@ class Storage:
                 })
         
         return archives
+    
+    def get_approved_weeks(self) -> List[Dict]:
+        """Archived weeks with APPROVED.txt and without REJECTED.txt"""
+        return [
+            week for week in self.get_archive_index()
+            if (Path(week['path']) / "APPROVED.txt").exists()
+            and not (Path(week['path']) / "REJECTED.txt").exists()
+        ]
@@ -0,0 +1,56 @@
+"""
+Shared template rendering for emails, the newsletter and website pages.
+
+Templates live in templates/ and use Jinja syntax. They are compiled once per
+process and cached; HTML and Astro templates are autoescaped, so values that
+are already trusted HTML must be passed through the `safe` filter.
+"""
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterator
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "templates"
+
+@lru_cache(maxsize=None)
+def get_environment():
+    """Jinja environment shared by the whole process"""
+    from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+
+    env = Environment(
+        loader=FileSystemLoader(str(TEMPLATE_DIR)),
+        autoescape=select_autoescape(["html", "astro"]),
+        undefined=StrictUndefined,
+        # Templates do not change while the process runs; skip mtime checks
+        auto_reload=False,
+        cache_size=-1,
+        keep_trailing_newline=True
+    )
+    env.filters["astro_text"] = astro_text
+    return env
+
+def astro_text(value: Any):
+    """HTML-escape and also escape braces, which Astro treats as expressions"""
+    from markupsafe import Markup, escape
+
+    return Markup(str(escape(value)).replace("{", "&#123;").replace("}", "&#125;"))
+
+@lru_cache(maxsize=None)
+def get_template(name: str):
+    """Compile `name` once and return the cached template"""
+    return get_environment().get_template(name)
+
+def render_template(name: str, **context: Any) -> str:
+    """Render a template into a string by joining its streamed chunks"""
+    return "".join(get_template(name).generate(**context))
+
+def stream_template(name: str, **context: Any) -> Iterator[str]:
+    """Yield rendered chunks without building the whole document"""
+    return get_template(name).generate(**context)
+
+def render_to_file(name: str, path: Path, **context: Any):
+    """Stream a rendered template straight to disk"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        for chunk in stream_template(name, **context):
+            f.write(chunk)
@@ -0,0 +1,237 @@
+import asyncio
+import hashlib
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from utils.fs import link_or_copy
+from utils import tracing
+
+# Layout was designed for 1200x630; everything scales with the target size
+BASE_SIZE = (1200, 630)
+BACKGROUND_COLOR = '#6366F1'
+TEXT_COLOR = 'white'
+MAX_LINES = 3
+
+# Bump whenever render_thumbnail's output changes so cached files are redrawn
+TEMPLATE_VERSION = 1
+
+# Tried in order; the first one Pillow can open wins
+FONT_CANDIDATES = [
+    "/System/Library/Fonts/Helvetica.ttc",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+    "DejaVuSans.ttf",
+]
+
+SAVE_OPTIONS = {
+    "png": {"format": "PNG", "optimize": True},
+    "webp": {"format": "WEBP", "quality": 85, "method": 6},
+}
+
+@lru_cache(maxsize=None)
+def load_font(size: int):
+    """Load the first available TrueType font at `size`, once per process"""
+    from PIL import ImageFont
+
+    for candidate in FONT_CANDIDATES:
+        try:
+            return ImageFont.truetype(candidate, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        # Pillow < 10.1 has no sized default font
+        return ImageFont.load_default()
+
+def font_name(size: int) -> str:
+    """Stable identifier of the font that load_font(size) resolves to"""
+    font = load_font(size)
+    return f"{getattr(font, 'path', type(font).__name__)}@{size}"
+
+class GlyphWidthCache:
+    """Memoizes rendered word widths so wrapping does not re-measure text"""
+
+    def __init__(self, font):
+        self.font = font
+        self._widths: Dict[str, float] = {}
+        self.space = self.width(" ")
+
+    def width(self, text: str) -> float:
+        cached = self._widths.get(text)
+        if cached is None:
+            cached = self.font.getlength(text)
+            self._widths[text] = cached
+        return cached
+
+@lru_cache(maxsize=None)
+def glyph_widths(size: int) -> GlyphWidthCache:
+    return GlyphWidthCache(load_font(size))
+
+def wrap_text(text: str, widths: GlyphWidthCache, max_width: float) -> List[str]:
+    """Greedy word wrap using cached word widths"""
+    lines: List[str] = []
+    current: List[str] = []
+    current_width = 0.0
+    for word in text.split():
+        word_width = widths.width(word)
+        candidate = current_width + (widths.space if current else 0) + word_width
+        if current and candidate >= max_width:
+            lines.append(' '.join(current))
+            current, current_width = [word], word_width
+        else:
+            current.append(word)
+            current_width = candidate
+    if current:
+        lines.append(' '.join(current))
+    return lines
+
+def layout(size: Tuple[int, int]) -> Dict[str, int]:
+    """Scale the base 1200x630 layout to `size`"""
+    width, height = size
+    scale_x = width / BASE_SIZE[0]
+    scale_y = height / BASE_SIZE[1]
+    return {
+        "margin": round(50 * scale_x),
+        "top": round(200 * scale_y),
+        "line_height": round(60 * scale_y),
+        "font_size": max(8, round(40 * scale_y)),
+    }
+
+def render_thumbnail(job: Dict[str, Any]) -> str:
+    """
+    Render one thumbnail and write it to job['path'].
+
+    Module-level so it can run in a ProcessPoolExecutor worker; fonts and
+    width caches are per worker process and survive across jobs.
+    """
+    from PIL import Image, ImageDraw
+
+    size = tuple(job.get("size", BASE_SIZE))
+    image_format = job.get("format", "png")
+    box = layout(size)
+    font = load_font(box["font_size"])
+
+    img = Image.new('RGB', size, color=job.get("background", BACKGROUND_COLOR))
+    draw = ImageDraw.Draw(img)
+
+    lines = wrap_text(job["title"], glyph_widths(box["font_size"]), size[0] - 2 * box["margin"])
+    y = box["top"]
+    for line in lines[:MAX_LINES]:
+        draw.text((box["margin"], y), line, fill=TEXT_COLOR, font=font)
+        y += box["line_height"]
+
+    # Write then rename so a crashed worker never leaves a truncated cache entry
+    path = Path(job["path"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    img.save(tmp_path, **SAVE_OPTIONS[image_format])
+    os.replace(tmp_path, path)
+    return str(path)
+
+class ThumbnailRenderer:
+    """
+    Renders story thumbnails in parallel on a reusable process pool.
+
+    Output is content-addressed: each image is stored once under `cache_dir`
+    by a hash of (title, size, template version, font, format) and
+    hard-linked into place, so unchanged stories are never redrawn.
+    """
+
+    def __init__(
+        self,
+        size: Tuple[int, int] = BASE_SIZE,
+        image_format: str = "png",
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        cache_dir: Optional[str] = "data/cache/thumbnails"
+    ):
+        if image_format not in SAVE_OPTIONS:
+            raise ValueError(f"Unsupported thumbnail format: {image_format}")
+        self.size = (int(size[0]), int(size[1]))
+        self.image_format = image_format
+        self.extension = image_format
+        self.max_workers = max_workers
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._executor = executor
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def make_job(self, title: str, path: str) -> Dict[str, Any]:
+        return {
+            "title": title,
+            "path": path,
+            "size": self.size,
+            "format": self.image_format,
+        }
+
+    def cache_key(self, job: Dict[str, Any]) -> str:
+        """Hash of everything that affects the rendered pixels"""
+        font_size = layout(job["size"])["font_size"]
+        payload = json.dumps([
+            job["title"],
+            list(job["size"]),
+            TEMPLATE_VERSION,
+            font_name(font_size),
+            job["format"],
+            job.get("background", BACKGROUND_COLOR),
+        ])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def render_all(self, jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Render or reuse all jobs concurrently.
+
+        Returns {"paths": [...in job order], "rendered": n, "reused": n}
+        """
+        if not jobs:
+            return {"paths": [], "rendered": 0, "reused": 0}
+        loop = asyncio.get_running_loop()
+
+        if self.cache_dir is None:
+            with tracing.span("render.thumbnails", jobs=len(jobs), rendered=len(jobs)):
+                paths = await asyncio.gather(*(
+                    loop.run_in_executor(self.executor, render_thumbnail, job) for job in jobs
+                ))
+            return {"paths": list(paths), "rendered": len(jobs), "reused": 0}
+
+        # Render each missing cache entry once, even if several jobs share it
+        cached_paths = []
+        to_render = {}
+        for job in jobs:
+            cached = self.cache_dir / f"{self.cache_key(job)}.{self.extension}"
+            cached_paths.append(cached)
+            if not cached.exists() and cached not in to_render:
+                to_render[cached] = {**job, "path": str(cached)}
+
+        with tracing.span("render.thumbnails", jobs=len(jobs), rendered=len(to_render)):
+            await asyncio.gather(*(
+                loop.run_in_executor(self.executor, render_thumbnail, job) for job in to_render.values()
+            ))
+
+        paths = []
+        for job, cached in zip(jobs, cached_paths):
+            dest = Path(job["path"])
+            if not (dest.exists() and dest.samefile(cached)):
+                link_or_copy(cached, dest)
+            paths.append(str(dest))
+
+        return {
+            "paths": paths,
+            "rendered": len(to_render),
+            "reused": len(jobs) - len(to_render),
+        }
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,313 @@
+"""
+Lightweight in-process tracing.
+
+A trace is one unit of pipeline work (a daily scrape, a weekly
+consolidation, publishing one week) and is identified by the same id that
+events carry as `correlation_id` and log lines carry as their correlation
+prefix. Inside a trace, `span()` blocks time individual stages (fetch,
+parse, LLM call, scoring, render, TTS, encode) and nest through a
+ContextVar, so children started in other asyncio tasks or in
+`asyncio.to_thread` workers still find their parent.
+
+Events carry the emitting span in `metadata["parent_span_id"]`; handlers
+wrapped by BaseAgent.subscribe continue the trace from there. When the
+outermost span of a trace finishes, the trace is written to
+`output_dir` as Chrome trace JSON (chrome://tracing, Perfetto) or as a
+flat list of spans.
+"""
+import asyncio
+import functools
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Union
+from utils.logger import correlation, current_correlation_id
+
+FORMATS = ("chrome", "json")
+# Exported trace files are named trace-<start>-<root span>-<trace id>.json
+TRACE_FILE_PREFIX = "trace-"
+
+# Innermost open span of the current task
+_current_span: ContextVar[Optional["Span"]] = ContextVar("trace_span", default=None)
+
+def _new_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+def _lane() -> str:
+    """Thread and asyncio task the caller runs on; one Chrome trace row each"""
+    lane = threading.current_thread().name
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return f"{lane}/{task.get_name()}" if task is not None else lane
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start: float
+    duration: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    lane: str = ""
+
+    def set(self, **attributes):
+        """Attach attributes known only once the work is done (counts, sizes)"""
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": datetime.fromtimestamp(self.start).isoformat(),
+            "duration": round(self.duration, 6) if self.duration is not None else None,
+            "attributes": self.attributes,
+            "error": self.error,
+            "lane": self.lane,
+        }
+
+class _NoopSpan:
+    """Yielded while tracing is disabled so call sites need no checks"""
+
+    def set(self, **attributes):
+        pass
+
+_NOOP = _NoopSpan()
+
+class Tracer:
+    """
+    Records finished spans in a bounded buffer and exports whole traces.
+
+    `output_dir` None keeps spans in memory only; `spans()` and `export()`
+    still work, which is what tests and the benchmark use.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        output_dir: Optional[Union[str, Path]] = None,
+        trace_format: str = "chrome",
+        keep: int = 50,
+        max_spans: int = 20000
+    ):
+        self._lock = threading.Lock()
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self.configure(enabled, output_dir, trace_format, keep)
+
+    def configure(
+        self,
+        enabled: bool = True,
+        output_dir: Optional[Union[str, Path]] = None,
+        trace_format: str = "chrome",
+        keep: int = 50
+    ):
+        if trace_format not in FORMATS:
+            raise ValueError(f"Unknown trace format {trace_format!r}; expected one of {FORMATS}")
+        self.enabled = enabled
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.trace_format = trace_format
+        self.keep = keep
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Union[Span, _NoopSpan]]:
+        """Time the block as a child of the current span (or as a new trace's root)"""
+        if not self.enabled:
+            yield _NOOP
+            return
+        with self._open(name, None, None, attributes) as span:
+            yield span
+
+    @contextmanager
+    def trace(
+        self,
+        name: str,
+        trace_id: Optional[str] = None,
+        parent_id: Optional[str] = None,
+        **attributes
+    ) -> Iterator[Union[Span, _NoopSpan]]:
+        """
+        Entry point of a unit of work.
+
+        Inside an open span this is an ordinary child span. Otherwise it
+        continues `trace_id` (from an event or saved week data) or starts a
+        new trace, makes the trace id the logging correlation id, and
+        exports the trace once the block exits.
+        """
+        outer = _current_span.get()
+        if outer is not None and self.enabled:
+            with self._open(name, None, None, attributes) as span:
+                yield span
+            return
+
+        trace_id = trace_id or current_correlation_id() or uuid.uuid4().hex
+        with correlation(trace_id):
+            if not self.enabled:
+                yield _NOOP
+                return
+            try:
+                with self._open(name, trace_id, parent_id, attributes) as span:
+                    yield span
+            finally:
+                if self.output_dir is not None:
+                    self._export_finished(span)
+
+    def traced(self, name: str):
+        """Decorator running a coroutine function inside `trace(name)`"""
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with self.trace(name):
+                    return await func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @contextmanager
+    def _open(
+        self,
+        name: str,
+        trace_id: Optional[str],
+        parent_id: Optional[str],
+        attributes: Dict[str, Any]
+    ) -> Iterator[Span]:
+        parent = _current_span.get()
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        span = Span(
+            name=name,
+            trace_id=trace_id or current_correlation_id() or uuid.uuid4().hex,
+            span_id=_new_id(),
+            parent_id=parent_id,
+            start=time.time(),
+            attributes=dict(attributes),
+            lane=_lane()
+        )
+        token = _current_span.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duration = time.perf_counter() - started
+            _current_span.reset(token)
+            with self._lock:
+                self._spans.append(span)
+
+    def spans(self, trace_id: Optional[str] = None) -> List[Span]:
+        """Finished spans, oldest first, optionally for one trace"""
+        with self._lock:
+            spans = list(self._spans)
+        if trace_id is not None:
+            spans = [s for s in spans if s.trace_id == trace_id]
+        return sorted(spans, key=lambda s: s.start)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+    def export(
+        self,
+        path: Union[str, Path],
+        trace_id: Optional[str] = None,
+        trace_format: Optional[str] = None
+    ) -> Path:
+        """Write the recorded spans (or one trace's) to `path`"""
+        spans = self.spans(trace_id)
+        trace_format = trace_format or self.trace_format
+        document = chrome_trace(spans) if trace_format == "chrome" else {"spans": [s.to_dict() for s in spans]}
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(document, f, ensure_ascii=False, default=str)
+        return path
+
+    def _export_finished(self, root: Span):
+        stamp = datetime.fromtimestamp(root.start).strftime("%Y%m%dT%H%M%S.%f")
+        name = "".join(c if c.isalnum() or c in "-_." else "_" for c in root.name)
+        self.export(self.output_dir / f"{TRACE_FILE_PREFIX}{stamp}-{name}-{root.trace_id[:8]}.json", root.trace_id)
+        if self.keep:
+            # Only files this tracer wrote; output_dir may be shared
+            traces = sorted(
+                self.output_dir.glob(f"{TRACE_FILE_PREFIX}*.json"),
+                key=lambda p: p.stat().st_mtime_ns
+            )
+            for old in traces[:-self.keep]:
+                old.unlink(missing_ok=True)
+
+def chrome_trace(spans: List[Span]) -> Dict[str, Any]:
+    """
+    Chrome trace-event document: one complete ("X") event per span with
+    microsecond timestamps, one row per thread/task lane.
+    """
+    lanes: Dict[str, int] = {}
+    events: List[Dict[str, Any]] = []
+    for span in spans:
+        if span.lane not in lanes:
+            lanes[span.lane] = len(lanes) + 1
+            events.append({
+                "name": "thread_name", "ph": "M", "pid": 1, "tid": lanes[span.lane],
+                "args": {"name": span.lane}
+            })
+        args = {"trace_id": span.trace_id, "span_id": span.span_id, "parent_id": span.parent_id, **span.attributes}
+        if span.error:
+            args["error"] = span.error
+        events.append({
+            "name": span.name,
+            "cat": span.name.split(".")[0],
+            "ph": "X",
+            "ts": round(span.start * 1_000_000),
+            "dur": round((span.duration or 0) * 1_000_000),
+            "pid": 1,
+            "tid": lanes[span.lane],
+            "args": args,
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+_tracer = Tracer()
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+def configure(
+    enabled: bool = True,
+    output_dir: Optional[Union[str, Path]] = None,
+    trace_format: str = "chrome",
+    keep: int = 50
+) -> Tracer:
+    """Apply the `tracing` config section to the process-wide tracer"""
+    _tracer.configure(enabled, output_dir, trace_format, keep)
+    return _tracer
+
+def span(name: str, **attributes):
+    return _tracer.span(name, **attributes)
+
+def trace(name: str, trace_id: Optional[str] = None, parent_id: Optional[str] = None, **attributes):
+    return _tracer.trace(name, trace_id, parent_id, **attributes)
+
+def traced(name: str):
+    return _tracer.traced(name)
+
+def current_trace_id() -> Optional[str]:
+    """Id of the trace the caller runs in, falling back to the log correlation id"""
+    span = _current_span.get()
+    return span.trace_id if span is not None else current_correlation_id()
+
+def event_metadata() -> Dict[str, str]:
+    """Event metadata linking handlers of an emitted event to the emitting span"""
+    span = _current_span.get()
+    if span is None:
+        return {}
+    return {"trace_id": span.trace_id, "parent_span_id": span.span_id}
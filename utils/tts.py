@@ -0,0 +1,294 @@
+import asyncio
+import hashlib
+import json
+import re
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+from utils.audio_stream import AudioFileWriter
+from utils import tracing
+
+DEFAULT_MODEL_ID = "eleven_multilingual_v2"
+
+# Chunk size used when replaying cached segments
+READ_CHUNK_SIZE = 64 * 1024
+
+_END = object()
+
+class TTSBackend(ABC):
+    """Text-to-speech provider; returns encoded audio (MP3) for one text segment"""
+
+    name = "base"
+
+    @abstractmethod
+    async def synthesize(self, text: str, voice_id: str, settings: Dict[str, Any]) -> bytes:
+        pass
+
+    async def stream(self, text: str, voice_id: str, settings: Dict[str, Any]) -> AsyncIterator[bytes]:
+        """Yield audio chunks as the provider produces them"""
+        yield await self.synthesize(text, voice_id, settings)
+
+class ElevenLabsBackend(TTSBackend):
+    """ElevenLabs text_to_speech.convert, run off the event loop"""
+
+    name = "elevenlabs"
+
+    def __init__(self, api_key: str, model_id: str = DEFAULT_MODEL_ID):
+        from elevenlabs.client import ElevenLabs
+
+        self.client = ElevenLabs(api_key=api_key)
+        self.model_id = model_id
+
+    def _convert(self, text: str, voice_id: str, settings: Dict[str, Any]):
+        from elevenlabs import VoiceSettings
+
+        return self.client.text_to_speech.convert(
+            voice_id=voice_id,
+            text=text,
+            model_id=self.model_id,
+            voice_settings=VoiceSettings(**settings)
+        )
+
+    async def stream(self, text: str, voice_id: str, settings: Dict[str, Any]) -> AsyncIterator[bytes]:
+        # The SDK returns a blocking generator; pull each chunk on a worker thread
+        chunks = iter(await asyncio.to_thread(self._convert, text, voice_id, settings))
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, _END)
+            if chunk is _END:
+                break
+            yield chunk
+
+    async def synthesize(self, text: str, voice_id: str, settings: Dict[str, Any]) -> bytes:
+        return b"".join([chunk async for chunk in self.stream(text, voice_id, settings)])
+
+class FakeTTSBackend(TTSBackend):
+    """
+    Deterministic local backend for tests and benchmarks.
+
+    Produces `bytes_per_char` bytes of audio per input character after an
+    optional delay, streamed in `chunk_size` pieces, and records every text
+    it was asked to synthesize.
+    """
+
+    name = "fake"
+
+    def __init__(self, delay: float = 0.0, bytes_per_char: int = 16, chunk_size: int = 4096):
+        self.delay = delay
+        self.bytes_per_char = bytes_per_char
+        self.chunk_size = chunk_size
+        self.calls: List[str] = []
+
+    @staticmethod
+    def audio_for(text: str, bytes_per_char: int = 16) -> bytes:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        size = max(1, len(text) * bytes_per_char)
+        return (digest * (size // len(digest) + 1))[:size]
+
+    async def stream(self, text: str, voice_id: str, settings: Dict[str, Any]) -> AsyncIterator[bytes]:
+        self.calls.append(text)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        audio = self.audio_for(text, self.bytes_per_char)
+        for start in range(0, len(audio), self.chunk_size):
+            yield audio[start:start + self.chunk_size]
+
+    async def synthesize(self, text: str, voice_id: str, settings: Dict[str, Any]) -> bytes:
+        return b"".join([chunk async for chunk in self.stream(text, voice_id, settings)])
+
+def create_backend(name: str, api_key: Optional[str] = None) -> TTSBackend:
+    """Build the backend named in config (`audio.tts_backend`)"""
+    if name == "fake":
+        return FakeTTSBackend()
+    if name == "elevenlabs":
+        if not api_key:
+            raise ValueError("ELEVENLABS_API_KEY not set")
+        return ElevenLabsBackend(api_key)
+    raise ValueError(f"Unknown TTS backend: {name}")
+
+def split_script(script: str, max_chars: int = 1500) -> List[str]:
+    """
+    Split a podcast script into segments at story boundaries.
+
+    Paragraphs (blank-line separated) are the story/transition boundaries of
+    the generated script. Consecutive short paragraphs are packed together up
+    to `max_chars`; a single oversized paragraph is split between sentences.
+    """
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", script) if p.strip()]
+    pieces: List[str] = []
+    for paragraph in paragraphs:
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        current = ""
+        for sentence in re.split(r"(?<=[.!?])\s+", paragraph):
+            if current and len(current) + 1 + len(sentence) > max_chars:
+                pieces.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}".strip()
+        if current:
+            pieces.append(current)
+
+    segments: List[str] = []
+    for piece in pieces:
+        if segments and len(segments[-1]) + 2 + len(piece) <= max_chars:
+            segments[-1] = f"{segments[-1]}\n\n{piece}"
+        else:
+            segments.append(piece)
+    return segments
+
+class SegmentedSynthesizer:
+    """
+    Synthesizes a script as independent segments.
+
+    Segments run concurrently (capped by `max_concurrency`), are retried on
+    their own and are cached on disk by a hash of (backend, text, voice,
+    settings), so editing one story only re-synthesizes that segment.
+
+    `stream()` yields the episode in order as chunks arrive. Only the next
+    `max_concurrency` segments are in flight at once, so memory stays
+    bounded by the window rather than the episode length.
+    """
+
+    def __init__(
+        self,
+        backend: TTSBackend,
+        voice_id: str,
+        settings: Dict[str, Any],
+        cache_dir: Optional[str] = "data/cache/tts",
+        max_concurrency: int = 3,
+        max_segment_chars: int = 1500,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        logger=None
+    ):
+        self.backend = backend
+        self.voice_id = voice_id
+        self.settings = settings
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_segment_chars = max_segment_chars
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.logger = logger
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    def segment_key(self, text: str) -> str:
+        payload = json.dumps(
+            [self.backend.name, text, self.voice_id, self.settings],
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cache_path(self, text: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{self.segment_key(text)}.mp3"
+
+    async def _replay_cached(self, cache_path: Path, queue: asyncio.Queue):
+        with open(cache_path, "rb") as f:
+            while True:
+                chunk = await asyncio.to_thread(f.read, READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                await queue.put(chunk)
+
+    async def _synthesize_segment(self, text: str, queue: asyncio.Queue, cache_path: Optional[Path]):
+        """
+        Stream one segment from the backend into `queue` and the cache.
+
+        A failure before the first chunk (rate limit, timeout) is retried
+        with exponential backoff; once audio has been handed downstream the
+        segment cannot be restarted and the error propagates.
+        """
+        for attempt in range(self.max_retries):
+            emitted = False
+            writer = AudioFileWriter(cache_path) if cache_path is not None else None
+            try:
+                if writer is not None:
+                    await asyncio.to_thread(writer.open)
+                async with self._semaphore:
+                    with tracing.span("tts.segment", chars=len(text), attempt=attempt + 1):
+                        async for chunk in self.backend.stream(text, self.voice_id, self.settings):
+                            if writer is not None:
+                                await asyncio.to_thread(writer.write, chunk)
+                            emitted = True
+                            await queue.put(chunk)
+                if writer is not None:
+                    await asyncio.to_thread(writer.commit)
+                return
+            except Exception:
+                if writer is not None:
+                    await asyncio.to_thread(writer.abort)
+                if emitted or attempt == self.max_retries - 1:
+                    raise
+                await asyncio.sleep(self.retry_delay * (2 ** attempt))
+
+    async def _produce_segment(self, index: int, text: str, queue: asyncio.Queue, stats: Dict[str, Any]):
+        try:
+            cache_path = self._cache_path(text)
+            if cache_path is not None and cache_path.exists():
+                stats["cached"] += 1
+                await self._replay_cached(cache_path, queue)
+            else:
+                await self._synthesize_segment(text, queue, cache_path)
+                stats["synthesized"] += 1
+                stats["characters"] += len(text)
+                if self.logger:
+                    self.logger.debug(f"Synthesized segment {index} ({len(text)} chars)")
+            await queue.put(_END)
+        except Exception as e:
+            await queue.put(e)
+
+    async def stream(self, script: str, stats: Optional[Dict[str, Any]] = None) -> AsyncIterator[bytes]:
+        """
+        Yield the episode's audio in script order.
+
+        If given, `stats` is filled with {"segments", "synthesized", "cached",
+        "characters" (sent to the backend)} as the stream progresses.
+        """
+        segments = split_script(script, self.max_segment_chars)
+        if stats is None:
+            stats = {}
+        stats.update({"segments": len(segments), "synthesized": 0, "cached": 0, "characters": 0})
+
+        queues: Dict[int, asyncio.Queue] = {}
+        tasks: Dict[int, asyncio.Task] = {}
+
+        def start(index: int):
+            if index < len(segments):
+                queues[index] = asyncio.Queue()
+                tasks[index] = asyncio.create_task(
+                    self._produce_segment(index, segments[index], queues[index], stats)
+                )
+
+        try:
+            for index in range(self.max_concurrency):
+                start(index)
+            for index in range(len(segments)):
+                queue = queues.pop(index)
+                while True:
+                    item = await queue.get()
+                    if item is _END:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+                await tasks.pop(index)
+                start(index + self.max_concurrency)
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    async def synthesize(self, script: str) -> Dict[str, Any]:
+        """
+        Synthesize `script` into memory; prefer stream() for full episodes.
+
+        Returns {"audio": bytes, "segments": n, "synthesized": n, "cached": n,
+        "characters": chars sent to the backend}
+        """
+        stats: Dict[str, Any] = {}
+        audio = b"".join([chunk async for chunk in self.stream(script, stats)])
+        return {"audio": audio, **stats}
@@ -0,0 +1,188 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Spoken pace the script prompt is written for (generate_script asks for
+# duration_mins * 150 words); ~6 characters per word including the space
+WORDS_PER_MINUTE = 150
+CHARS_PER_WORD = 6.0
+CHARS_PER_SECOND = WORDS_PER_MINUTE * CHARS_PER_WORD / 60
+
+# Fixed parts of the script structure (see ClaudeClient.generate_script)
+INTRO_SECONDS = 40
+OUTRO_SECONDS = 30
+
+@dataclass
+class StoryAllocation:
+    story: Dict[str, Any]
+    rank: int
+    seconds: int
+
+    @property
+    def words(self) -> int:
+        return round(self.seconds * WORDS_PER_MINUTE / 60)
+
+    @property
+    def characters(self) -> int:
+        return round(self.seconds * CHARS_PER_SECOND)
+
+@dataclass
+class ScriptPlan:
+    """Budgeted podcast script: which stories to cover and for how long"""
+    stories: List[StoryAllocation]
+    dropped: List[Dict[str, Any]]
+    duration_seconds: int
+    # Script characters the TTS credits pay for (not credits)
+    char_budget: Optional[int]
+    planned_characters: int
+    actual_characters: Optional[int] = None
+    credit_budget: Optional[float] = None
+    notes: List[str] = field(default_factory=list)
+
+    @property
+    def exhausted(self) -> bool:
+        """True when the budget cannot pay for any speech at all"""
+        return self.char_budget is not None and self.char_budget <= 0
+
+    @property
+    def target_words(self) -> int:
+        return round(self.duration_seconds * WORDS_PER_MINUTE / 60)
+
+    @property
+    def duration_mins(self) -> float:
+        return round(self.duration_seconds / 60, 1)
+
+    def story_dicts(self) -> List[Dict[str, Any]]:
+        """Kept stories in rank order, each annotated with its time slot"""
+        return [
+            {**alloc.story, 'seconds': alloc.seconds, 'words': alloc.words}
+            for alloc in self.stories
+        ]
+
+    def record_actual(self, script: str) -> Dict[str, Any]:
+        """Compare the generated script against the plan"""
+        self.actual_characters = len(script)
+        return self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        actual = self.actual_characters
+        return {
+            "stories": len(self.stories),
+            "dropped": len(self.dropped),
+            "duration_seconds": self.duration_seconds,
+            "char_budget": self.char_budget,
+            "credit_budget": self.credit_budget,
+            "planned_characters": self.planned_characters,
+            "actual_characters": actual,
+            "actual_vs_planned": round(actual / self.planned_characters, 2) if actual and self.planned_characters else None,
+            "over_budget": actual is not None and self.char_budget is not None and actual > self.char_budget,
+        }
+
+def _rank_key(indexed_story):
+    index, story = indexed_story
+    rank = story.get('rank') if isinstance(story, dict) else None
+    return (rank if isinstance(rank, (int, float)) else float('inf'), index)
+
+def plan_script(
+    stories: List[Dict[str, Any]],
+    max_duration_seconds: int = 300,
+    char_budget: Optional[int] = None,
+    credits_per_char: float = 1.0,
+    safety_margin: float = 0.9,
+    min_story_seconds: int = 25,
+    max_story_seconds: int = 60,
+    max_stories: int = 7
+) -> ScriptPlan:
+    """
+    Size a podcast script before anything is generated or synthesized.
+
+    The runtime is the smaller of `max_duration_seconds` and what
+    `char_budget` TTS credits can pay for (with `safety_margin` headroom for
+    the LLM overshooting its word count). The plan's `char_budget` is that
+    credit budget converted to script characters; with nothing left the
+    plan is `exhausted` and keeps no stories. Stories are taken in rank order
+    (`rank` field, else list order); each gets `max_story_seconds` at most,
+    and the lowest-ranked stories are dropped until every kept story has at
+    least `min_story_seconds`. If even the top story does not fit, it is
+    shortened to whatever time is left.
+    """
+    notes = []
+    seconds = float(max_duration_seconds)
+    ranked = [story for _, story in sorted(enumerate(stories), key=_rank_key)]
+    max_chars = None
+    if char_budget is not None:
+        max_chars = int(char_budget / credits_per_char)
+        if max_chars <= 0:
+            return ScriptPlan(
+                stories=[],
+                dropped=ranked,
+                duration_seconds=0,
+                char_budget=max_chars,
+                planned_characters=0,
+                credit_budget=char_budget,
+                notes=[f"TTS budget exhausted ({char_budget} credits left)"],
+            )
+        affordable_seconds = max_chars * safety_margin / CHARS_PER_SECOND
+        if affordable_seconds < seconds:
+            notes.append(
+                f"Character budget {char_budget} limits runtime to {affordable_seconds:.0f}s "
+                f"(max {max_duration_seconds}s)"
+            )
+            seconds = affordable_seconds
+
+    kept = ranked[:max_stories]
+    dropped = ranked[max_stories:]
+
+    # Short budgets squeeze the intro/outro before they squeeze the stories
+    overhead = min(INTRO_SECONDS + OUTRO_SECONDS, seconds / 3)
+    story_seconds = max(0.0, seconds - overhead)
+
+    while len(kept) > 1 and story_seconds / len(kept) < min_story_seconds:
+        dropped.insert(0, kept.pop())
+    per_story = int(min(max_story_seconds, story_seconds / len(kept))) if kept else 0
+    if kept and per_story < min_story_seconds:
+        notes.append(f"Top story shortened to {per_story}s to fit the budget")
+
+    allocations = [
+        StoryAllocation(story=story, rank=i + 1, seconds=per_story)
+        for i, story in enumerate(kept)
+    ]
+    duration = int(round(overhead + per_story * len(allocations)))
+    if dropped:
+        notes.append(f"Dropped {len(dropped)} lowest-ranked story(ies)")
+
+    return ScriptPlan(
+        stories=allocations,
+        dropped=dropped,
+        duration_seconds=duration,
+        char_budget=max_chars,
+        planned_characters=round(duration * CHARS_PER_SECOND),
+        credit_budget=char_budget,
+        notes=notes,
+    )
+
+def trim_script(script: str, max_chars: int) -> str:
+    """
+    Last-resort fit for a script that overshot its budget.
+
+    Drops whole story paragraphs from the end while keeping the final
+    (outro) paragraph, so synthesis never fails on a hard credit limit.
+    """
+    if len(script) <= max_chars:
+        return script
+    paragraphs = [p for p in script.split("\n\n") if p.strip()]
+    if len(paragraphs) < 3:
+        return script[:max_chars]
+    outro = paragraphs[-1]
+    body = paragraphs[:-1]
+    while len(body) > 1 and len("\n\n".join(body + [outro])) > max_chars:
+        body.pop()
+    trimmed = "\n\n".join(body + [outro])
+    return trimmed if len(trimmed) <= max_chars else trimmed[:max_chars]
+
+def remaining_characters(client) -> Optional[int]:
+    """Characters left on an ElevenLabs subscription, or None if unknown"""
+    try:
+        subscription = client.user.subscription.get()
+        return int(subscription.character_limit) - int(subscription.character_count)
+    except Exception:
+        return None
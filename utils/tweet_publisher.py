@@ -0,0 +1,181 @@
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+@dataclass
+class RateLimit:
+    """The x-rate-limit-* headers of one API response"""
+    limit: int
+    remaining: int
+    reset: float  # epoch seconds
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str]) -> Optional["RateLimit"]:
+        try:
+            return cls(
+                limit=int(headers["x-rate-limit-limit"]),
+                remaining=int(headers["x-rate-limit-remaining"]),
+                reset=float(headers["x-rate-limit-reset"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+class RateLimitExceeded(Exception):
+    """The API answered 429; `rate_limit` says when the window resets"""
+
+    def __init__(self, rate_limit: Optional[RateLimit]):
+        super().__init__("Tweet rate limit exceeded")
+        self.rate_limit = rate_limit
+
+class TweepyTweetAPI:
+    """
+    Posts tweets through tweepy and exposes the response headers.
+
+    tweepy's default Response type drops headers, so the client must be
+    created with `return_type=requests.Response`.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def post(self, text: str, reply_to: Optional[str] = None) -> Tuple[str, Mapping[str, str]]:
+        import tweepy
+
+        try:
+            response = self.client.create_tweet(text=text, in_reply_to_tweet_id=reply_to)
+        except tweepy.TooManyRequests as e:
+            raise RateLimitExceeded(RateLimit.from_headers(e.response.headers)) from e
+        return str(response.json()['data']['id']), response.headers
+
+class ThreadState:
+    """
+    Tweet ids already posted for one week's thread, keyed by position.
+
+    Saved after every tweet so an interrupted run resumes where it stopped
+    instead of reposting (or abandoning) the thread.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.posted: Dict[str, str] = {}
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                self.posted = json.load(f).get('posted', {})
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({'posted': self.posted}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+class ThreadPublisher:
+    """
+    Posts a tweet thread in order, paced by the API's rate-limit headers.
+
+    While the window has quota left, tweets go out `min_interval` apart;
+    when it is exhausted (or the API answers 429) the publisher waits for
+    the reset time. Waits longer than `max_wait` stop the run with the
+    thread incomplete; the next run picks up from the saved state.
+    """
+
+    def __init__(
+        self,
+        api,
+        state: ThreadState,
+        min_interval: float = 2.0,
+        max_wait: float = 900.0,
+        max_rate_limit_retries: int = 3,
+        logger=None,
+        sleep: Callable = asyncio.sleep,
+        clock: Callable[[], float] = time.time
+    ):
+        self.api = api
+        self.state = state
+        self.min_interval = min_interval
+        self.max_wait = max_wait
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.logger = logger
+        self._sleep = sleep
+        self._clock = clock
+
+    def next_delay(self, rate_limit: Optional[RateLimit]) -> float:
+        """Seconds to wait before the next post"""
+        if rate_limit is None or rate_limit.remaining > 0:
+            return self.min_interval
+        return max(self.min_interval, rate_limit.reset - self._clock() + 1)
+
+    async def _post(self, text: str, reply_to: Optional[str]) -> Tuple[Optional[str], Optional[RateLimit]]:
+        """Post one tweet, waiting out 429s; returns (None, limit) if the wait is too long"""
+        for _ in range(self.max_rate_limit_retries + 1):
+            try:
+                tweet_id, headers = await asyncio.to_thread(self.api.post, text, reply_to)
+                return tweet_id, RateLimit.from_headers(headers)
+            except RateLimitExceeded as e:
+                if e.rate_limit is not None:
+                    wait = max(self.min_interval, e.rate_limit.reset - self._clock() + 1)
+                else:
+                    # 429 without headers: back off for one minute
+                    wait = 60.0
+                if wait > self.max_wait:
+                    return None, e.rate_limit
+                if self.logger:
+                    self.logger.warning(f"Rate limited; retrying in {wait:.0f}s")
+                await self._sleep(wait)
+        return None, None
+
+    async def publish(self, tweets: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Post every tweet not yet in the state file.
+
+        Returns {"posted": n this run, "skipped": n already posted,
+        "complete": bool, "ids": [...in thread order]}
+        """
+        ordered = [t for t in sorted(tweets, key=lambda x: x.get('position', 0)) if t.get('text')]
+        posted = skipped = 0
+        prev_id = None
+        delay = 0.0
+        complete = True
+
+        for tweet in ordered:
+            key = str(tweet.get('position', 0))
+            if key in self.state.posted:
+                prev_id = self.state.posted[key]
+                skipped += 1
+                continue
+
+            if delay > self.max_wait:
+                complete = False
+                break
+            if delay:
+                await self._sleep(delay)
+
+            tweet_id, rate_limit = await self._post(tweet['text'], prev_id)
+            if tweet_id is None:
+                complete = False
+                break
+
+            self.state.posted[key] = tweet_id
+            await asyncio.to_thread(self.state.save)
+            prev_id = tweet_id
+            posted += 1
+            delay = self.next_delay(rate_limit)
+            if self.logger:
+                remaining = rate_limit.remaining if rate_limit else "?"
+                self.logger.info(f"Posted tweet {key} ({remaining} left in window)")
+
+        if not complete and self.logger:
+            self.logger.warning(
+                f"Thread incomplete: {len(self.state.posted)}/{len(ordered)} posted; "
+                f"rate limit wait exceeds {self.max_wait:.0f}s, rerun to resume"
+            )
+        return {
+            "posted": posted,
+            "skipped": skipped,
+            "complete": complete,
+            "ids": [self.state.posted[str(t.get('position', 0))] for t in ordered if str(t.get('position', 0)) in self.state.posted],
+        }
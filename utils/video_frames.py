@@ -0,0 +1,71 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+from utils.fs import link_or_copy
+from utils.thumbnails import font_name, load_font
+
+FRAME_SIZE = (1920, 1080)
+FRAME_BACKGROUND = '#1a1a2e'
+TITLE_COLOR = '#6366F1'
+SUBTITLE_COLOR = '#EC4899'
+
+# Bump whenever render_title_card's output changes so cached frames are redrawn
+FRAME_VERSION = 1
+
+def _frame_key(title: str, subtitle: str, size: Tuple[int, int]) -> str:
+    scale = size[1] / FRAME_SIZE[1]
+    payload = json.dumps([
+        title, subtitle, list(size), FRAME_VERSION,
+        font_name(round(80 * scale)), font_name(round(40 * scale)),
+    ])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def render_title_card(title: str, subtitle: str, path: Path, size: Tuple[int, int] = FRAME_SIZE) -> Path:
+    """Draw the podcast video's static frame: centered title and subtitle"""
+    from PIL import Image, ImageDraw
+
+    width, height = size
+    scale = height / FRAME_SIZE[1]
+    img = Image.new('RGB', size, color=FRAME_BACKGROUND)
+    draw = ImageDraw.Draw(img)
+
+    for text, font_size, top, color in (
+        (title, round(80 * scale), round(400 * scale), TITLE_COLOR),
+        (subtitle, round(40 * scale), round(500 * scale), SUBTITLE_COLOR),
+    ):
+        font = load_font(font_size)
+        bbox = draw.textbbox((0, 0), text, font=font)
+        draw.text(((width - (bbox[2] - bbox[0])) // 2, top), text, fill=color, font=font)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    img.save(tmp_path, format="PNG")
+    os.replace(tmp_path, path)
+    return path
+
+def background_frame(
+    title: str,
+    subtitle: str,
+    dest: Path,
+    size: Tuple[int, int] = FRAME_SIZE,
+    cache_dir: Optional[str] = "data/cache/video_frames"
+) -> bool:
+    """
+    Place the title card at `dest`, drawing it only if it is not cached.
+
+    Returns True when the frame came from the cache.
+    """
+    dest = Path(dest)
+    if cache_dir is None:
+        render_title_card(title, subtitle, dest, size)
+        return False
+
+    cached = Path(cache_dir) / f"{_frame_key(title, subtitle, size)}.png"
+    reused = cached.exists()
+    if not reused:
+        render_title_card(title, subtitle, cached, size)
+    if not (dest.exists() and dest.samefile(cached)):
+        link_or_copy(cached, dest)
+    return reused